@@ -0,0 +1,131 @@
+"""Compare request throughput of the sync and async database stacks.
+
+Starts a uvicorn server per DB_MODE against the same seeded SQLite file and
+fires `--requests` GETs with `--concurrency` requests in flight:
+
+    python -m benchmarks.async_throughput --concurrency 200 --requests 5000
+
+Requires httpx, plus sqlalchemy[asyncio] and aiosqlite for the async run.
+"""
+import argparse
+import asyncio
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+API = "/api/procurement"
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(database_url: str, db_mode: str, **settings):
+    port = _free_port()
+    env = dict(os.environ, DATABASE_URL=database_url, DB_MODE=db_mode, **settings)
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=BACKEND_DIR, env=env,
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    for _ in range(100):
+        try:
+            if httpx.get(f"{base_url}/health").status_code == 200:
+                return proc, base_url
+        except httpx.TransportError:
+            time.sleep(0.1)
+    proc.terminate()
+    raise RuntimeError(f"Server in {db_mode} mode did not start")
+
+
+def seed(base_url: str, purchase_orders: int):
+    with httpx.Client(base_url=base_url + API) as client:
+        supplier = client.post("/suppliers", json={"name": "Bench Supplier", "supplier_type": "local"}).json()
+        products = [
+            client.post("/products", json={"name": f"Bench Product {i}"}).json()
+            for i in range(5)
+        ]
+        for _ in range(purchase_orders):
+            client.post("/purchase-orders/local", json={
+                "supplier_id": supplier["id"],
+                "tax": 17,
+                "items": [
+                    {"product_id": product["id"], "sn": sn, "quantity": 10, "rate": 2.5}
+                    for sn, product in enumerate(products, start=1)
+                ],
+            }).raise_for_status()
+
+
+async def load(base_url: str, path: str, total: int, concurrency: int) -> dict:
+    latencies = []
+    errors = 0
+    remaining = iter(range(total))
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        async def worker():
+            nonlocal errors
+            for _ in remaining:
+                started = time.perf_counter()
+                try:
+                    response = await client.get(path)
+                except httpx.TransportError:
+                    errors += 1
+                    continue
+                latencies.append(time.perf_counter() - started)
+                errors += response.status_code != 200
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {
+        "rps": total / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": latencies[int(len(latencies) * 0.99) - 1] * 1000,
+        "errors": errors,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=3000)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--purchase-orders", type=int, default=200)
+    parser.add_argument("--path", default=f"{API}/purchase-orders?limit=20")
+    parser.add_argument("--modes", default="sync,async")
+    args = parser.parse_args()
+
+    database_url = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}"
+    subprocess.run([sys.executable, "manage.py", "migrate"], cwd=BACKEND_DIR, check=True,
+                   env=dict(os.environ, DATABASE_URL=database_url))
+    proc, base_url = start_server(database_url, "sync")
+    try:
+        seed(base_url, args.purchase_orders)
+    finally:
+        proc.terminate()
+        proc.wait()
+
+    print(f"GET {args.path}  requests={args.requests} concurrency={args.concurrency}")
+    for mode in args.modes.split(","):
+        proc, base_url = start_server(database_url, mode)
+        try:
+            asyncio.run(load(base_url, args.path, min(200, args.requests), args.concurrency))  # warm-up
+            result = asyncio.run(load(base_url, args.path, args.requests, args.concurrency))
+        finally:
+            proc.terminate()
+            proc.wait()
+        print(f"{mode:>6}: {result['rps']:8.1f} req/s  p50 {result['p50_ms']:7.1f} ms  "
+              f"p99 {result['p99_ms']:7.1f} ms  errors {result['errors']}")
+
+
+if __name__ == "__main__":
+    main()
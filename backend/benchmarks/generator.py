@@ -0,0 +1,220 @@
+"""Fill an empty database with reproducible synthetic procurement data.
+
+The same `--seed`, sizes and `--as-of` date (default DEFAULT_AS_OF; the year
+before it is filled) always produce the same rows, so benchmark runs on
+different commits and days see identical data:
+
+    python -m benchmarks.generator --database-url sqlite:///bench.db --purchase-orders 100000 --items 5
+
+Rows go through the models' tables in executemany batches of `--batch-size`
+POs (with their items, QC reports and receipts), one transaction per batch,
+and the dashboard counters, analytics rollups and PO aggregate columns are
+rebuilt at the end. The schema comes from the migrations. At 100k POs with 5 items that is roughly
+1.2M rows.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from collections import Counter
+from datetime import date, datetime, timedelta
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Generated rows are dated in the days before this, not before today, so reruns match
+DEFAULT_AS_OF = date(2025, 1, 1)
+
+ORIGINS = ("China", "India", "Germany", "Switzerland", "USA")
+STATIONS = ("Karachi", "Lahore", "Islamabad", "Faisalabad")
+TRANSPORT = ("Sea", "Air", "Road")
+TAX_RATES = (None, 5.0, 10.0, 17.0)
+
+
+def generate(bind, purchase_orders: int = 10000, items: int = 5, suppliers: int = 100, products: int = 500,
+             qc_ratio: float = 0.6, receipt_ratio: float = 0.8, seed: int = 42, batch_size: int = 5000,
+             days: int = 365, as_of: date = DEFAULT_AS_OF) -> Counter:
+    """Insert the synthetic data set into `bind` and return the row count per table"""
+    from sqlalchemy import func, insert, select
+    from models.procurement import (
+        Supplier, Product, PurchaseOrder, PurchaseOrderItem, QCReport, QCReportItem, Receipt,
+        SupplierType, PurchaseOrderStatus, QCStatus, PaymentType, ReceiptType
+    )
+
+    rng = random.Random(seed)
+    counts = Counter()
+    with bind.connect() as conn:
+        if conn.execute(select(func.count(PurchaseOrder.id))).scalar() or \
+                conn.execute(select(func.count(Supplier.id))).scalar():
+            raise SystemExit("The generator needs an empty database (suppliers and purchase orders exist)")
+
+    # Everything is dated before as_of, itself no later than today, so live document numbers never collide
+    if as_of > datetime.utcnow().date():
+        raise SystemExit(f"--as-of {as_of} is in the future; generated document numbers would collide with live ones")
+    end = datetime.combine(as_of, datetime.min.time())
+    sequence = Counter()
+
+    def number(doc_type: str, when: datetime) -> str:
+        day = when.strftime("%Y%m%d")
+        sequence[doc_type, day] += 1
+        return f"{doc_type}-{day}-{sequence[doc_type, day]:04d}"
+
+    supplier_rows = [{
+        "id": supplier_id,
+        "name": f"Supplier {supplier_id:06d}",
+        "supplier_type": SupplierType.LOCAL if rng.random() < 0.6 else SupplierType.IMPORT,
+        "contact_person": f"Contact {supplier_id}",
+        "email": f"supplier{supplier_id}@example.com",
+        "created_at": end - timedelta(days=days + 1),
+        "updated_at": end - timedelta(days=days + 1),
+    } for supplier_id in range(1, suppliers + 1)]
+    product_rows = [{
+        "id": product_id,
+        "name": f"Product {product_id:06d}",
+        "manufacturer": f"Manufacturer {rng.randint(1, max(1, products // 10))}",
+        "hs_code": f"{rng.randint(3000, 3099)}.{rng.randint(10, 99)}",
+        "created_at": end - timedelta(days=days + 1),
+        "updated_at": end - timedelta(days=days + 1),
+    } for product_id in range(1, products + 1)]
+    with bind.begin() as conn:
+        conn.execute(insert(Supplier), supplier_rows)
+        conn.execute(insert(Product), product_rows)
+    counts["suppliers"] = len(supplier_rows)
+    counts["products"] = len(product_rows)
+
+    product_ids = [row["id"] for row in product_rows]
+    item_id = qc_id = qc_item_id = receipt_id = 0
+    for first in range(1, purchase_orders + 1, batch_size):
+        rows = {model: [] for model in (PurchaseOrder, PurchaseOrderItem, QCReport, QCReportItem, Receipt)}
+        for po_id in range(first, min(first + batch_size, purchase_orders + 1)):
+            supplier = rng.choice(supplier_rows)
+            local = supplier["supplier_type"] == SupplierType.LOCAL
+            created = end - timedelta(days=rng.randint(1, days), seconds=rng.randint(0, 43199))
+            tax = rng.choice(TAX_RATES) if local else None
+
+            po_items = []
+            for sn, product_id in enumerate(rng.sample(product_ids, min(items, len(product_ids))), start=1):
+                item_id += 1
+                quantity = float(rng.randint(1, 500))
+                rate = round(rng.uniform(0.5, 200), 2)
+                po_items.append({
+                    "id": item_id, "purchase_order_id": po_id, "product_id": product_id, "sn": sn,
+                    "quantity": quantity, "rate": rate, "total": quantity * rate, "created_at": created,
+                })
+            subtotal = sum(item["total"] for item in po_items)
+
+            status = PurchaseOrderStatus.PENDING
+            if rng.random() < qc_ratio:
+                qc_id += 1
+                inspected = created + timedelta(hours=rng.randint(1, 11))
+                qc_items = []
+                for item in po_items:
+                    qc_item_id += 1
+                    rejected = float(rng.randint(1, int(item["quantity"]))) if rng.random() < 0.15 else 0.0
+                    accepted = item["quantity"] - rejected
+                    qc_items.append({
+                        "id": qc_item_id, "qc_report_id": qc_id, "po_item_id": item["id"],
+                        "status": QCStatus.REJECTED if rejected else QCStatus.ACCEPTED,
+                        "accepted_qty": accepted, "rejected_qty": rejected,
+                        "accepted_value": accepted * item["rate"], "rejected_value": rejected * item["rate"],
+                        "rejection_reason": "Failed assay" if rejected else None, "created_at": inspected,
+                    })
+                totals = {
+                    key: sum(qc_item[key] for qc_item in qc_items)
+                    for key in ("accepted_qty", "rejected_qty", "accepted_value", "rejected_value")
+                }
+                status = (PurchaseOrderStatus.PARTIALLY_REJECTED if totals["rejected_qty"]
+                          else PurchaseOrderStatus.COMPLETED)
+                rows[QCReport].append({
+                    "id": qc_id, "purchase_order_id": po_id, "qc_report_number": number("QC", inspected),
+                    "inspector_name": f"Inspector {rng.randint(1, 20)}", "inspection_date": inspected,
+                    "total_accepted_qty": totals["accepted_qty"], "total_rejected_qty": totals["rejected_qty"],
+                    "total_accepted_value": totals["accepted_value"],
+                    "total_rejected_value": totals["rejected_value"],
+                    "created_at": inspected, "updated_at": inspected,
+                })
+                rows[QCReportItem].extend(qc_items)
+
+                if rng.random() < receipt_ratio:
+                    for receipt_type, prefix, qty_key, value_key in (
+                        (ReceiptType.ACCEPTED, "RCP-ACC", "accepted_qty", "accepted_value"),
+                        (ReceiptType.REJECTED, "RCP-REJ", "rejected_qty", "rejected_value"),
+                    ):
+                        if not totals[qty_key]:
+                            continue
+                        receipt_id += 1
+                        issued = inspected + timedelta(minutes=rng.randint(5, 600))
+                        rows[Receipt].append({
+                            "id": receipt_id, "receipt_number": number(prefix, issued), "purchase_order_id": po_id,
+                            "receipt_type": receipt_type, "total_quantity": totals[qty_key],
+                            "total_value": totals[value_key], "generated_by": "Admin",
+                            "generated_date": issued, "created_at": issued,
+                        })
+
+            rows[PurchaseOrder].append({
+                "id": po_id, "po_number": number("PO", created), "supplier_id": supplier["id"],
+                "supplier_type": supplier["supplier_type"], "status": status,
+                "payment_terms": rng.choice(("30 days", "60 days", "Advance")),
+                "origin": None if local else rng.choice(ORIGINS),
+                "payment_type": None if local else rng.choice(list(PaymentType)),
+                "dispatched_from": None if local else rng.choice(ORIGINS),
+                "dispatched_in": None if local else rng.choice(TRANSPORT),
+                "validity_indent": None if local else "90 days",
+                "station": rng.choice(STATIONS) if local else None,
+                "tax": tax,
+                "total_amount": subtotal + subtotal * tax / 100 if tax else subtotal,
+                "created_at": created, "updated_at": created,
+            })
+            rows[PurchaseOrderItem].extend(po_items)
+
+        with bind.begin() as conn:
+            for model, model_rows in rows.items():
+                if model_rows:
+                    conn.execute(insert(model), model_rows)
+                    counts[model.__tablename__] += len(model_rows)
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--database-url", default=os.getenv("DATABASE_URL", "sqlite:///./bench.db"))
+    parser.add_argument("--purchase-orders", type=int, default=10000)
+    parser.add_argument("--items", type=int, default=5, help="items per purchase order")
+    parser.add_argument("--suppliers", type=int, help="default: purchase orders / 100 (at least 10)")
+    parser.add_argument("--products", type=int, help="default: purchase orders / 20 (at least 20)")
+    parser.add_argument("--qc-ratio", type=float, default=0.6, help="share of POs with a QC report")
+    parser.add_argument("--receipt-ratio", type=float, default=0.8, help="share of QC'd POs with receipts")
+    parser.add_argument("--batch-size", type=int, default=5000, help="POs per transaction")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--as-of", type=date.fromisoformat, default=DEFAULT_AS_OF,
+                        help=f"rows are dated in the year before this YYYY-MM-DD date (default: {DEFAULT_AS_OF})")
+    args = parser.parse_args()
+
+    os.environ["DATABASE_URL"] = args.database_url
+    sys.path.insert(0, BACKEND_DIR)
+    from database import SessionLocal, engine
+    from crud.procurement import rebuild_purchase_order_aggregates, rebuild_stats
+    from crud.analytics import rebuild_rollups
+    from migrations import migrate
+
+    migrate(engine)
+    started = time.perf_counter()
+    counts = generate(
+        engine, args.purchase_orders, args.items,
+        suppliers=args.suppliers or max(10, args.purchase_orders // 100),
+        products=args.products or max(20, args.purchase_orders // 20),
+        qc_ratio=args.qc_ratio, receipt_ratio=args.receipt_ratio,
+        seed=args.seed, batch_size=args.batch_size, as_of=args.as_of,
+    )
+    with SessionLocal() as db:
+        rebuild_stats(db)
+        rebuild_rollups(db)
+        rebuild_purchase_order_aggregates(db)
+    elapsed = time.perf_counter() - started
+    for table, count in counts.items():
+        print(f"{table:>20}: {count:>9}")
+    print(f"{sum(counts.values())} rows in {elapsed:.1f} s ({args.database_url})")
+
+
+if __name__ == "__main__":
+    main()
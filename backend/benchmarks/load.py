@@ -0,0 +1,425 @@
+"""Drive every procurement route and report latency, throughput and SQL statements per endpoint.
+
+Runs in-process by default (httpx over ASGI against `--database-url`, which
+is what makes per-endpoint SQL counts possible), against a uvicorn server it
+starts with `--uvicorn`, or against one already running at `--base-url`:
+
+    python -m benchmarks.generator --database-url sqlite:///bench.db --purchase-orders 10000
+    python -m benchmarks.load --database-url sqlite:///bench.db --scratch --output after.json
+    python -m benchmarks.report before.json after.json
+
+Write scenarios add rows; pass `--scratch` (SQLite only) to run against a
+throwaway copy so every run starts from the same data. Any per-request
+setup, such as creating the PO a QC report is filed against, happens before
+the timed phase of its endpoint.
+"""
+import argparse
+import asyncio
+import contextvars
+import json
+import os
+import random
+import re
+import shutil
+import sys
+import tempfile
+import time
+import urllib.parse
+from collections import Counter
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Optional
+
+import httpx
+
+from benchmarks.report import build_report, print_report, summarize
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+API = "/api/procurement"
+
+# Endpoint whose request is in flight, so in-process SQL statements can be attributed to it
+CURRENT_ENDPOINT = contextvars.ContextVar("benchmark_endpoint", default=None)
+
+
+@dataclass
+class Scenario:
+    method: str
+    route: str  # path as declared on the router
+    build: Callable[["Context"], Awaitable[tuple]]  # untimed setup returning (url, request kwargs)
+    max_requests: Optional[int] = None  # cap for heavy endpoints such as full exports
+
+    @property
+    def name(self) -> str:
+        return f"{self.method} {self.route}"
+
+
+class Context:
+    """Client plus the ids the scenarios pick from, loaded through the API"""
+
+    def __init__(self, client: httpx.AsyncClient, seed: int):
+        self.client = client
+        self.rng = random.Random(seed)
+        self.serial = 0
+        self.suppliers = []
+        self.products = []
+        self.purchase_orders = []
+        self.pending = []
+        self.qc_reports = []
+        self.receipts = []
+
+    async def get(self, path: str, **params):
+        response = await self.client.get(API + path, params=params)
+        response.raise_for_status()
+        return response.json()
+
+    async def post(self, path: str, **kwargs):
+        response = await self.client.post(API + path, **kwargs)
+        response.raise_for_status()
+        return response.json()
+
+    async def load(self):
+        self.suppliers = await self.get("/suppliers", limit=1000)
+        self.products = await self.get("/products", limit=1000)
+        self.purchase_orders = await self.get("/purchase-orders", fields="status", limit=5000)
+        self.pending = [po["id"] for po in self.purchase_orders if po["status"] == "pending"]
+        self.qc_reports = await self.get("/qc-reports", fields="purchase_order_id", limit=5000)
+        self.receipts = await self.get("/receipts", limit=1000)
+        if not (self.suppliers and self.products and self.purchase_orders and self.qc_reports and self.receipts):
+            raise SystemExit("The database needs suppliers, products, POs, QC reports and receipts; "
+                             "fill it with benchmarks.generator first")
+
+    def unique(self, prefix: str) -> str:
+        self.serial += 1
+        return f"{prefix} {time.time_ns()}-{self.serial}"
+
+    def supplier(self, supplier_type: Optional[str] = None) -> dict:
+        return self.rng.choice([s for s in self.suppliers if supplier_type in (None, s["supplier_type"])])
+
+    def purchase_order_payload(self, supplier_type: str) -> dict:
+        payload = {
+            "supplier_id": self.supplier(supplier_type)["id"],
+            "payment_terms": "30 days",
+            "items": [
+                {"product_id": product["id"], "sn": sn, "quantity": self.rng.randint(1, 500),
+                 "rate": round(self.rng.uniform(0.5, 200), 2)}
+                for sn, product in enumerate(self.rng.sample(self.products, min(5, len(self.products))), start=1)
+            ],
+        }
+        if supplier_type == "local":
+            payload.update(station="Karachi", tax=17)
+        else:
+            payload.update(origin="Germany", payment_type="DA", dispatched_in="Sea")
+        return payload
+
+    async def pending_purchase_order(self) -> dict:
+        """A PO without a QC report, with its items"""
+        po_id = self.pending.pop() if self.pending else (
+            await self.post("/purchase-orders/local", json=self.purchase_order_payload("local"))
+        )["id"]
+        return await self.get(f"/purchase-orders/{po_id}")
+
+    async def qc_payload(self) -> dict:
+        po = await self.pending_purchase_order()
+        return {
+            "purchase_order_id": po["id"],
+            "inspector_name": "Load Test",
+            "items": [
+                {"po_item_id": item["id"], "status": "accepted", "accepted_qty": item["quantity"], "rejected_qty": 0}
+                for item in po["items"]
+            ],
+        }
+
+
+def _get(path: Callable[[Context], str]):
+    async def build(ctx: Context):
+        return path(ctx), {}
+    return build
+
+
+def _json(path: str, payload: Callable[[Context], Awaitable]):
+    async def build(ctx: Context):
+        return path, {"json": await payload(ctx)}
+    return build
+
+
+async def _new_supplier(ctx: Context):
+    return {"name": ctx.unique("Load Supplier"), "supplier_type": ctx.rng.choice(("local", "import"))}
+
+
+async def _new_product(ctx: Context):
+    return {"name": ctx.unique("Load Product"), "manufacturer": "Load Test"}
+
+
+async def _supplier_upserts(ctx: Context):
+    existing = [{"name": s["name"], "supplier_type": s["supplier_type"], "contact_person": "Sync"}
+                for s in ctx.rng.sample(ctx.suppliers, min(10, len(ctx.suppliers)))]
+    return existing + [await _new_supplier(ctx) for _ in range(10)]
+
+
+async def _product_upserts(ctx: Context):
+    existing = [{"name": p["name"], "manufacturer": "Sync"}
+                for p in ctx.rng.sample(ctx.products, min(10, len(ctx.products)))]
+    return existing + [await _new_product(ctx) for _ in range(10)]
+
+
+async def _update_supplier(ctx: Context):
+    return f"/suppliers/{_pick(ctx, ctx.suppliers)}", {"json": {"contact_person": ctx.unique("Contact")}}
+
+
+async def _update_product(ctx: Context):
+    return f"/products/{_pick(ctx, ctx.products)}", {"json": {"description": ctx.unique("Description")}}
+
+
+async def _delete_supplier(ctx: Context):
+    return f"/suppliers/{(await ctx.post('/suppliers', json=await _new_supplier(ctx)))['id']}", {}
+
+
+async def _delete_product(ctx: Context):
+    return f"/products/{(await ctx.post('/products', json=await _new_product(ctx)))['id']}", {}
+
+
+async def _local_purchase_order(ctx: Context):
+    return ctx.purchase_order_payload("local")
+
+
+async def _import_purchase_order(ctx: Context):
+    return ctx.purchase_order_payload("import")
+
+
+async def _bulk_upload(ctx: Context):
+    lines = []
+    for ref in range(10):
+        supplier_type = ctx.rng.choice(("local", "import"))
+        lines.append(json.dumps({"ref": ref, "supplier_type": supplier_type, **ctx.purchase_order_payload(supplier_type)}))
+    body = ("\n".join(lines) + "\n").encode()
+    return "/purchase-orders/bulk", {"files": {"file": ("load.ndjson", body, "application/x-ndjson")}}
+
+
+async def _qc_batch(ctx: Context):
+    return [await ctx.qc_payload() for _ in range(5)]
+
+
+async def _receipt(ctx: Context):
+    qc = ctx.rng.choice(ctx.qc_reports)
+    return {"purchase_order_id": qc["purchase_order_id"], "receipt_type": "accepted", "generated_by": "Load Test"}
+
+
+def _pick(ctx: Context, rows: list) -> int:
+    return ctx.rng.choice(rows)["id"]
+
+
+def _typed(ctx: Context, rows: list) -> str:
+    """What a user has typed so far into a picker: a prefix of a word from a random row's name"""
+    word = ctx.rng.choice(ctx.rng.choice(rows)["name"].split())
+    return urllib.parse.quote(word[:ctx.rng.randint(2, max(2, len(word)))])
+
+
+SCENARIOS = [
+    Scenario("GET", "/stats", _get(lambda ctx: "/stats")),
+    # Suppliers
+    Scenario("POST", "/suppliers", _json("/suppliers", _new_supplier)),
+    Scenario("POST", "/suppliers/bulk-upsert", _json("/suppliers/bulk-upsert", _supplier_upserts)),
+    Scenario("GET", "/suppliers", _get(lambda ctx: "/suppliers?limit=100")),
+    Scenario("GET", "/suppliers/search", _get(lambda ctx: f"/suppliers/search?q={_typed(ctx, ctx.suppliers)}")),
+    Scenario("GET", "/suppliers/{supplier_id}", _get(lambda ctx: f"/suppliers/{_pick(ctx, ctx.suppliers)}")),
+    Scenario("GET", "/suppliers/{supplier_id}/overview",
+             _get(lambda ctx: f"/suppliers/{_pick(ctx, ctx.suppliers)}/overview")),
+    Scenario("GET", "/suppliers/{supplier_id}/overview?view=summary",
+             _get(lambda ctx: f"/suppliers/{_pick(ctx, ctx.suppliers)}/overview?view=summary")),
+    Scenario("PUT", "/suppliers/{supplier_id}", _update_supplier),
+    Scenario("DELETE", "/suppliers/{supplier_id}", _delete_supplier),
+    # Products
+    Scenario("POST", "/products", _json("/products", _new_product)),
+    Scenario("POST", "/products/bulk-upsert", _json("/products/bulk-upsert", _product_upserts)),
+    Scenario("GET", "/products", _get(lambda ctx: "/products?limit=100")),
+    Scenario("GET", "/products/search", _get(lambda ctx: f"/products/search?q={_typed(ctx, ctx.products)}")),
+    Scenario("GET", "/products/{product_id}", _get(lambda ctx: f"/products/{_pick(ctx, ctx.products)}")),
+    Scenario("PUT", "/products/{product_id}", _update_product),
+    Scenario("DELETE", "/products/{product_id}", _delete_product),
+    # Purchase orders
+    Scenario("POST", "/purchase-orders/local", _json("/purchase-orders/local", _local_purchase_order)),
+    Scenario("POST", "/purchase-orders/import", _json("/purchase-orders/import", _import_purchase_order)),
+    Scenario("POST", "/purchase-orders/bulk", _bulk_upload),
+    Scenario("GET", "/purchase-orders", _get(lambda ctx: "/purchase-orders?limit=100")),
+    Scenario("GET", "/purchase-orders?supplier_id=",
+             _get(lambda ctx: f"/purchase-orders?supplier_id={_pick(ctx, ctx.suppliers)}&limit=100")),
+    Scenario("GET", "/purchase-orders/export", _get(lambda ctx: "/purchase-orders/export?format=csv"), max_requests=3),
+    Scenario("GET", "/purchase-orders/{po_id}",
+             _get(lambda ctx: f"/purchase-orders/{_pick(ctx, ctx.purchase_orders)}")),
+    Scenario("GET", "/purchase-orders/{po_id}/document",
+             _get(lambda ctx: f"/purchase-orders/{_pick(ctx, ctx.purchase_orders)}/document")),
+    # QC reports
+    Scenario("POST", "/qc-reports", _json("/qc-reports", Context.qc_payload)),
+    Scenario("POST", "/qc-reports/batch", _json("/qc-reports/batch", _qc_batch)),
+    Scenario("GET", "/qc-reports", _get(lambda ctx: "/qc-reports?limit=100")),
+    Scenario("GET", "/qc-reports/export", _get(lambda ctx: "/qc-reports/export?format=ndjson"), max_requests=3),
+    Scenario("GET", "/qc-reports/{qc_id}", _get(lambda ctx: f"/qc-reports/{_pick(ctx, ctx.qc_reports)}")),
+    Scenario("GET", "/qc-reports/{qc_id}/document",
+             _get(lambda ctx: f"/qc-reports/{_pick(ctx, ctx.qc_reports)}/document")),
+    Scenario("GET", "/qc-reports/by-po/{po_id}",
+             _get(lambda ctx: f"/qc-reports/by-po/{ctx.rng.choice(ctx.qc_reports)['purchase_order_id']}")),
+    # Receipts
+    Scenario("POST", "/receipts", _json("/receipts", _receipt)),
+    Scenario("GET", "/receipts", _get(lambda ctx: "/receipts?limit=100")),
+    Scenario("GET", "/receipts/export", _get(lambda ctx: "/receipts/export"), max_requests=3),
+    Scenario("GET", "/receipts/{receipt_id}", _get(lambda ctx: f"/receipts/{_pick(ctx, ctx.receipts)}")),
+    Scenario("GET", "/receipts/{receipt_id}/document",
+             _get(lambda ctx: f"/receipts/{_pick(ctx, ctx.receipts)}/document")),
+
+    Scenario("GET", "/analytics/suppliers", _get(lambda ctx: "/analytics/suppliers")),
+    Scenario("GET", "/analytics/suppliers/{supplier_id}/monthly",
+             _get(lambda ctx: f"/analytics/suppliers/{_pick(ctx, ctx.suppliers)}/monthly")),
+    Scenario("GET", "/analytics/suppliers/{supplier_id}/products",
+             _get(lambda ctx: f"/analytics/suppliers/{_pick(ctx, ctx.suppliers)}/products")),
+]
+
+
+def uncovered_routes() -> list:
+    """Routes declared on the procurement router that no scenario exercises"""
+    from routes.procurement import router
+
+    declared = {
+        f"{method} {route.path.removeprefix(router.prefix)}"
+        for route in router.routes for method in getattr(route, "methods", ())
+    }
+    return sorted(declared - {scenario.name for scenario in SCENARIOS})
+
+
+async def run_scenario(ctx: Context, scenario: Scenario, requests: int, concurrency: int,
+                       statements: Optional[Counter]) -> dict:
+    requests = min(requests, scenario.max_requests or requests)
+    prepared = [await scenario.build(ctx) for _ in range(requests)]
+    pending = iter(prepared)
+    latencies = []
+    errors = 0
+    first_error = None
+
+    async def worker():
+        nonlocal errors, first_error
+        for url, kwargs in pending:
+            token = CURRENT_ENDPOINT.set(scenario.name)
+            started = time.perf_counter()
+            try:
+                response = await ctx.client.request(scenario.method, API + url, **kwargs)
+            except httpx.TransportError as e:
+                errors += 1
+                first_error = first_error or repr(e)
+                continue
+            finally:
+                CURRENT_ENDPOINT.reset(token)
+            if response.status_code >= 400:
+                errors += 1
+                first_error = first_error or f"{response.status_code} {response.text[:200]}"
+                continue
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    result = summarize(latencies, errors, elapsed, statements[scenario.name] if statements is not None else None)
+    if first_error:
+        result["first_error"] = first_error
+    return result
+
+
+def count_statements(statements: Counter):
+    """Attribute every statement the app executes to the endpoint being measured"""
+    from sqlalchemy import event
+    import database
+
+    binds = {database.engine, database.read_engine}
+    if database.ASYNC_DB:
+        binds |= {database.async_engine.sync_engine, database.async_read_engine.sync_engine}
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        endpoint = CURRENT_ENDPOINT.get()
+        if endpoint is not None:
+            statements[endpoint] += 1
+
+    for bind in binds:
+        event.listen(bind, "before_cursor_execute", before_cursor_execute)
+
+
+async def drive(client: httpx.AsyncClient, args, statements: Optional[Counter]) -> dict:
+    ctx = Context(client, args.seed)
+    await ctx.load()
+    endpoints = {}
+    for scenario in SCENARIOS:
+        if args.only and not re.search(args.only, scenario.name):
+            continue
+        endpoints[scenario.name] = await run_scenario(ctx, scenario, args.requests, args.concurrency, statements)
+        row = endpoints[scenario.name]
+        print(f"{scenario.name:<48} p50 {row['p50_ms']:>8} ms  errors {row['errors']}", file=sys.stderr)
+    return endpoints
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--database-url", default=os.getenv("DATABASE_URL", "sqlite:///./bench.db"))
+    parser.add_argument("--base-url", help="benchmark a server that is already running")
+    parser.add_argument("--uvicorn", action="store_true", help="start a uvicorn server instead of running in-process")
+    parser.add_argument("--db-mode", default=os.getenv("DB_MODE", "sync"), choices=("sync", "async"))
+    parser.add_argument("--scratch", action="store_true", help="run against a temporary copy of the SQLite file")
+    parser.add_argument("--requests", type=int, default=100, help="requests per endpoint")
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--only", help="regex on 'METHOD /route' selecting endpoints")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="write the JSON report here")
+    args = parser.parse_args()
+
+    database_url = args.database_url
+    if args.scratch and not args.base_url:
+        source = database_url.split("sqlite:///", 1)[-1]
+        if not database_url.startswith("sqlite:///") or not os.path.exists(source):
+            raise SystemExit("--scratch needs an existing sqlite:/// database file")
+        target = os.path.join(tempfile.mkdtemp(), os.path.basename(source))
+        shutil.copy(source, target)
+        database_url = f"sqlite:///{target}"
+    os.environ.update(DATABASE_URL=database_url, DB_MODE=args.db_mode)
+    sys.path.insert(0, BACKEND_DIR)
+
+    missing = uncovered_routes()
+    if missing:
+        print(f"No scenario for: {', '.join(missing)}", file=sys.stderr)
+
+    statements = None
+    server = None
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    if args.base_url:
+        client = httpx.AsyncClient(base_url=args.base_url, limits=limits, timeout=120)
+        target = args.base_url
+    elif args.uvicorn:
+        from benchmarks.async_throughput import start_server
+        server, base_url = start_server(database_url, args.db_mode)
+        client = httpx.AsyncClient(base_url=base_url, limits=limits, timeout=120)
+        target = "uvicorn"
+    else:
+        import main as app_module
+        statements = Counter()
+        count_statements(statements)
+        client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app_module.app), base_url="http://benchmark",
+                                   timeout=120)
+        target = "in-process"
+
+    async def run():
+        async with client:
+            return await drive(client, args, statements)
+
+    try:
+        endpoints = asyncio.run(run())
+    finally:
+        if server:
+            server.terminate()
+            server.wait()
+
+    report = build_report(endpoints, {
+        "target": target, "db_mode": args.db_mode, "requests": args.requests,
+        "concurrency": args.concurrency, "seed": args.seed,
+    })
+    print_report(report)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
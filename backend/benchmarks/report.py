@@ -0,0 +1,108 @@
+"""Summarize and compare load-test results.
+
+`benchmarks.load` writes one JSON report per run; print one, or diff two
+runs (e.g. the parent commit against yours) endpoint by endpoint:
+
+    python -m benchmarks.report after.json
+    python -m benchmarks.report before.json after.json
+"""
+import argparse
+import json
+import math
+import subprocess
+from datetime import datetime
+from typing import List, Optional
+
+METRICS = ("rps", "p50_ms", "p95_ms", "p99_ms", "sql_per_request")
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    return sorted_values[max(0, math.ceil(fraction * len(sorted_values)) - 1)]
+
+
+def summarize(latencies: List[float], errors: int, elapsed: float, statements: Optional[int]) -> dict:
+    """Per-endpoint figures from latencies in seconds and the total SQL statements (None when unknown)"""
+    latencies = sorted(latencies)
+    requests = len(latencies) + errors
+    return {
+        "requests": requests,
+        "errors": errors,
+        "rps": round(requests / elapsed, 1) if elapsed else 0.0,
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 2),
+        "sql_per_request": round(statements / requests, 1) if statements is not None and requests else None,
+    }
+
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def build_report(endpoints: dict, settings: dict) -> dict:
+    return {
+        "revision": git_revision(),
+        "started_at": datetime.utcnow().isoformat(timespec="seconds"),
+        "settings": settings,
+        "endpoints": endpoints,
+    }
+
+
+def _cell(value) -> str:
+    return "-" if value is None else f"{value:g}"
+
+
+def print_report(report: dict):
+    print(f"revision {report.get('revision') or '?'}  {report.get('started_at', '')}  {report.get('settings', {})}")
+    print(f"{'endpoint':<48}{'reqs':>6}{'err':>5}{'rps':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'sql/req':>9}")
+    for name, row in report["endpoints"].items():
+        print(f"{name:<48}{row['requests']:>6}{row['errors']:>5}{_cell(row['rps']):>9}{_cell(row['p50_ms']):>9}"
+              f"{_cell(row['p95_ms']):>9}{_cell(row['p99_ms']):>9}{_cell(row['sql_per_request']):>9}")
+
+
+def _change(before, after) -> str:
+    if before is None or after is None:
+        return "-"
+    if not before:
+        return f"{after:g}"
+    return f"{after:g} ({(after - before) / before * 100:+.0f}%)"
+
+
+def compare_reports(before: dict, after: dict):
+    """Print each endpoint's metrics in `after` relative to `before`"""
+    print(f"{before.get('revision') or '?'} -> {after.get('revision') or '?'}")
+    print(f"{'endpoint':<48}" + "".join(f"{metric:>20}" for metric in METRICS))
+    for name, row in after["endpoints"].items():
+        old = before["endpoints"].get(name)
+        if old is None:
+            print(f"{name:<48}  (new)")
+            continue
+        print(f"{name:<48}" + "".join(f"{_change(old[metric], row[metric]):>20}" for metric in METRICS))
+    for name in sorted(before["endpoints"].keys() - after["endpoints"].keys()):
+        print(f"{name:<48}  (gone)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("reports", nargs="+", help="one report to print, or two to compare")
+    args = parser.parse_args()
+    loaded = []
+    for path in args.reports[:2]:
+        with open(path) as f:
+            loaded.append(json.load(f))
+    if len(loaded) == 1:
+        print_report(loaded[0])
+    else:
+        compare_reports(*loaded)
+
+
+if __name__ == "__main__":
+    main()
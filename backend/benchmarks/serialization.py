@@ -0,0 +1,87 @@
+"""Compare the Pydantic and FAST_JSON serialization paths on large PO payloads.
+
+Seeds a throwaway SQLite file, loads `--purchase-orders` POs with the same
+loader profile as GET /purchase-orders, then times both encoders on the
+same rows and checks that they produce the same JSON:
+
+    python -m benchmarks.serialization --purchase-orders 1000 --repeat 20
+
+The FAST_JSON path requires orjson.
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def seed(db, purchase_orders: int, items: int):
+    from crud import procurement, bulk
+    from schemas.procurement import ProductCreate, SupplierCreate
+
+    supplier = procurement.create_supplier(db, SupplierCreate(name="Bench Supplier", supplier_type="local"))
+    products = [procurement.create_product(db, ProductCreate(name=f"Bench Product {i}")) for i in range(items)]
+    records = (
+        (line, None, {
+            "supplier_type": "local",
+            "supplier_id": supplier.id,
+            "tax": 17,
+            "items": [
+                {"product_id": product.id, "sn": sn, "quantity": 10, "rate": 2.5}
+                for sn, product in enumerate(products, start=1)
+            ],
+        }, None)
+        for line in range(1, purchase_orders + 1)
+    )
+    bulk.import_purchase_orders(db, records, chunk_size=500)
+
+
+def timed(fn, repeat: int):
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        samples.append(time.perf_counter() - started)
+    return result, statistics.median(samples) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--purchase-orders", type=int, default=1000)
+    parser.add_argument("--items", type=int, default=5, help="items per purchase order")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}"
+    sys.path.insert(0, BACKEND_DIR)
+    from database import SessionLocal, engine
+    from migrations import migrate
+    from crud import procurement
+    from routes.serialization import JsonSerializer, orjson
+    from schemas.procurement import PurchaseOrderResponse
+
+    migrate(engine)
+    with SessionLocal() as db:
+        seed(db, args.purchase_orders, args.items)
+
+    with SessionLocal() as db:
+        rows, load_ms = timed(lambda: procurement.get_purchase_orders(db, limit=args.purchase_orders), 1)
+        serializer = JsonSerializer(PurchaseOrderResponse, many=True)
+        body, pydantic_ms = timed(lambda: serializer.pydantic(rows), args.repeat)
+        print(f"{len(rows)} purchase orders x {args.items} items, {len(body) / 1024:.0f} KiB of JSON "
+              f"(loaded in {load_ms:.1f} ms)")
+        print(f"pydantic : {pydantic_ms:8.1f} ms")
+        if orjson is None:
+            print("fast_json: skipped, orjson is not installed")
+            return
+        fast_body, fast_ms = timed(lambda: serializer.fast(rows), args.repeat)
+        same = json.loads(fast_body) == json.loads(body)
+        print(f"fast_json: {fast_ms:8.1f} ms  ({pydantic_ms / fast_ms:.1f}x, identical output: {same})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""Read latency during a burst of writes, with and without write admission control.
+
+Starts a uvicorn server per WRITE_CONCURRENCY setting against the same seeded
+SQLite file, keeps `--writers` clients creating purchase orders and measures
+the GETs `--readers` clients issue meanwhile:
+
+    python -m benchmarks.write_burst --writers 64 --readers 8 --limits 0,4
+
+Requires httpx.
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+
+import httpx
+
+from benchmarks.async_throughput import API, BACKEND_DIR, seed, start_server
+
+
+def _percentile(values: list, share: float) -> float:
+    values = sorted(values)
+    return values[max(0, int(len(values) * share) - 1)] * 1000 if values else float("nan")
+
+
+async def burst(base_url: str, read_path: str, writers: int, readers: int, seconds: float) -> dict:
+    async with httpx.AsyncClient(base_url=base_url + API, timeout=60) as client:
+        supplier_id = (await client.get("/suppliers", params={"limit": 1})).json()[0]["id"]
+        product_id = (await client.get("/products", params={"limit": 1})).json()[0]["id"]
+        po = {"supplier_id": supplier_id, "items": [{"product_id": product_id, "sn": 1, "quantity": 1, "rate": 1}]}
+        deadline = time.perf_counter() + seconds
+        writes, reads = Counter(), []
+
+        async def writer():
+            while time.perf_counter() < deadline:
+                try:
+                    response = await client.post("/purchase-orders/local", json=po)
+                    writes[response.status_code] += 1
+                    if response.status_code == 503:
+                        await asyncio.sleep(float(response.headers.get("Retry-After", 1)))
+                except httpx.TransportError:
+                    writes["transport error"] += 1
+
+        async def reader():
+            while time.perf_counter() < deadline:
+                started = time.perf_counter()
+                response = await client.get(read_path)
+                if response.status_code == 200:
+                    reads.append(time.perf_counter() - started)
+
+        await asyncio.gather(*(writer() for _ in range(writers)), *(reader() for _ in range(readers)))
+    return {
+        "writes": dict(writes),
+        "reads": len(reads),
+        "read_p50_ms": statistics.median(reads) * 1000 if reads else float("nan"),
+        "read_p99_ms": _percentile(reads, 0.99),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--writers", type=int, default=64)
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--purchase-orders", type=int, default=200)
+    parser.add_argument("--path", default="/purchase-orders?limit=20")
+    parser.add_argument("--limits", default="0,4", help="WRITE_CONCURRENCY values to compare (0: no limit)")
+    args = parser.parse_args()
+
+    database_url = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}"
+    subprocess.run([sys.executable, "manage.py", "migrate"], cwd=BACKEND_DIR, check=True,
+                   env=dict(os.environ, DATABASE_URL=database_url))
+    proc, base_url = start_server(database_url, "sync")
+    try:
+        seed(base_url, args.purchase_orders)
+    finally:
+        proc.terminate()
+        proc.wait()
+
+    print(f"GET {args.path} from {args.readers} readers while {args.writers} writers create POs for {args.seconds} s")
+    for limit in args.limits.split(","):
+        proc, base_url = start_server(database_url, "sync", WRITE_CONCURRENCY=limit)
+        try:
+            result = asyncio.run(burst(base_url, args.path, args.writers, args.readers, args.seconds))
+        finally:
+            proc.terminate()
+            proc.wait()
+        print(f"WRITE_CONCURRENCY={limit:>3}: reads {result['reads']:6d}  p50 {result['read_p50_ms']:7.1f} ms  "
+              f"p99 {result['read_p99_ms']:7.1f} ms  writes {result['writes']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,200 @@
+import re
+from collections import Counter, defaultdict
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import Float, Integer, case, cast, delete, desc, func, insert, literal, select, union_all, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from models.procurement import (
+    Supplier, Product, PurchaseOrder, PurchaseOrderItem, QCReport, QCReportItem, SupplierProductMonth
+)
+
+ROLLUP_KEY = ("supplier_id", "product_id", "month")
+ORDER_MEASURES = ("order_lines", "ordered_qty", "spend")
+QC_MEASURES = ("inspected_lines", "rejected_lines", "accepted_qty", "rejected_qty", "accepted_value", "rejected_value")
+ROLLUP_MEASURES = ORDER_MEASURES + QC_MEASURES
+
+# ON CONFLICT support by dialect; other backends fall back to UPDATE, then INSERT when no row matched
+UPSERT_INSERTS = {
+    "sqlite": sqlite.insert,
+    "postgresql": postgresql.insert,
+}
+
+_MONTH = re.compile(r"^\d{4}-(0[1-9]|1[0-2])$")
+
+
+def month_of(when: datetime) -> str:
+    return when.strftime("%Y-%m")
+
+
+# ==================== INCREMENTAL UPDATES ====================
+def purchase_order_rollups(supplier_id: int, created_at: datetime, items, item_totals, tax: Optional[float]) -> dict:
+    """Rollup deltas for a new PO: (supplier_id, product_id, month) -> {measure: delta}"""
+    deltas = defaultdict(Counter)
+    month = month_of(created_at)
+    for item, item_total in zip(items, item_totals):
+        deltas[supplier_id, item.product_id, month].update(
+            order_lines=1,
+            ordered_qty=item.quantity,
+            spend=item_total + item_total * tax / 100 if tax else item_total,
+        )
+    return deltas
+
+def qc_report_rollups(supplier_id: int, inspected_at: datetime, lines) -> dict:
+    """Rollup deltas for a new QC report from (product_id, QCReportItem) pairs"""
+    deltas = defaultdict(Counter)
+    month = month_of(inspected_at)
+    for product_id, qc_item in lines:
+        deltas[supplier_id, product_id, month].update(
+            inspected_lines=1,
+            rejected_lines=1 if qc_item.rejected_qty else 0,
+            accepted_qty=qc_item.accepted_qty,
+            rejected_qty=qc_item.rejected_qty,
+            accepted_value=qc_item.accepted_value,
+            rejected_value=qc_item.rejected_value,
+        )
+    return deltas
+
+def merge_rollups(target: dict, deltas: dict):
+    for key, measures in deltas.items():
+        target.setdefault(key, Counter()).update(measures)
+
+def bump_rollups(db: Session, deltas: dict):
+    """Add rollup deltas inside the caller's transaction, creating missing rows"""
+    rows = [
+        {**dict(zip(ROLLUP_KEY, key)), **{name: measures.get(name, 0) for name in ROLLUP_MEASURES}}
+        for key, measures in deltas.items()
+    ]
+    if not rows:
+        return
+    table = SupplierProductMonth.__table__
+    dialect_insert = UPSERT_INSERTS.get(db.get_bind().dialect.name)
+    if dialect_insert is not None:
+        stmt = dialect_insert(SupplierProductMonth)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c[name] for name in ROLLUP_KEY],
+            set_={name: table.c[name] + stmt.excluded[name] for name in ROLLUP_MEASURES},
+        )
+        db.execute(stmt, rows)
+        return
+    for row in rows:
+        result = db.execute(
+            update(SupplierProductMonth)
+            .where(*(table.c[name] == row[name] for name in ROLLUP_KEY))
+            .values({name: table.c[name] + row[name] for name in ROLLUP_MEASURES})
+        )
+        if not result.rowcount:
+            db.execute(insert(SupplierProductMonth).values(row))
+
+
+# ==================== REBUILD ====================
+def _month_expression(db: Session, column):
+    if db.get_bind().dialect.name == "sqlite":
+        return func.strftime("%Y-%m", column)
+    return func.to_char(column, "YYYY-MM")
+
+def rebuild_rollups(db: Session) -> int:
+    """Recompute every rollup row from the base tables with one INSERT ... SELECT; returns the row count"""
+    zero, zero_count = cast(literal(0.0), Float), cast(literal(0), Integer)
+    ordered = (
+        select(
+            PurchaseOrder.supplier_id.label("supplier_id"),
+            PurchaseOrderItem.product_id.label("product_id"),
+            _month_expression(db, PurchaseOrder.created_at).label("month"),
+            cast(literal(1), Integer).label("order_lines"),
+            PurchaseOrderItem.quantity.label("ordered_qty"),
+            (PurchaseOrderItem.total * (1 + func.coalesce(PurchaseOrder.tax, 0.0) / 100)).label("spend"),
+            *(zero_count.label(name) if name.endswith("_lines") else zero.label(name) for name in QC_MEASURES),
+        )
+        .join(PurchaseOrder, PurchaseOrder.id == PurchaseOrderItem.purchase_order_id)
+    )
+    inspected = (
+        select(
+            PurchaseOrder.supplier_id, PurchaseOrderItem.product_id,
+            _month_expression(db, QCReport.inspection_date),
+            zero_count, zero, zero,
+            cast(literal(1), Integer),
+            case((QCReportItem.rejected_qty > 0, 1), else_=0),
+            func.coalesce(QCReportItem.accepted_qty, 0.0),
+            func.coalesce(QCReportItem.rejected_qty, 0.0),
+            func.coalesce(QCReportItem.accepted_value, 0.0),
+            func.coalesce(QCReportItem.rejected_value, 0.0),
+        )
+        .join(QCReport, QCReport.id == QCReportItem.qc_report_id)
+        .join(PurchaseOrderItem, PurchaseOrderItem.id == QCReportItem.po_item_id)
+        .join(PurchaseOrder, PurchaseOrder.id == PurchaseOrderItem.purchase_order_id)
+    )
+    lines = union_all(ordered, inspected).subquery()
+    totals = (
+        select(
+            *(lines.c[name] for name in ROLLUP_KEY),
+            *(func.sum(lines.c[name]) for name in ROLLUP_MEASURES),
+        )
+        .group_by(*(lines.c[name] for name in ROLLUP_KEY))
+    )
+    db.execute(delete(SupplierProductMonth))
+    db.execute(insert(SupplierProductMonth).from_select(ROLLUP_KEY + ROLLUP_MEASURES, totals))
+    db.commit()
+    return db.query(func.count()).select_from(SupplierProductMonth).scalar()
+
+def ensure_rollups(db: Session):
+    """Backfill the rollups for databases with purchase orders created before they existed"""
+    if db.query(SupplierProductMonth.month).first() is None and db.query(PurchaseOrder.id).first() is not None:
+        rebuild_rollups(db)
+
+
+# ==================== QUERIES ====================
+def _figures():
+    """Summed measures plus the rejection rate (rejected share of the inspected quantity)"""
+    sums = [func.sum(getattr(SupplierProductMonth, name)).label(name) for name in ROLLUP_MEASURES]
+    inspected_qty = func.sum(SupplierProductMonth.accepted_qty) + func.sum(SupplierProductMonth.rejected_qty)
+    rejection_rate = case(
+        (inspected_qty > 0, func.sum(SupplierProductMonth.rejected_qty) / inspected_qty), else_=0.0
+    ).label("rejection_rate")
+    return [*sums, rejection_rate]
+
+def _month_range(month_from: Optional[str], month_to: Optional[str]) -> list:
+    for value in (month_from, month_to):
+        if value is not None and not _MONTH.match(value):
+            raise ValueError(f"Month '{value}' must be in YYYY-MM format")
+    conditions = []
+    if month_from:
+        conditions.append(SupplierProductMonth.month >= month_from)
+    if month_to:
+        conditions.append(SupplierProductMonth.month <= month_to)
+    return conditions
+
+def get_supplier_performance(db: Session, month_from: Optional[str] = None, month_to: Optional[str] = None,
+                             limit: int = 100):
+    """Per-supplier totals over the month range, highest spend first"""
+    return db.execute(
+        select(SupplierProductMonth.supplier_id, Supplier.name.label("supplier_name"), *_figures())
+        .join(Supplier, Supplier.id == SupplierProductMonth.supplier_id)
+        .where(*_month_range(month_from, month_to))
+        .group_by(SupplierProductMonth.supplier_id, Supplier.name)
+        .order_by(desc("spend"), SupplierProductMonth.supplier_id)
+        .limit(limit)
+    ).all()
+
+def get_supplier_monthly_performance(db: Session, supplier_id: int, month_from: Optional[str] = None,
+                                     month_to: Optional[str] = None):
+    """One supplier's totals per month, oldest first"""
+    return db.execute(
+        select(SupplierProductMonth.month, *_figures())
+        .where(SupplierProductMonth.supplier_id == supplier_id, *_month_range(month_from, month_to))
+        .group_by(SupplierProductMonth.month)
+        .order_by(SupplierProductMonth.month)
+    ).all()
+
+def get_supplier_product_performance(db: Session, supplier_id: int, month_from: Optional[str] = None,
+                                     month_to: Optional[str] = None):
+    """One supplier's totals per product over the month range, highest spend first"""
+    return db.execute(
+        select(SupplierProductMonth.product_id, Product.name.label("product_name"), *_figures())
+        .join(Product, Product.id == SupplierProductMonth.product_id)
+        .where(SupplierProductMonth.supplier_id == supplier_id, *_month_range(month_from, month_to))
+        .group_by(SupplierProductMonth.product_id, Product.name)
+        .order_by(desc("spend"), SupplierProductMonth.product_id)
+    ).all()
@@ -0,0 +1,83 @@
+"""Awaitable counterparts of the CRUD functions for `async def` routes.
+
+Each wrapper takes the session from `get_db` (Session or AsyncSession,
+depending on DB_MODE) and runs the sync implementation through `run_db`, so
+both stacks share one copy of the business logic. With WRITE_PIPELINE the
+single-row writes ignore that session and join the group-commit writer's
+next batch instead.
+"""
+import functools
+
+from database import run_db
+from crud import procurement, bulk, search, analytics, documents
+from crud.group_commit import WRITE_PIPELINE, write_pipeline
+
+
+def _awaitable(fn):
+    @functools.wraps(fn)
+    async def wrapper(db, *args, **kwargs):
+        return await run_db(db, fn, *args, **kwargs)
+    return wrapper
+
+
+def _write(fn):
+    if not WRITE_PIPELINE:
+        return _awaitable(fn)
+
+    @functools.wraps(fn)
+    async def wrapper(db, *args, **kwargs):
+        return await write_pipeline.run(fn, *args, **kwargs)
+    return wrapper
+
+
+# Stats
+get_stats = _awaitable(procurement.get_stats)
+get_table_version = _awaitable(procurement.get_table_version)
+
+# Suppliers
+create_supplier = _write(procurement.create_supplier)
+get_supplier = _awaitable(procurement.get_supplier)
+get_supplier_overview = _awaitable(procurement.get_supplier_overview)
+get_suppliers = _awaitable(procurement.get_suppliers)
+update_supplier = _write(procurement.update_supplier)
+delete_supplier = _write(procurement.delete_supplier)
+upsert_suppliers = _awaitable(bulk.upsert_suppliers)
+search_suppliers = _awaitable(search.search_suppliers)
+
+# Products
+create_product = _write(procurement.create_product)
+get_product = _awaitable(procurement.get_product)
+get_products = _awaitable(procurement.get_products)
+update_product = _write(procurement.update_product)
+delete_product = _write(procurement.delete_product)
+upsert_products = _awaitable(bulk.upsert_products)
+search_products = _awaitable(search.search_products)
+
+# Purchase orders
+create_local_purchase_order = _write(procurement.create_local_purchase_order)
+create_import_purchase_order = _write(procurement.create_import_purchase_order)
+import_purchase_orders = _awaitable(bulk.import_purchase_orders)
+get_purchase_order = _awaitable(procurement.get_purchase_order)
+get_purchase_orders = _awaitable(procurement.get_purchase_orders)
+get_purchase_order_summaries = _awaitable(procurement.get_purchase_order_summaries)
+
+# QC reports
+create_qc_report = _write(procurement.create_qc_report)
+create_qc_reports = _write(procurement.create_qc_reports)
+get_qc_report = _awaitable(procurement.get_qc_report)
+get_qc_report_by_po = _awaitable(procurement.get_qc_report_by_po)
+get_qc_reports = _awaitable(procurement.get_qc_reports)
+get_qc_report_summaries = _awaitable(procurement.get_qc_report_summaries)
+
+# Receipts
+create_receipt = _write(procurement.create_receipt)
+get_receipt = _awaitable(procurement.get_receipt)
+get_receipts = _awaitable(procurement.get_receipts)
+
+# Analytics
+get_supplier_performance = _awaitable(analytics.get_supplier_performance)
+get_supplier_monthly_performance = _awaitable(analytics.get_supplier_monthly_performance)
+get_supplier_product_performance = _awaitable(analytics.get_supplier_product_performance)
+
+# Printable documents
+get_document_version = _awaitable(documents.document_version)
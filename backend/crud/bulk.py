@@ -0,0 +1,315 @@
+import csv
+import json
+from collections import Counter
+from itertools import islice
+from typing import BinaryIO, Iterator, List, Optional
+
+from pydantic import ValidationError
+from datetime import datetime
+
+from sqlalchemy import insert, or_, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+import metrics
+from models.procurement import Supplier, Product, PurchaseOrder, PurchaseOrderItem, SupplierType
+from schemas.procurement import LocalPurchaseOrderCreate, ImportPurchaseOrderCreate, ProductCreate, SupplierCreate
+from crud.analytics import bump_rollups, merge_rollups, purchase_order_rollups
+from crud.procurement import (
+    bump_counters, calculate_po_totals, generate_po_number, purchase_order_counter_deltas,
+    purchase_order_item_aggregates, PRODUCTS_COUNTER, SUPPLIERS_COUNTER, PRODUCTS_VERSION, SUPPLIERS_VERSION
+)
+
+BULK_FORMATS = ("csv", "ndjson")
+
+SUPPLIER_TYPES = {supplier_type.value for supplier_type in SupplierType}
+
+PO_SCHEMAS = {
+    SupplierType.LOCAL: LocalPurchaseOrderCreate,
+    SupplierType.IMPORT: ImportPurchaseOrderCreate,
+}
+
+# Header-level columns shared by every PO row, whether or not a type uses them
+PO_COLUMNS = (
+    "supplier_id", "payment_terms", "origin", "payment_type", "dispatched_from",
+    "dispatched_in", "validity_indent", "station", "tax",
+)
+ITEM_COLUMNS = ("product_id", "sn", "quantity", "rate")
+
+# ON CONFLICT support by dialect; other backends fall back to INSERT + UPDATE executemany
+UPSERT_INSERTS = {
+    "sqlite": sqlite.insert,
+    "postgresql": postgresql.insert,
+}
+
+
+def detect_format(filename: Optional[str], content_type: Optional[str]) -> Optional[str]:
+    """Guess the upload format from its file name or content type"""
+    name = (filename or "").lower()
+    if name.endswith(".csv") or content_type == "text/csv":
+        return "csv"
+    if name.endswith((".ndjson", ".jsonl")) or content_type in ("application/x-ndjson", "application/jsonl"):
+        return "ndjson"
+    return None
+
+
+# ==================== PARSING ====================
+def read_purchase_order_records(stream: BinaryIO, fmt: str) -> Iterator[tuple]:
+    """Lazily yield (line, ref, data, error) for each PO in an upload.
+
+    CSV uploads carry one item per line; consecutive lines sharing a `ref`
+    make up one PO and its header columns are taken from the first of them.
+    NDJSON uploads carry one PO per line in the same shape as the single-PO
+    endpoints plus a `supplier_type` field.
+    """
+    if fmt == "csv":
+        return _csv_records(_decoded_lines(stream))
+    if fmt == "ndjson":
+        return _ndjson_records(stream)
+    raise ValueError(f"Unsupported format '{fmt}', expected one of: {', '.join(BULK_FORMATS)}")
+
+
+def _decoded_lines(stream: BinaryIO) -> Iterator[str]:
+    """Lines of a UTF-8 upload, decoded one at a time so invalid bytes fail on their own line, not a block's"""
+    for number, raw in enumerate(stream):
+        yield raw.decode("utf-8-sig" if number == 0 else "utf-8")
+
+
+def _csv_records(lines) -> Iterator[tuple]:
+    group, ref, line = [], None, 1
+    try:
+        for line, row in enumerate(csv.DictReader(lines), start=2):
+            row_ref = row.get("ref") or f"#{line}"
+            if group and row_ref != ref:
+                yield _csv_record(group)
+                group = []
+            ref = row_ref
+            group.append((line, row))
+    except (csv.Error, UnicodeDecodeError) as e:
+        # The reader cannot resume past a malformed line (e.g. an oversized field), so the import ends there.
+        # The PO still being read may continue on that line, so it is reported in the line's place, unimported.
+        first_line, first = group[0] if group else (line + 1, {})
+        yield first_line, first.get("ref") or None, None, (
+            f"Upload unreadable from line {line + 1} ({e}); this PO and everything after it were not imported"
+        )
+        return
+    if group:
+        yield _csv_record(group)
+
+
+def _csv_record(group: List[tuple]) -> tuple:
+    line, first = group[0]
+    data = {key: value or None for key, value in first.items() if key and key not in ITEM_COLUMNS}
+    data["items"] = [
+        {
+            "product_id": row.get("product_id"),
+            "sn": row.get("sn") or position,
+            "quantity": row.get("quantity"),
+            "rate": row.get("rate"),
+        }
+        for position, (_, row) in enumerate(group, start=1)
+    ]
+    return line, first.get("ref") or None, data, None
+
+
+def _ndjson_records(stream: BinaryIO) -> Iterator[tuple]:
+    for line, raw in enumerate(stream, start=1):
+        try:
+            raw = raw.decode("utf-8-sig" if line == 1 else "utf-8")
+        except UnicodeDecodeError as e:
+            yield line, None, None, f"Not UTF-8: {e}"
+            continue
+        if not raw.strip():
+            continue
+        try:
+            data = json.loads(raw)
+            if not isinstance(data, dict):
+                raise ValueError("Expected a JSON object")
+        except ValueError as e:
+            yield line, None, None, f"Invalid JSON: {e}"
+            continue
+        ref = data.get("ref")
+        yield line, str(ref) if ref is not None else None, data, None
+
+
+# ==================== PURCHASE ORDER IMPORT ====================
+def import_purchase_orders(db: Session, records, chunk_size: int = 100) -> dict:
+    """Validate and insert POs from `records`, committing every `chunk_size` POs"""
+    records = iter(records)
+    results = []
+    while True:
+        chunk = list(islice(records, max(1, chunk_size)))
+        if not chunk:
+            break
+        results.extend(_import_chunk(db, chunk))
+    created = sum(1 for result in results if result["status"] == "created")
+    return {"created": created, "failed": len(results) - created, "results": results}
+
+
+def _error(line: int, ref: Optional[str], message: str) -> dict:
+    return {"line": line, "ref": ref, "status": "error", "error": message}
+
+
+def _import_chunk(db: Session, chunk: List[tuple]) -> List[dict]:
+    results = []
+    parsed = []
+    for line, ref, data, error in chunk:
+        if error:
+            results.append(_error(line, ref, error))
+            continue
+        raw_type = str(data.get("supplier_type") or "").lower()
+        if raw_type not in SUPPLIER_TYPES:
+            results.append(_error(line, ref, "supplier_type must be 'local' or 'import'"))
+            continue
+        supplier_type = SupplierType(raw_type)
+        try:
+            parsed.append((line, ref, supplier_type, PO_SCHEMAS[supplier_type].model_validate(data)))
+        except ValidationError as e:
+            results.append(_error(line, ref, str(e)))
+    
+    # Validate every referenced supplier and product with one IN query each
+    supplier_ids = {po.supplier_id for _, _, _, po in parsed}
+    product_ids = {item.product_id for _, _, _, po in parsed for item in po.items}
+    known_suppliers = set(db.scalars(select(Supplier.id).where(Supplier.id.in_(supplier_ids)))) if supplier_ids else set()
+    known_products = set(db.scalars(select(Product.id).where(Product.id.in_(product_ids)))) if product_ids else set()
+    
+    valid = []
+    for line, ref, supplier_type, po in parsed:
+        missing = sorted({item.product_id for item in po.items} - known_products)
+        if po.supplier_id not in known_suppliers:
+            results.append(_error(line, ref, "Supplier not found"))
+        elif not po.items:
+            results.append(_error(line, ref, "Purchase order has no items"))
+        elif missing:
+            results.append(_error(line, ref, f"Product(s) {', '.join(map(str, missing))} not found"))
+        else:
+            valid.append((line, ref, supplier_type, po))
+    
+    if valid:
+        results.extend(_insert_purchase_orders(db, valid))
+    return sorted(results, key=lambda result: result["line"])
+
+
+def _insert_purchase_orders(db: Session, valid: List[tuple]) -> List[dict]:
+    # Numbers are reserved before this session writes anything, see DocumentNumberAllocator
+    po_rows = []
+    item_totals_per_po = []
+    deltas = Counter()
+    rollups = {}
+    now = datetime.utcnow()
+    for _, _, supplier_type, po in valid:
+        tax = getattr(po, "tax", None)
+        item_totals, total_amount = calculate_po_totals(po.items, tax)
+        row = {column: getattr(po, column, None) for column in PO_COLUMNS}
+        row.update(
+            po_number=generate_po_number(db),
+            supplier_type=supplier_type,
+            total_amount=total_amount,
+            created_at=now,
+            **purchase_order_item_aggregates(po.items),
+        )
+        po_rows.append(row)
+        item_totals_per_po.append(item_totals)
+        deltas.update(purchase_order_counter_deltas(supplier_type, total_amount))
+        merge_rollups(rollups, purchase_order_rollups(po.supplier_id, now, po.items, item_totals, tax))
+    
+    try:
+        po_ids = db.scalars(
+            insert(PurchaseOrder).returning(PurchaseOrder.id, sort_by_parameter_order=True),
+            po_rows
+        ).all()
+        item_rows = [
+            dict(
+                purchase_order_id=po_id,
+                total=item_total,
+                **{column: getattr(item, column) for column in ITEM_COLUMNS}
+            )
+            for po_id, (_, _, _, po), item_totals in zip(po_ids, valid, item_totals_per_po)
+            for item, item_total in zip(po.items, item_totals)
+        ]
+        db.execute(insert(PurchaseOrderItem), item_rows)
+        bump_counters(db, deltas)
+        bump_rollups(db, rollups)
+        db.commit()
+    except SQLAlchemyError as e:
+        db.rollback()
+        return [_error(line, ref, f"Chunk rolled back: {e.__class__.__name__}") for line, ref, _, _ in valid]
+    for supplier_type, count in Counter(supplier_type for _, _, supplier_type, _ in valid).items():
+        metrics.purchase_orders_created(supplier_type.value, count)
+    
+    return [
+        {"line": line, "ref": ref, "status": "created", "id": po_id, "po_number": row["po_number"]}
+        for po_id, row, (line, ref, _, _) in zip(po_ids, po_rows, valid)
+    ]
+
+
+# ==================== CATALOG UPSERT ====================
+def upsert_products(db: Session, products: List[ProductCreate], batch_size: int = 1000) -> dict:
+    """Create or update products keyed on their unique name"""
+    return _upsert_by_name(db, Product, products, PRODUCTS_COUNTER, PRODUCTS_VERSION, batch_size)
+
+
+def upsert_suppliers(db: Session, suppliers: List[SupplierCreate], batch_size: int = 1000) -> dict:
+    """Create or update suppliers keyed on their unique name"""
+    return _upsert_by_name(db, Supplier, suppliers, SUPPLIERS_COUNTER, SUPPLIERS_VERSION, batch_size)
+
+
+def _plain(value):
+    return value.value if hasattr(value, "value") else value
+
+
+def _upsert_by_name(db: Session, model, payloads, counter: str, version: str, batch_size: int) -> dict:
+    # Last occurrence of a name wins, as it would with one request per row
+    rows = {payload.name: payload.model_dump() for payload in payloads}
+    columns = [column for column in next(iter(rows.values()), {}) if column != "name"]
+    totals = {"created": 0, "updated": 0, "unchanged": 0}
+    names = list(rows)
+    batch_size = max(1, batch_size)
+    for start in range(0, len(names), batch_size):
+        batch = {name: rows[name] for name in names[start:start + batch_size]}
+        existing = {
+            row.name: row
+            for row in db.execute(
+                select(model.id, model.name, *(getattr(model, column) for column in columns))
+                .where(model.name.in_(batch))
+            )
+        }
+        created, changed = [], {}
+        for name, values in batch.items():
+            current = existing.get(name)
+            if current is None:
+                created.append(values)
+            elif any(_plain(getattr(current, column)) != _plain(values[column]) for column in columns):
+                changed[current.id] = values
+        totals["created"] += len(created)
+        totals["updated"] += len(changed)
+        totals["unchanged"] += len(batch) - len(created) - len(changed)
+        if created or changed:
+            _write_upsert_batch(db, model, columns, created, changed)
+            bump_counters(db, {counter: len(created), version: 1})
+            db.commit()
+    return totals
+
+
+def _write_upsert_batch(db: Session, model, columns: List[str], created: List[dict], changed: dict):
+    now = datetime.utcnow()
+    dialect_insert = UPSERT_INSERTS.get(db.get_bind().dialect.name)
+    if dialect_insert is not None:
+        stmt = dialect_insert(model)
+        table = model.__table__
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c.name],
+            set_={**{column: stmt.excluded[column] for column in columns}, "updated_at": now},
+            # Skip rows another writer already brought up to date
+            where=or_(*(table.c[column].is_distinct_from(stmt.excluded[column]) for column in columns)),
+        )
+        db.execute(stmt, created + list(changed.values()))
+        return
+    if created:
+        db.execute(insert(model), created)
+    if changed:
+        # ORM bulk UPDATE by primary key
+        db.execute(update(model), [
+            {"id": row_id, **values, "updated_at": now} for row_id, values in changed.items()
+        ])
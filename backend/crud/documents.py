@@ -0,0 +1,326 @@
+"""Printable purchase order, QC report and receipt documents.
+
+A document is rendered once to print-ready HTML (and PDF when WeasyPrint is
+installed) and stored under DOCUMENT_CACHE_DIR/<kind>/<id>/, in a file named
+after the hash of its kind, id, version column (`updated_at`; receipts never
+change, so `created_at`), format and TEMPLATE_REVISION. A changed document
+hashes to a new file, so cached files are never rewritten or invalidated, and a
+download only needs that one column to find its file. Rendering a new version
+deletes the files of the versions it supersedes once DOCUMENT_EVICT_GRACE_SECONDS
+have passed (a download may have just looked one up), so the cache holds about
+one file per document and format. Supplier and product names are those current
+when the version was rendered, as on a printed copy.
+
+New documents are rendered by a small background pool right after creation;
+a download that misses the cache joins the same pool and waits.
+"""
+import enum
+import hashlib
+import heapq
+import html
+import logging
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime
+from typing import Callable, NamedTuple, Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session, joinedload, selectinload, sessionmaker
+
+from database import PrimaryReadSessionLocal
+from models.procurement import PurchaseOrder, PurchaseOrderItem, QCReport, QCReportItem, Receipt
+
+# WeasyPrint is optional; without it documents are HTML only (print to PDF from the browser)
+try:
+    import weasyprint
+except ImportError:
+    weasyprint = None
+
+logger = logging.getLogger("uvicorn.error")
+
+DOCUMENT_CACHE_DIR = os.getenv("DOCUMENT_CACHE_DIR", "./document_cache")
+DOCUMENT_RENDER_WORKERS = int(os.getenv("DOCUMENT_RENDER_WORKERS", "2"))
+# How long a superseded file outlives the render replacing it, for downloads that looked it up just before
+DOCUMENT_EVICT_GRACE_SECONDS = float(os.getenv("DOCUMENT_EVICT_GRACE_SECONDS", "60"))
+# Render new documents in the background right after creation, not on their first download
+DOCUMENT_PRERENDER = os.getenv("DOCUMENT_PRERENDER", "true").lower() in ("1", "true", "yes")
+
+# Bump when the templates change so documents render afresh under new names
+TEMPLATE_REVISION = 1
+
+DOCUMENT_FORMATS = ("html", "pdf") if weasyprint is not None else ("html",)
+DOCUMENT_MEDIA_TYPES = {
+    "html": "text/html; charset=utf-8",
+    "pdf": "application/pdf",
+}
+
+PURCHASE_ORDER = "purchase_order"
+QC_REPORT = "qc_report"
+RECEIPT = "receipt"
+
+
+# ==================== TEMPLATES ====================
+STYLE = """
+@page { size: A4; margin: 18mm 15mm; }
+body { font-family: "Helvetica Neue", Arial, sans-serif; font-size: 11pt; color: #111; margin: 0; }
+h1 { font-size: 18pt; margin: 0 0 2mm; }
+.number { font-size: 12pt; color: #444; margin-bottom: 6mm; }
+dl { display: grid; grid-template-columns: 40mm 1fr; gap: 1.5mm 4mm; margin: 0 0 6mm; }
+dt { font-weight: bold; }
+dd { margin: 0; }
+table { width: 100%; border-collapse: collapse; margin-bottom: 6mm; }
+th, td { border: 0.3mm solid #999; padding: 1.5mm 2mm; text-align: left; }
+th { background: #eee; }
+td.n, th.n { text-align: right; }
+tr { page-break-inside: avoid; }
+.remarks { white-space: pre-wrap; margin-bottom: 6mm; }
+.signatures { display: flex; justify-content: space-between; margin-top: 20mm; }
+.signatures div { border-top: 0.3mm solid #111; width: 55mm; padding-top: 1.5mm; text-align: center; }
+"""
+
+def _text(value) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, datetime):
+        return value.strftime("%d %b %Y")
+    if isinstance(value, enum.Enum):
+        value = value.value.replace("_", " ")
+    return html.escape(str(value))
+
+def _amount(value) -> str:
+    return f"{value or 0:,.2f}"
+
+def _fields(pairs) -> str:
+    return "<dl>" + "".join(f"<dt>{label}</dt><dd>{_text(value)}</dd>" for label, value in pairs if value) + "</dl>"
+
+def _table(head, rows, numeric_from: int) -> str:
+    cells = lambda values, tag: "".join(
+        f'<{tag}{" class=n" if i >= numeric_from else ""}>{value}</{tag}>' for i, value in enumerate(values)
+    )
+    body = "".join(f"<tr>{cells(row, 'td')}</tr>" for row in rows)
+    return f"<table><thead><tr>{cells(head, 'th')}</tr></thead><tbody>{body}</tbody></table>"
+
+def _page(title: str, number: str, *sections: str, signatures=()) -> str:
+    signed = "".join(f"<div>{label}</div>" for label in signatures)
+    return (
+        f'<!DOCTYPE html><html lang="en"><head><meta charset="utf-8"><title>{html.escape(number)}</title>'
+        f"<style>{STYLE}</style></head><body><h1>{title}</h1><div class=number>{html.escape(number)}</div>"
+        + "".join(sections)
+        + (f"<div class=signatures>{signed}</div>" if signed else "")
+        + "</body></html>"
+    )
+
+def _remarks(remarks: Optional[str]) -> str:
+    return f"<h3>Remarks</h3><div class=remarks>{html.escape(remarks)}</div>" if remarks else ""
+
+def render_purchase_order(po: PurchaseOrder) -> str:
+    fields = _fields([
+        ("Supplier", po.supplier.name), ("Type", po.supplier_type), ("Date", po.created_at), ("Status", po.status),
+        ("Payment terms", po.payment_terms), ("Origin", po.origin), ("Payment type", po.payment_type),
+        ("Dispatched from", po.dispatched_from), ("Dispatched in", po.dispatched_in),
+        ("Validity of indent", po.validity_indent), ("Station", po.station),
+    ])
+    items = sorted(po.items, key=lambda item: (item.sn or 0, item.id))
+    rows = [
+        (_text(item.sn), _text(item.product.name), _amount(item.quantity), _amount(item.rate), _amount(item.total))
+        for item in items
+    ]
+    subtotal = sum(item.total for item in items)
+    if po.tax:
+        rows.append(("", "<b>Subtotal</b>", "", "", _amount(subtotal)))
+        rows.append(("", f"<b>Tax ({_amount(po.tax)}%)</b>", "", "", _amount(po.total_amount - subtotal)))
+    rows.append(("", "<b>Total</b>", "", "", f"<b>{_amount(po.total_amount)}</b>"))
+    table = _table(("S/N", "Product", "Quantity", "Rate", "Amount"), rows, numeric_from=2)
+    return _page("Purchase Order", po.po_number, fields, table, signatures=("Prepared by", "Approved by"))
+
+def render_qc_report(qc: QCReport) -> str:
+    fields = _fields([
+        ("Purchase order", qc.purchase_order.po_number), ("Supplier", qc.purchase_order.supplier.name),
+        ("Inspector", qc.inspector_name), ("Inspection date", qc.inspection_date),
+    ])
+    rows = [
+        (
+            _text(item.po_item.product.name), _text(item.status),
+            _amount(item.accepted_qty), _amount(item.rejected_qty),
+            _amount(item.accepted_value), _amount(item.rejected_value), _text(item.rejection_reason),
+        )
+        for item in sorted(qc.items, key=lambda item: item.id)
+    ]
+    rows.append((
+        "<b>Total</b>", "", _amount(qc.total_accepted_qty), _amount(qc.total_rejected_qty),
+        _amount(qc.total_accepted_value), _amount(qc.total_rejected_value), "",
+    ))
+    table = _table(
+        ("Product", "Status", "Accepted qty", "Rejected qty", "Accepted value", "Rejected value", "Reason"),
+        rows, numeric_from=2,
+    )
+    return _page("Quality Control Report", qc.qc_report_number, fields, table, _remarks(qc.remarks),
+                 signatures=("Inspector", "QC Manager"))
+
+def render_receipt(receipt: Receipt) -> str:
+    fields = _fields([
+        ("Purchase order", receipt.purchase_order.po_number),
+        ("Supplier", receipt.purchase_order.supplier.name),
+        ("Receipt type", receipt.receipt_type), ("Date", receipt.generated_date),
+        ("Generated by", receipt.generated_by),
+        ("Total quantity", _amount(receipt.total_quantity)), ("Total value", _amount(receipt.total_value)),
+    ])
+    return _page("Goods Receipt", receipt.receipt_number, fields, _remarks(receipt.remarks),
+                 signatures=("Received by", "Store Officer"))
+
+
+class DocumentType(NamedTuple):
+    model: type
+    number: object  # document number column, also the download's file name
+    version: object  # column whose change means the document must be rendered again
+    load: tuple  # eager loads for the template
+    render: Callable[[object], str]
+
+
+DOCUMENT_TYPES = {
+    PURCHASE_ORDER: DocumentType(
+        PurchaseOrder, PurchaseOrder.po_number, PurchaseOrder.updated_at,
+        (joinedload(PurchaseOrder.supplier), selectinload(PurchaseOrder.items).joinedload(PurchaseOrderItem.product)),
+        render_purchase_order,
+    ),
+    QC_REPORT: DocumentType(
+        QCReport, QCReport.qc_report_number, QCReport.updated_at,
+        (
+            joinedload(QCReport.purchase_order).joinedload(PurchaseOrder.supplier),
+            selectinload(QCReport.items).joinedload(QCReportItem.po_item).joinedload(PurchaseOrderItem.product),
+        ),
+        render_qc_report,
+    ),
+    RECEIPT: DocumentType(
+        Receipt, Receipt.receipt_number, Receipt.created_at,
+        (joinedload(Receipt.purchase_order).joinedload(PurchaseOrder.supplier),),
+        render_receipt,
+    ),
+}
+
+
+# ==================== CACHE ====================
+def document_version(db: Session, kind: str, doc_id: int):
+    """(number, version) of a document from one indexed SELECT of two columns, or None"""
+    doc = DOCUMENT_TYPES[kind]
+    return db.execute(select(doc.number, doc.version).where(doc.model.id == doc_id)).first()
+
+def cache_key(kind: str, doc_id: int, version: Optional[datetime], fmt: str) -> str:
+    stamp = version.isoformat() if version else ""
+    return hashlib.sha256(f"{kind}:{doc_id}:{stamp}:{fmt}:{TEMPLATE_REVISION}".encode()).hexdigest()
+
+def cached_path(kind: str, doc_id: int, key: str, fmt: str) -> str:
+    return os.path.join(DOCUMENT_CACHE_DIR, kind, str(doc_id), f"{key}.{fmt}")
+
+def _write_atomically(path: str, content: bytes):
+    """Readers see the whole file or none: write a temporary file beside it, then rename it into place"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, temporary = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".part")
+    try:
+        with os.fdopen(fd, "wb") as file:
+            file.write(content)
+        os.replace(temporary, path)
+    except BaseException:
+        os.unlink(temporary)
+        raise
+
+_evictions = []  # heap of (monotonic due time, path of a superseded file)
+_evictions_lock = threading.Lock()
+
+def _evict_superseded(path: str, fmt: str):
+    """Schedule the document's other files in `fmt` (earlier versions and template revisions) for deletion
+    after the grace period, and delete every scheduled file now due"""
+    directory, current = os.path.split(path)
+    superseded = [
+        os.path.join(directory, name) for name in os.listdir(directory)
+        if name != current and name.endswith(f".{fmt}")
+    ]
+    now = time.monotonic()
+    with _evictions_lock:
+        for stale in superseded:
+            heapq.heappush(_evictions, (now + DOCUMENT_EVICT_GRACE_SECONDS, stale))
+        due = []
+        while _evictions and _evictions[0][0] <= now:
+            due.append(heapq.heappop(_evictions)[1])
+    for stale in due:
+        try:
+            os.unlink(stale)
+        except OSError:
+            pass  # evicted already, or held open (Windows); the document's next render schedules it again
+
+def render_document(kind: str, doc_id: int, fmt: str,
+                    session_factory: sessionmaker = PrimaryReadSessionLocal) -> Optional[str]:
+    """Render the current version of a document into the cache unless it is there; returns its path or None"""
+    doc = DOCUMENT_TYPES[kind]
+    with session_factory() as db:
+        row = db.query(doc.model).options(*doc.load).filter(doc.model.id == doc_id).first()
+        if row is None:
+            return None
+        path = cached_path(kind, doc_id, cache_key(kind, doc_id, getattr(row, doc.version.key), fmt), fmt)
+        if os.path.exists(path):
+            return path
+        markup = doc.render(row)
+    content = weasyprint.HTML(string=markup).write_pdf() if fmt == "pdf" else markup.encode()
+    _write_atomically(path, content)
+    _evict_superseded(path, fmt)
+    return path
+
+def clear_cache() -> int:
+    """Delete every cached document; returns the number of files removed"""
+    removed = 0
+    for directory, _, files in os.walk(DOCUMENT_CACHE_DIR, topdown=False):
+        for name in files:
+            os.unlink(os.path.join(directory, name))
+            removed += 1
+        if directory != DOCUMENT_CACHE_DIR:
+            os.rmdir(directory)
+    return removed
+
+
+# ==================== RENDER POOL ====================
+class DocumentRenderer:
+    """Background pool rendering documents into the cache.
+
+    Requests for a document version already being rendered share its future,
+    so a download racing the post-creation render waits for it instead of
+    rendering the same file again.
+    """
+
+    def __init__(self, workers: int = DOCUMENT_RENDER_WORKERS):
+        self._executor = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="document-render")
+        self._pending = {}  # cache key -> Future
+        self._lock = threading.Lock()
+
+    def submit(self, kind: str, doc_id: int, version: Optional[datetime], fmt: str) -> Future:
+        """Future of the cached file's path (None if the document is gone)"""
+        key = cache_key(kind, doc_id, version, fmt)
+        with self._lock:
+            future = self._pending.get(key)
+            started = future is None
+            if started:
+                future = self._pending[key] = self._executor.submit(render_document, kind, doc_id, fmt)
+        if started:
+            future.add_done_callback(lambda _: self._done(key))  # outside the lock: it may run right here
+        return future
+
+    def _done(self, key: str):
+        with self._lock:
+            self._pending.pop(key, None)
+
+    def prerender(self, kind: str, doc_id: int, version: Optional[datetime]):
+        """Queue a new or changed document for rendering in every format, logging failures"""
+        if not DOCUMENT_PRERENDER:
+            return
+        for fmt in DOCUMENT_FORMATS:
+            self.submit(kind, doc_id, version, fmt).add_done_callback(_log_failure)
+
+
+def _log_failure(future: Future):
+    if future.exception() is not None:
+        logger.error("Document render failed", exc_info=future.exception())
+
+
+document_renderer = DocumentRenderer()
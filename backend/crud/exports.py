@@ -0,0 +1,164 @@
+import csv
+import enum
+import io
+import json
+import os
+from datetime import datetime
+from typing import Iterator, Optional
+
+from sqlalchemy import Select, select
+from sqlalchemy.orm import sessionmaker
+
+from models.procurement import (
+    Supplier, Product, PurchaseOrder, PurchaseOrderItem,
+    QCReport, QCReportItem, Receipt
+)
+
+EXPORT_FORMATS = ("csv", "ndjson")
+EXPORT_MEDIA_TYPES = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+}
+
+# Rows fetched per round-trip; also the number of lines encoded into each streamed chunk
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "1000"))
+
+
+# ==================== STATEMENTS ====================
+# Flat Core selects, one line per item, so an export never builds ORM objects
+def purchase_order_export(supplier_type: Optional[str] = None, status: Optional[str] = None) -> Select:
+    stmt = select(
+        PurchaseOrder.id.label("purchase_order_id"),
+        PurchaseOrder.po_number,
+        PurchaseOrder.supplier_id,
+        Supplier.name.label("supplier_name"),
+        PurchaseOrder.supplier_type,
+        PurchaseOrder.status,
+        PurchaseOrder.payment_terms,
+        PurchaseOrder.origin,
+        PurchaseOrder.payment_type,
+        PurchaseOrder.dispatched_from,
+        PurchaseOrder.dispatched_in,
+        PurchaseOrder.validity_indent,
+        PurchaseOrder.station,
+        PurchaseOrder.tax,
+        PurchaseOrder.total_amount,
+        PurchaseOrder.created_at,
+        PurchaseOrderItem.id.label("item_id"),
+        PurchaseOrderItem.sn,
+        PurchaseOrderItem.product_id,
+        Product.name.label("product_name"),
+        PurchaseOrderItem.quantity,
+        PurchaseOrderItem.rate,
+        PurchaseOrderItem.total.label("item_total"),
+    ).join(
+        Supplier, Supplier.id == PurchaseOrder.supplier_id
+    ).outerjoin(
+        PurchaseOrderItem, PurchaseOrderItem.purchase_order_id == PurchaseOrder.id
+    ).outerjoin(
+        Product, Product.id == PurchaseOrderItem.product_id
+    )
+    if supplier_type:
+        stmt = stmt.where(PurchaseOrder.supplier_type == supplier_type)
+    if status:
+        stmt = stmt.where(PurchaseOrder.status == status)
+    return stmt.order_by(PurchaseOrder.id, PurchaseOrderItem.sn, PurchaseOrderItem.id)
+
+def qc_report_export() -> Select:
+    return select(
+        QCReport.id.label("qc_report_id"),
+        QCReport.qc_report_number,
+        QCReport.purchase_order_id,
+        PurchaseOrder.po_number,
+        QCReport.inspector_name,
+        QCReport.inspection_date,
+        QCReport.remarks,
+        QCReport.total_accepted_qty,
+        QCReport.total_rejected_qty,
+        QCReport.total_accepted_value,
+        QCReport.total_rejected_value,
+        QCReportItem.id.label("item_id"),
+        QCReportItem.po_item_id,
+        PurchaseOrderItem.product_id,
+        QCReportItem.status.label("item_status"),
+        QCReportItem.accepted_qty,
+        QCReportItem.rejected_qty,
+        QCReportItem.accepted_value,
+        QCReportItem.rejected_value,
+        QCReportItem.rejection_reason,
+        QCReportItem.remarks.label("item_remarks"),
+    ).join(
+        PurchaseOrder, PurchaseOrder.id == QCReport.purchase_order_id
+    ).outerjoin(
+        QCReportItem, QCReportItem.qc_report_id == QCReport.id
+    ).outerjoin(
+        PurchaseOrderItem, PurchaseOrderItem.id == QCReportItem.po_item_id
+    ).order_by(QCReport.id, QCReportItem.id)
+
+def receipt_export(receipt_type: Optional[str] = None, po_id: Optional[int] = None) -> Select:
+    stmt = select(
+        Receipt.id.label("receipt_id"),
+        Receipt.receipt_number,
+        Receipt.purchase_order_id,
+        PurchaseOrder.po_number,
+        Receipt.receipt_type,
+        Receipt.total_quantity,
+        Receipt.total_value,
+        Receipt.generated_by,
+        Receipt.generated_date,
+        Receipt.remarks,
+    ).join(PurchaseOrder, PurchaseOrder.id == Receipt.purchase_order_id)
+    if receipt_type:
+        stmt = stmt.where(Receipt.receipt_type == receipt_type)
+    if po_id:
+        stmt = stmt.where(Receipt.purchase_order_id == po_id)
+    return stmt.order_by(Receipt.id)
+
+
+# ==================== ENCODING ====================
+def _plain(value):
+    """Enum and datetime columns as the strings the JSON API uses"""
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+def _encode_csv(columns, rows, header: bool) -> str:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if header:
+        writer.writerow(columns)
+    writer.writerows([_plain(value) for value in row] for row in rows)
+    return buffer.getvalue()
+
+def _encode_ndjson(columns, rows, header: bool) -> str:
+    return "".join(
+        json.dumps(dict(zip(columns, map(_plain, row))), separators=(",", ":")) + "\n"
+        for row in rows
+    )
+
+ENCODERS = {
+    "csv": _encode_csv,
+    "ndjson": _encode_ndjson,
+}
+
+
+def stream_export(session_factory: sessionmaker, stmt: Select, fmt: str,
+                  batch_size: int = EXPORT_BATCH_SIZE) -> Iterator[str]:
+    """Yield `stmt`'s rows encoded as CSV or NDJSON, one chunk per fetched batch.
+
+    The generator owns its session because it runs after the route has
+    returned. `yield_per` streams from a server-side cursor where the driver
+    has one, so memory stays at one batch whatever the export size.
+    """
+    encode = ENCODERS[fmt]
+    with session_factory() as db:
+        result = db.execute(stmt.execution_options(yield_per=batch_size))
+        columns = list(result.keys())
+        header = True
+        for rows in result.partitions():
+            yield encode(columns, rows, header)
+            header = False
+        if header and fmt == "csv":
+            yield encode(columns, [], header)
@@ -0,0 +1,44 @@
+import base64
+import json
+from typing import Optional
+
+from sqlalchemy.orm import Query
+
+
+def encode_cursor(last_id: int) -> str:
+    """Encode the last seen primary key into an opaque cursor"""
+    payload = json.dumps({"id": last_id}, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> int:
+    """Decode an opaque cursor back into the last seen primary key"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        last_id = json.loads(base64.urlsafe_b64decode(padded))["id"]
+    except Exception:
+        raise ValueError("Invalid cursor")
+    if not isinstance(last_id, int):
+        raise ValueError("Invalid cursor")
+    return last_id
+
+
+def paginate(query: Query, id_column, skip: int = 0, limit: int = 100,
+             cursor: Optional[str] = None):
+    """Apply keyset pagination when a cursor is given, offset otherwise.
+
+    Both modes order by primary key so a cursor taken from an offset page
+    continues where that page ended. Keyset pages seek on the primary key
+    index, so deep pages cost the same as the first one.
+    """
+    query = query.order_by(id_column)
+    if cursor:
+        return query.filter(id_column > decode_cursor(cursor)).limit(limit).all()
+    return query.offset(skip).limit(limit).all()
+
+
+def next_cursor(rows: list, limit: int) -> Optional[str]:
+    """Cursor for the page after `rows`, or None when this was the last page"""
+    if limit <= 0 or len(rows) < limit:
+        return None
+    return encode_cursor(rows[-1].id)
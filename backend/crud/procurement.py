@@ -1,20 +1,238 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import Float, exists, func, literal, or_, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, joinedload, selectinload
+from database import BEGIN_OPTION
 from models.procurement import (
     Supplier, Product, PurchaseOrder, PurchaseOrderItem,
-    QCReport, QCReportItem, Receipt, SupplierType, PurchaseOrderStatus
+    QCReport, QCReportItem, Receipt, ReceiptType, SupplierType, PurchaseOrderStatus,
+    ProcurementCounter
 )
 from schemas.procurement import (
     SupplierCreate, SupplierUpdate, ProductCreate, ProductUpdate,
     LocalPurchaseOrderCreate, ImportPurchaseOrderCreate,
     QCReportCreate, QCReportUpdate, ReceiptCreate
 )
-from typing import List, Optional
+from crud.pagination import paginate
+from crud.sequences import document_numbers
+from crud.analytics import bump_rollups, merge_rollups, purchase_order_rollups, qc_report_rollups
+from crud.group_commit import when_committed
+import metrics
+from collections import Counter
+from typing import List, NamedTuple, Optional
 from datetime import datetime
 
+# ==================== LOADER PROFILES ====================
+# Eager-loading options mirroring the nested shape of the response schemas,
+# so serializing a list costs a fixed number of SELECTs regardless of row count.
+
+# PurchaseOrderResponse -> supplier, items[] -> product
+PURCHASE_ORDER_RESPONSE_LOAD = (
+    joinedload(PurchaseOrder.supplier),
+    selectinload(PurchaseOrder.items).joinedload(PurchaseOrderItem.product),
+)
+
+# QCReportResponse -> items[]
+QC_REPORT_RESPONSE_LOAD = (
+    selectinload(QCReport.items),
+)
+
+# SupplierOverview.purchase_orders[] -> items[] -> product, qc_report -> items[]; the supplier is loaded once
+SUPPLIER_OVERVIEW_LOAD = (
+    selectinload(PurchaseOrder.items).joinedload(PurchaseOrderItem.product),
+    selectinload(PurchaseOrder.qc_report).selectinload(QCReport.items),
+)
+
+# ==================== STATS COUNTERS ====================
+# Dashboard figures are kept in procurement_counters and adjusted in the same
+# transaction as the write that changes them, so reading them never scans the
+# base tables.
+SUPPLIERS_COUNTER = "suppliers"
+PRODUCTS_COUNTER = "products"
+PURCHASE_ORDERS_COUNTER = "purchase_orders"
+QC_REPORTS_COUNTER = "qc_reports"
+RECEIPTS_COUNTER = "receipts"
+SPEND_COUNTER = "spend.total"
+ACCEPTED_VALUE_COUNTER = "qc.accepted_value"
+REJECTED_VALUE_COUNTER = "qc.rejected_value"
+
+# Catalog table versions, bumped by every write to the table; they key HTTP ETags
+SUPPLIERS_VERSION = "version.suppliers"
+PRODUCTS_VERSION = "version.products"
+TABLE_VERSIONS = {"suppliers": SUPPLIERS_VERSION, "products": PRODUCTS_VERSION}
+
+def _status_counter(po_status) -> str:
+    return f"purchase_orders.status.{PurchaseOrderStatus(po_status).value}"
+
+def _spend_counter(supplier_type) -> str:
+    return f"spend.{SupplierType(supplier_type).value}"
+
+ALL_COUNTERS = (
+    SUPPLIERS_COUNTER, PRODUCTS_COUNTER, PURCHASE_ORDERS_COUNTER,
+    QC_REPORTS_COUNTER, RECEIPTS_COUNTER, SPEND_COUNTER,
+    ACCEPTED_VALUE_COUNTER, REJECTED_VALUE_COUNTER,
+    SUPPLIERS_VERSION, PRODUCTS_VERSION,
+    *(_status_counter(s) for s in PurchaseOrderStatus),
+    *(_spend_counter(t) for t in SupplierType),
+)
+
+def purchase_order_counter_deltas(supplier_type, total_amount: float) -> dict:
+    return {
+        PURCHASE_ORDERS_COUNTER: 1,
+        _status_counter(PurchaseOrderStatus.PENDING): 1,
+        SPEND_COUNTER: total_amount,
+        _spend_counter(supplier_type): total_amount,
+    }
+
+def bump_counters(db: Session, deltas: dict):
+    """Apply counter deltas inside the caller's transaction"""
+    for name, delta in deltas.items():
+        if delta:
+            db.execute(
+                update(ProcurementCounter)
+                .where(ProcurementCounter.name == name)
+                .values(value=ProcurementCounter.value + delta)
+            )
+
+def rebuild_stats(db: Session):
+    """Recompute every counter from the base tables.
+
+    The counters are locked before the tables are counted and then updated
+    in place, so a concurrent bump_counters either commits before the counts
+    or waits for the rebuild and applies on top of it.
+    """
+    if not db.in_transaction():
+        db.connection(execution_options={BEGIN_OPTION: "IMMEDIATE"})
+    # Versions cannot be derived from the tables, only moved forward so old ETags never match again.
+    # Doing that first also takes SQLite's write lock where the driver begins its transaction late.
+    bump_counters(db, {name: 1 for name in TABLE_VERSIONS.values()})
+    current = dict(db.query(ProcurementCounter.name, ProcurementCounter.value).with_for_update())
+    values = {name: 0.0 for name in ALL_COUNTERS}
+    for name in TABLE_VERSIONS.values():
+        values[name] = current.get(name, 1.0)
+    values[SUPPLIERS_COUNTER] = db.query(func.count(Supplier.id)).scalar()
+    values[PRODUCTS_COUNTER] = db.query(func.count(Product.id)).scalar()
+    values[QC_REPORTS_COUNTER] = db.query(func.count(QCReport.id)).scalar()
+    values[RECEIPTS_COUNTER] = db.query(func.count(Receipt.id)).scalar()
+    
+    po_rows = db.query(
+        PurchaseOrder.supplier_type, PurchaseOrder.status,
+        func.count(PurchaseOrder.id), func.coalesce(func.sum(PurchaseOrder.total_amount), 0.0)
+    ).group_by(PurchaseOrder.supplier_type, PurchaseOrder.status).all()
+    for supplier_type, po_status, count, spend in po_rows:
+        values[PURCHASE_ORDERS_COUNTER] += count
+        values[_status_counter(po_status or PurchaseOrderStatus.PENDING)] += count
+        values[SPEND_COUNTER] += spend
+        values[_spend_counter(supplier_type)] += spend
+    
+    accepted, rejected = db.query(
+        func.coalesce(func.sum(QCReport.total_accepted_value), 0.0),
+        func.coalesce(func.sum(QCReport.total_rejected_value), 0.0)
+    ).one()
+    values[ACCEPTED_VALUE_COUNTER] = accepted
+    values[REJECTED_VALUE_COUNTER] = rejected
+    
+    db.query(ProcurementCounter).filter(ProcurementCounter.name.notin_(values)).delete(synchronize_session=False)
+    existing = [{"name": name, "value": value} for name, value in values.items() if name in current]
+    if existing:
+        db.execute(update(ProcurementCounter), existing)
+    db.add_all(ProcurementCounter(name=name, value=value) for name, value in values.items() if name not in current)
+    db.commit()
+
+def ensure_stats(db: Session):
+    """Seed the counters from the base tables if any are missing"""
+    if db.query(func.count(ProcurementCounter.name)).scalar() == len(ALL_COUNTERS):
+        return
+    try:
+        rebuild_stats(db)
+    except IntegrityError:
+        # Another worker seeded the counters first
+        db.rollback()
+
+def get_table_version(db: Session, table: str) -> int:
+    """Current version of a catalog table, a single primary-key lookup"""
+    value = db.execute(
+        select(ProcurementCounter.value).where(ProcurementCounter.name == TABLE_VERSIONS[table])
+    ).scalar()
+    return int(value or 0)
+
+def get_stats(db: Session) -> dict:
+    counters = dict(db.query(ProcurementCounter.name, ProcurementCounter.value).all())
+    value = lambda name: counters.get(name, 0.0)
+    return {
+        "suppliers": int(value(SUPPLIERS_COUNTER)),
+        "products": int(value(PRODUCTS_COUNTER)),
+        "purchase_orders": int(value(PURCHASE_ORDERS_COUNTER)),
+        "qc_reports": int(value(QC_REPORTS_COUNTER)),
+        "receipts": int(value(RECEIPTS_COUNTER)),
+        "total_spend": value(SPEND_COUNTER),
+        "spend_by_supplier_type": {t.value: value(_spend_counter(t)) for t in SupplierType},
+        "purchase_orders_by_status": {s.value: int(value(_status_counter(s))) for s in PurchaseOrderStatus},
+        "accepted_value": value(ACCEPTED_VALUE_COUNTER),
+        "rejected_value": value(REJECTED_VALUE_COUNTER),
+    }
+
+# ==================== PO AGGREGATES ====================
+# Item count and quantity, QC values and receipt flags are stored on each purchase order and set by the
+# writes that change them, so list views never load items, QC reports or receipts.
+def purchase_order_item_aggregates(items) -> dict:
+    return {"item_count": len(items), "total_qty": sum(item.quantity for item in items)}
+
+def _receipt_exists(receipt_type: ReceiptType):
+    return exists().where(Receipt.purchase_order_id == PurchaseOrder.id, Receipt.receipt_type == receipt_type)
+
+def _derived_aggregates() -> dict:
+    """Each aggregate column as a correlated subquery over the base tables"""
+    qc_value = lambda column: func.coalesce(
+        select(column).where(QCReport.purchase_order_id == PurchaseOrder.id).scalar_subquery(), 0.0
+    )
+    items = lambda aggregate: select(aggregate).where(
+        PurchaseOrderItem.purchase_order_id == PurchaseOrder.id
+    ).scalar_subquery()
+    return {
+        "item_count": items(func.count(PurchaseOrderItem.id)),
+        "total_qty": items(func.coalesce(func.sum(PurchaseOrderItem.quantity), 0.0)),
+        "accepted_value": qc_value(QCReport.total_accepted_value),
+        "rejected_value": qc_value(QCReport.total_rejected_value),
+        "has_accepted_receipt": _receipt_exists(ReceiptType.ACCEPTED),
+        "has_rejected_receipt": _receipt_exists(ReceiptType.REJECTED),
+    }
+
+def _drifted(derived: dict):
+    """Purchase orders whose stored aggregates differ from the base tables (floats within rounding)"""
+    conditions = []
+    for name, expression in derived.items():
+        column = getattr(PurchaseOrder, name)
+        if isinstance(column.type, Float):
+            conditions.append(func.abs(func.coalesce(column, -1.0) - expression) > 1e-6)
+        else:
+            conditions.append(or_(column.is_(None), column != expression))
+    return or_(*conditions)
+
+def check_purchase_order_aggregates(db: Session, sample: int = 20):
+    """(number of purchase orders with drifted aggregates, up to `sample` of their ids)"""
+    drifted = _drifted(_derived_aggregates())
+    count = db.query(func.count(PurchaseOrder.id)).filter(drifted).scalar()
+    ids = [po_id for (po_id,) in db.query(PurchaseOrder.id).filter(drifted).order_by(PurchaseOrder.id).limit(sample)]
+    return count, ids
+
+def rebuild_purchase_order_aggregates(db: Session) -> int:
+    """Recompute the aggregates of every drifted purchase order in one UPDATE; returns the rows fixed"""
+    derived = _derived_aggregates()
+    result = db.execute(
+        update(PurchaseOrder)
+        .where(_drifted(derived))
+        # A repair, not an edit: keep updated_at (and with it cached documents and ETags)
+        .values(**derived, updated_at=PurchaseOrder.updated_at)
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+    return result.rowcount
+
 # ==================== SUPPLIER CRUD ====================
 def create_supplier(db: Session, supplier: SupplierCreate):
     db_supplier = Supplier(**supplier.model_dump())
     db.add(db_supplier)
+    bump_counters(db, {SUPPLIERS_COUNTER: 1, SUPPLIERS_VERSION: 1})
     db.commit()
     db.refresh(db_supplier)
     return db_supplier
@@ -22,11 +240,12 @@ def create_supplier(db: Session, supplier: SupplierCreate):
 def get_supplier(db: Session, supplier_id: int):
     return db.query(Supplier).filter(Supplier.id == supplier_id).first()
 
-def get_suppliers(db: Session, skip: int = 0, limit: int = 100, supplier_type: Optional[str] = None):
+def get_suppliers(db: Session, skip: int = 0, limit: int = 100, supplier_type: Optional[str] = None,
+                  cursor: Optional[str] = None):
     query = db.query(Supplier)
     if supplier_type:
         query = query.filter(Supplier.supplier_type == supplier_type)
-    return query.offset(skip).limit(limit).all()
+    return paginate(query, Supplier.id, skip=skip, limit=limit, cursor=cursor)
 
 def update_supplier(db: Session, supplier_id: int, supplier: SupplierUpdate):
     db_supplier = get_supplier(db, supplier_id)
@@ -35,6 +254,7 @@ def update_supplier(db: Session, supplier_id: int, supplier: SupplierUpdate):
         for key, value in update_data.items():
             setattr(db_supplier, key, value)
         db_supplier.updated_at = datetime.utcnow()
+        bump_counters(db, {SUPPLIERS_VERSION: 1})
         db.commit()
         db.refresh(db_supplier)
     return db_supplier
@@ -43,6 +263,7 @@ def delete_supplier(db: Session, supplier_id: int):
     db_supplier = get_supplier(db, supplier_id)
     if db_supplier:
         db.delete(db_supplier)
+        bump_counters(db, {SUPPLIERS_COUNTER: -1, SUPPLIERS_VERSION: 1})
         db.commit()
         return True
     return False
@@ -51,6 +272,7 @@ def delete_supplier(db: Session, supplier_id: int):
 def create_product(db: Session, product: ProductCreate):
     db_product = Product(**product.model_dump())
     db.add(db_product)
+    bump_counters(db, {PRODUCTS_COUNTER: 1, PRODUCTS_VERSION: 1})
     db.commit()
     db.refresh(db_product)
     return db_product
@@ -58,8 +280,8 @@ def create_product(db: Session, product: ProductCreate):
 def get_product(db: Session, product_id: int):
     return db.query(Product).filter(Product.id == product_id).first()
 
-def get_products(db: Session, skip: int = 0, limit: int = 100):
-    return db.query(Product).offset(skip).limit(limit).all()
+def get_products(db: Session, skip: int = 0, limit: int = 100, cursor: Optional[str] = None):
+    return paginate(db.query(Product), Product.id, skip=skip, limit=limit, cursor=cursor)
 
 def update_product(db: Session, product_id: int, product: ProductUpdate):
     db_product = get_product(db, product_id)
@@ -68,6 +290,7 @@ def update_product(db: Session, product_id: int, product: ProductUpdate):
         for key, value in update_data.items():
             setattr(db_product, key, value)
         db_product.updated_at = datetime.utcnow()
+        bump_counters(db, {PRODUCTS_VERSION: 1})
         db.commit()
         db.refresh(db_product)
     return db_product
@@ -76,15 +299,25 @@ def delete_product(db: Session, product_id: int):
     db_product = get_product(db, product_id)
     if db_product:
         db.delete(db_product)
+        bump_counters(db, {PRODUCTS_COUNTER: -1, PRODUCTS_VERSION: 1})
         db.commit()
         return True
     return False
 
 # ==================== PURCHASE ORDER CRUD ====================
+def calculate_po_totals(items, tax: Optional[float] = None):
+    """Return the per-item totals and the PO total, including tax if applicable"""
+    item_totals = [item.quantity * item.rate for item in items]
+    total_amount = 0.0
+    for item_total in item_totals:
+        total_amount += item_total
+    if tax:
+        total_amount += (total_amount * tax / 100)
+    return item_totals, total_amount
+
 def generate_po_number(db: Session) -> str:
     """Generate unique PO number"""
-    count = db.query(PurchaseOrder).count()
-    return f"PO-{datetime.utcnow().strftime('%Y%m%d')}-{count + 1:04d}"
+    return document_numbers.next_number(db, "PO", PurchaseOrder.po_number)
 
 def create_local_purchase_order(db: Session, po: LocalPurchaseOrderCreate):
     # Get supplier to verify type
@@ -99,16 +332,15 @@ def create_local_purchase_order(db: Session, po: LocalPurchaseOrderCreate):
         supplier_id=po.supplier_id,
         supplier_type=SupplierType.LOCAL,
         payment_terms=po.payment_terms,
+        created_at=datetime.utcnow(),
         station=po.station,
-        tax=po.tax
+        tax=po.tax,
+        **purchase_order_item_aggregates(po.items)
     )
     
     # Calculate total and add items
-    total_amount = 0.0
-    for item in po.items:
-        item_total = item.quantity * item.rate
-        total_amount += item_total
-        
+    item_totals, total_amount = calculate_po_totals(po.items, po.tax)
+    for item, item_total in zip(po.items, item_totals):
         db_item = PurchaseOrderItem(
             product_id=item.product_id,
             sn=item.sn,
@@ -118,16 +350,14 @@ def create_local_purchase_order(db: Session, po: LocalPurchaseOrderCreate):
         )
         db_po.items.append(db_item)
     
-    # Add tax if applicable
-    if po.tax:
-        total_amount += (total_amount * po.tax / 100)
-    
     db_po.total_amount = total_amount
     
     db.add(db_po)
+    bump_counters(db, purchase_order_counter_deltas(SupplierType.LOCAL, total_amount))
+    bump_rollups(db, purchase_order_rollups(po.supplier_id, db_po.created_at, po.items, item_totals, po.tax))
     db.commit()
-    db.refresh(db_po)
-    return db_po
+    when_committed(db, metrics.purchase_orders_created, SupplierType.LOCAL.value)
+    return get_purchase_order(db, db_po.id)
 
 def create_import_purchase_order(db: Session, po: ImportPurchaseOrderCreate):
     # Get supplier to verify type
@@ -142,19 +372,18 @@ def create_import_purchase_order(db: Session, po: ImportPurchaseOrderCreate):
         supplier_id=po.supplier_id,
         supplier_type=SupplierType.IMPORT,
         payment_terms=po.payment_terms,
+        created_at=datetime.utcnow(),
         origin=po.origin,
         payment_type=po.payment_type,
         dispatched_from=po.dispatched_from,
         dispatched_in=po.dispatched_in,
-        validity_indent=po.validity_indent
+        validity_indent=po.validity_indent,
+        **purchase_order_item_aggregates(po.items)
     )
     
     # Calculate total and add items
-    total_amount = 0.0
-    for item in po.items:
-        item_total = item.quantity * item.rate
-        total_amount += item_total
-        
+    item_totals, total_amount = calculate_po_totals(po.items)
+    for item, item_total in zip(po.items, item_totals):
         db_item = PurchaseOrderItem(
             product_id=item.product_id,
             sn=item.sn,
@@ -167,50 +396,136 @@ def create_import_purchase_order(db: Session, po: ImportPurchaseOrderCreate):
     db_po.total_amount = total_amount
     
     db.add(db_po)
+    bump_counters(db, purchase_order_counter_deltas(SupplierType.IMPORT, total_amount))
+    bump_rollups(db, purchase_order_rollups(po.supplier_id, db_po.created_at, po.items, item_totals, None))
     db.commit()
-    db.refresh(db_po)
-    return db_po
+    when_committed(db, metrics.purchase_orders_created, SupplierType.IMPORT.value)
+    return get_purchase_order(db, db_po.id)
 
 def get_purchase_order(db: Session, po_id: int):
-    return db.query(PurchaseOrder).filter(PurchaseOrder.id == po_id).first()
+    return db.query(PurchaseOrder).options(*PURCHASE_ORDER_RESPONSE_LOAD).filter(
+        PurchaseOrder.id == po_id
+    ).first()
 
 def get_purchase_orders(db: Session, skip: int = 0, limit: int = 100, 
                        supplier_type: Optional[str] = None,
-                       status: Optional[str] = None):
-    query = db.query(PurchaseOrder)
+                       status: Optional[str] = None,
+                       cursor: Optional[str] = None,
+                       supplier_id: Optional[int] = None):
+    query = db.query(PurchaseOrder).options(*PURCHASE_ORDER_RESPONSE_LOAD)
+    if supplier_id is not None:
+        query = query.filter(PurchaseOrder.supplier_id == supplier_id)
+    if supplier_type:
+        query = query.filter(PurchaseOrder.supplier_type == supplier_type)
+    if status:
+        query = query.filter(PurchaseOrder.status == status)
+    return paginate(query, PurchaseOrder.id, skip=skip, limit=limit, cursor=cursor)
+
+# Column-level projections for list views (?view=summary / ?fields=): no item or product loads
+PURCHASE_ORDER_SUMMARY_COLUMNS = {
+    "id": PurchaseOrder.id,
+    "po_number": PurchaseOrder.po_number,
+    "supplier_id": PurchaseOrder.supplier_id,
+    "supplier_name": Supplier.name,
+    "supplier_type": PurchaseOrder.supplier_type,
+    "status": PurchaseOrder.status,
+    "payment_terms": PurchaseOrder.payment_terms,
+    "origin": PurchaseOrder.origin,
+    "payment_type": PurchaseOrder.payment_type,
+    "dispatched_from": PurchaseOrder.dispatched_from,
+    "dispatched_in": PurchaseOrder.dispatched_in,
+    "validity_indent": PurchaseOrder.validity_indent,
+    "station": PurchaseOrder.station,
+    "tax": PurchaseOrder.tax,
+    "total_amount": PurchaseOrder.total_amount,
+    "item_count": PurchaseOrder.item_count,
+    "total_qty": PurchaseOrder.total_qty,
+    "accepted_value": PurchaseOrder.accepted_value,
+    "rejected_value": PurchaseOrder.rejected_value,
+    "has_accepted_receipt": PurchaseOrder.has_accepted_receipt,
+    "has_rejected_receipt": PurchaseOrder.has_rejected_receipt,
+    "created_at": PurchaseOrder.created_at,
+    "updated_at": PurchaseOrder.updated_at,
+}
+
+def project_columns(columns: dict, fields=None) -> list:
+    """Labelled columns for the requested field names (all of them when none are given)"""
+    names = list(fields) if fields else list(columns)
+    unknown = [name for name in names if name not in columns]
+    if unknown:
+        raise ValueError(f"Unknown field(s): {', '.join(unknown)}")
+    return [columns[name].label(name) for name in names]
+
+def get_purchase_order_summaries(db: Session, skip: int = 0, limit: int = 100,
+                                 supplier_type: Optional[str] = None,
+                                 status: Optional[str] = None,
+                                 cursor: Optional[str] = None,
+                                 fields=None,
+                                 supplier_id: Optional[int] = None):
+    columns = project_columns(PURCHASE_ORDER_SUMMARY_COLUMNS, fields)
+    query = db.query(*columns).select_from(PurchaseOrder)
+    if any(column.name == "supplier_name" for column in columns):
+        query = query.join(Supplier, Supplier.id == PurchaseOrder.supplier_id)
+    if supplier_id is not None:
+        query = query.filter(PurchaseOrder.supplier_id == supplier_id)
     if supplier_type:
         query = query.filter(PurchaseOrder.supplier_type == supplier_type)
     if status:
         query = query.filter(PurchaseOrder.status == status)
-    return query.offset(skip).limit(limit).all()
+    return paginate(query, PurchaseOrder.id, skip=skip, limit=limit, cursor=cursor)
+
+class SupplierOverview(NamedTuple):
+    supplier: Supplier
+    purchase_order_count: int
+    purchase_orders: list
+
+def get_supplier_overview(db: Session, supplier_id: int, skip: int = 0, limit: int = 100,
+                          cursor: Optional[str] = None, summary: bool = False):
+    """A supplier with a page of its POs, their items and QC reports: six SELECTs however many POs it has.
+
+    With `summary` the POs are summary rows with their stored aggregates instead, read from
+    purchase_orders alone (three SELECTs).
+    """
+    supplier = get_supplier(db, supplier_id)
+    if supplier is None:
+        return None
+    count = db.query(func.count(PurchaseOrder.id)).filter(PurchaseOrder.supplier_id == supplier_id).scalar()
+    if summary:
+        columns = [column for name, column in PURCHASE_ORDER_SUMMARY_COLUMNS.items() if name != "supplier_name"]
+        query = db.query(*columns, literal(supplier.name).label("supplier_name")).select_from(PurchaseOrder)
+    else:
+        query = db.query(PurchaseOrder).options(*SUPPLIER_OVERVIEW_LOAD)
+    query = query.filter(PurchaseOrder.supplier_id == supplier_id)
+    return SupplierOverview(supplier, count, paginate(query, PurchaseOrder.id, skip=skip, limit=limit, cursor=cursor))
 
 # ==================== QC REPORT CRUD ====================
 def generate_qc_report_number(db: Session) -> str:
     """Generate unique QC report number"""
-    count = db.query(QCReport).count()
-    return f"QC-{datetime.utcnow().strftime('%Y%m%d')}-{count + 1:04d}"
+    return document_numbers.next_number(db, "QC", QCReport.qc_report_number)
 
-def create_qc_report(db: Session, qc_report: QCReportCreate):
-    # Check if PO exists
-    po = get_purchase_order(db, qc_report.purchase_order_id)
-    if not po:
-        raise ValueError("Purchase Order not found")
-    
-    # Check if QC report already exists for this PO
-    existing_qc = db.query(QCReport).filter(
-        QCReport.purchase_order_id == qc_report.purchase_order_id
-    ).first()
-    if existing_qc:
-        raise ValueError("QC Report already exists for this Purchase Order")
-    
-    # Create QC Report
-    qc_number = generate_qc_report_number(db)
+def _po_item_rates(db: Session, po_item_ids, po_ids) -> dict:
+    """Map PO item id -> (purchase_order_id, rate, product_id) with one IN query scoped to the given POs"""
+    if not po_item_ids:
+        return {}
+    rows = db.query(
+        PurchaseOrderItem.id, PurchaseOrderItem.purchase_order_id, PurchaseOrderItem.rate,
+        PurchaseOrderItem.product_id
+    ).filter(
+        PurchaseOrderItem.id.in_(po_item_ids),
+        PurchaseOrderItem.purchase_order_id.in_(po_ids)
+    )
+    return {item_id: (po_id, rate, product_id) for item_id, po_id, rate, product_id in rows}
+
+def _build_qc_report(qc_report: QCReportCreate, po: PurchaseOrder, item_rates: dict, qc_number: str):
+    """Build the QC report for `po` in one pass over its items and return it with its counter and rollup deltas"""
     db_qc = QCReport(
         purchase_order_id=qc_report.purchase_order_id,
         qc_report_number=qc_number,
         inspector_name=qc_report.inspector_name,
+        inspection_date=datetime.utcnow(),
         remarks=qc_report.remarks
     )
+    rollup_lines = []
     
     # Process QC items and calculate totals
     total_accepted_qty = 0.0
@@ -219,16 +534,12 @@ def create_qc_report(db: Session, qc_report: QCReportCreate):
     total_rejected_value = 0.0
     
     for item in qc_report.items:
-        # Get PO item to get rate
-        po_item = db.query(PurchaseOrderItem).filter(
-            PurchaseOrderItem.id == item.po_item_id
-        ).first()
+        po_id, rate, product_id = item_rates.get(item.po_item_id, (None, None, None))
+        if po_id != po.id:
+            raise ValueError(f"PO Item {item.po_item_id} not found on Purchase Order {po.id}")
         
-        if not po_item:
-            raise ValueError(f"PO Item {item.po_item_id} not found")
-        
-        accepted_value = item.accepted_qty * po_item.rate
-        rejected_value = item.rejected_qty * po_item.rate
+        accepted_value = item.accepted_qty * rate
+        rejected_value = item.rejected_qty * rate
         
         db_qc_item = QCReportItem(
             po_item_id=item.po_item_id,
@@ -241,6 +552,7 @@ def create_qc_report(db: Session, qc_report: QCReportCreate):
             remarks=item.remarks
         )
         db_qc.items.append(db_qc_item)
+        rollup_lines.append((product_id, db_qc_item))
         
         total_accepted_qty += item.accepted_qty
         total_rejected_qty += item.rejected_qty
@@ -252,32 +564,136 @@ def create_qc_report(db: Session, qc_report: QCReportCreate):
     db_qc.total_accepted_value = total_accepted_value
     db_qc.total_rejected_value = total_rejected_value
     
-    # Update PO status
+    # Update PO status and QC aggregates
+    po.accepted_value = total_accepted_value
+    po.rejected_value = total_rejected_value
+    previous_status = po.status or PurchaseOrderStatus.PENDING
     if total_rejected_qty > 0:
         po.status = PurchaseOrderStatus.PARTIALLY_REJECTED
     else:
         po.status = PurchaseOrderStatus.COMPLETED
     
+    deltas = {
+        QC_REPORTS_COUNTER: 1,
+        ACCEPTED_VALUE_COUNTER: total_accepted_value,
+        REJECTED_VALUE_COUNTER: total_rejected_value,
+    }
+    if po.status != previous_status:
+        deltas[_status_counter(previous_status)] = -1
+        deltas[_status_counter(po.status)] = 1
+    return db_qc, deltas, qc_report_rollups(po.supplier_id, db_qc.inspection_date, rollup_lines)
+
+def _qc_report_filed(qc_report: QCReportCreate, rejected_value: float):
+    rejected = [item.rejected_qty for item in qc_report.items if item.rejected_qty]
+    metrics.qc_report_filed(len(rejected), sum(rejected), rejected_value)
+
+def create_qc_report(db: Session, qc_report: QCReportCreate):
+    # Check if PO exists
+    po = db.query(PurchaseOrder).filter(PurchaseOrder.id == qc_report.purchase_order_id).first()
+    if not po:
+        raise ValueError("Purchase Order not found")
+    
+    # Check if QC report already exists for this PO
+    existing_qc = db.query(QCReport.id).filter(
+        QCReport.purchase_order_id == qc_report.purchase_order_id
+    ).first()
+    if existing_qc:
+        raise ValueError("QC Report already exists for this Purchase Order")
+    
+    item_rates = _po_item_rates(db, {item.po_item_id for item in qc_report.items}, [po.id])
+    
+    # Create QC Report
+    qc_number = generate_qc_report_number(db)
+    db_qc, deltas, rollups = _build_qc_report(qc_report, po, item_rates, qc_number)
+    
     db.add(db_qc)
+    bump_counters(db, deltas)
+    bump_rollups(db, rollups)
     db.commit()
-    db.refresh(db_qc)
-    return db_qc
+    when_committed(db, _qc_report_filed, qc_report, deltas[REJECTED_VALUE_COUNTER])
+    return get_qc_report(db, db_qc.id)
+
+def create_qc_reports(db: Session, qc_reports: List[QCReportCreate]):
+    """Create many QC reports in one transaction; any invalid report rejects the whole batch"""
+    po_ids = [qc_report.purchase_order_id for qc_report in qc_reports]
+    if len(set(po_ids)) != len(po_ids):
+        raise ValueError("Each Purchase Order may appear only once per batch")
+    
+    pos = {po.id: po for po in db.query(PurchaseOrder).filter(PurchaseOrder.id.in_(po_ids))}
+    existing = {po_id for (po_id,) in db.query(QCReport.purchase_order_id).filter(
+        QCReport.purchase_order_id.in_(po_ids)
+    )}
+    item_rates = _po_item_rates(
+        db, {item.po_item_id for qc_report in qc_reports for item in qc_report.items}, po_ids
+    )
+    
+    built = []
+    rejected_values = []
+    deltas = Counter()
+    rollups = {}
+    for index, qc_report in enumerate(qc_reports):
+        po = pos.get(qc_report.purchase_order_id)
+        try:
+            if not po:
+                raise ValueError("Purchase Order not found")
+            if po.id in existing:
+                raise ValueError("QC Report already exists for this Purchase Order")
+            db_qc, report_deltas, report_rollups = _build_qc_report(qc_report, po, item_rates, qc_number="")
+        except ValueError as e:
+            raise ValueError(f"Report {index}: {e}")
+        built.append(db_qc)
+        rejected_values.append(report_deltas[REJECTED_VALUE_COUNTER])
+        deltas.update(report_deltas)
+        merge_rollups(rollups, report_rollups)
+    
+    # Numbers are allocated only once the whole batch is known to be valid
+    for db_qc in built:
+        db_qc.qc_report_number = generate_qc_report_number(db)
+    
+    db.add_all(built)
+    bump_counters(db, deltas)
+    bump_rollups(db, rollups)
+    db.commit()
+    for qc_report, rejected_value in zip(qc_reports, rejected_values):
+        when_committed(db, _qc_report_filed, qc_report, rejected_value)
+    
+    reports = {qc.id: qc for qc in db.query(QCReport).options(*QC_REPORT_RESPONSE_LOAD).filter(
+        QCReport.id.in_([db_qc.id for db_qc in built])
+    )}
+    return [reports[db_qc.id] for db_qc in built]
 
 def get_qc_report(db: Session, qc_id: int):
-    return db.query(QCReport).filter(QCReport.id == qc_id).first()
+    return db.query(QCReport).options(*QC_REPORT_RESPONSE_LOAD).filter(
+        QCReport.id == qc_id
+    ).first()
 
 def get_qc_report_by_po(db: Session, po_id: int):
-    return db.query(QCReport).filter(QCReport.purchase_order_id == po_id).first()
+    return db.query(QCReport).options(*QC_REPORT_RESPONSE_LOAD).filter(
+        QCReport.purchase_order_id == po_id
+    ).first()
+
+def get_qc_reports(db: Session, skip: int = 0, limit: int = 100, cursor: Optional[str] = None):
+    query = db.query(QCReport).options(*QC_REPORT_RESPONSE_LOAD)
+    return paginate(query, QCReport.id, skip=skip, limit=limit, cursor=cursor)
+
+QC_REPORT_SUMMARY_COLUMNS = {
+    name: getattr(QCReport, name) for name in (
+        "id", "purchase_order_id", "qc_report_number", "inspector_name", "inspection_date", "remarks",
+        "total_accepted_qty", "total_rejected_qty", "total_accepted_value", "total_rejected_value",
+        "created_at", "updated_at",
+    )
+}
 
-def get_qc_reports(db: Session, skip: int = 0, limit: int = 100):
-    return db.query(QCReport).offset(skip).limit(limit).all()
+def get_qc_report_summaries(db: Session, skip: int = 0, limit: int = 100, cursor: Optional[str] = None,
+                            fields=None):
+    query = db.query(*project_columns(QC_REPORT_SUMMARY_COLUMNS, fields)).select_from(QCReport)
+    return paginate(query, QCReport.id, skip=skip, limit=limit, cursor=cursor)
 
 # ==================== RECEIPT CRUD ====================
 def generate_receipt_number(db: Session, receipt_type: str) -> str:
     """Generate unique receipt number"""
-    count = db.query(Receipt).filter(Receipt.receipt_type == receipt_type).count()
     prefix = "RCP-ACC" if receipt_type == "accepted" else "RCP-REJ"
-    return f"{prefix}-{datetime.utcnow().strftime('%Y%m%d')}-{count + 1:04d}"
+    return document_numbers.next_number(db, prefix, Receipt.receipt_number)
 
 def create_receipt(db: Session, receipt: ReceiptCreate):
     # Get PO and QC report
@@ -296,9 +712,11 @@ def create_receipt(db: Session, receipt: ReceiptCreate):
     if receipt.receipt_type.value == "accepted":
         total_quantity = qc_report.total_accepted_qty
         total_value = qc_report.total_accepted_value
+        po.has_accepted_receipt = True
     else:
         total_quantity = qc_report.total_rejected_qty
         total_value = qc_report.total_rejected_value
+        po.has_rejected_receipt = True
     
     db_receipt = Receipt(
         receipt_number=receipt_number,
@@ -311,7 +729,9 @@ def create_receipt(db: Session, receipt: ReceiptCreate):
     )
     
     db.add(db_receipt)
+    bump_counters(db, {RECEIPTS_COUNTER: 1})
     db.commit()
+    when_committed(db, metrics.receipt_created, receipt.receipt_type.value)
     db.refresh(db_receipt)
     return db_receipt
 
@@ -320,10 +740,11 @@ def get_receipt(db: Session, receipt_id: int):
 
 def get_receipts(db: Session, skip: int = 0, limit: int = 100, 
                 receipt_type: Optional[str] = None,
-                po_id: Optional[int] = None):
+                po_id: Optional[int] = None,
+                cursor: Optional[str] = None):
     query = db.query(Receipt)
     if receipt_type:
         query = query.filter(Receipt.receipt_type == receipt_type)
     if po_id:
         query = query.filter(Receipt.purchase_order_id == po_id)
-    return query.offset(skip).limit(limit).all()
+    return paginate(query, Receipt.id, skip=skip, limit=limit, cursor=cursor)
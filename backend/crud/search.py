@@ -0,0 +1,158 @@
+import logging
+import os
+import re
+import threading
+from typing import List, Optional
+
+from sqlalchemy import case, column, func, literal_column, or_, select, table, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+from models.procurement import Product, Supplier, SupplierType
+
+logger = logging.getLogger("uvicorn.error")
+
+# Upper bound on ?limit= for the search routes
+SEARCH_MAX_RESULTS = int(os.getenv("SEARCH_MAX_RESULTS", "50"))
+
+# table -> (FTS5 index, indexed columns, bm25 weight per column). The indexes are
+# external-content tables holding only tokens; triggers keep them in step with
+# every insert, update and delete whichever code path issues it (CRUD routes,
+# catalog sync upserts, the benchmark generator).
+SEARCH_INDEXES = {
+    "products": ("product_search", ("name", "description", "manufacturer", "hs_code"), (10.0, 1.0, 3.0, 3.0)),
+    "suppliers": ("supplier_search", ("name", "contact_person"), (10.0, 2.0)),
+}
+
+SEARCH_MODELS = {"products": Product, "suppliers": Supplier}
+
+_TOKEN = re.compile(r"\w+")
+
+
+def search_tokens(q: str) -> List[str]:
+    """Lower-cased words of a search box value, the unit both backends match prefixes on"""
+    return _TOKEN.findall((q or "").lower())[:8]
+
+
+def _index_ddl(content: str, index: str, columns: tuple) -> List[str]:
+    cols = ", ".join(columns)
+    new = ", ".join(f"new.{c}" for c in columns)
+    old = ", ".join(f"old.{c}" for c in columns)
+    delete = f"INSERT INTO {index}({index}, rowid, {cols}) VALUES ('delete', old.id, {old});"
+    insert = f"INSERT INTO {index}(rowid, {cols}) VALUES (new.id, {new});"
+    return [
+        f"CREATE VIRTUAL TABLE {index} USING fts5({cols}, content='{content}', content_rowid='id', "
+        f"tokenize='unicode61 remove_diacritics 2', prefix='2 3')",
+        f"CREATE TRIGGER {index}_ai AFTER INSERT ON {content} BEGIN {insert} END",
+        f"CREATE TRIGGER {index}_ad AFTER DELETE ON {content} BEGIN {delete} END",
+        f"CREATE TRIGGER {index}_au AFTER UPDATE OF {cols} ON {content} BEGIN {delete} {insert} END",
+    ]
+
+
+# ==================== INDEX MAINTENANCE ====================
+class SearchBackends:
+    """Remembers per database whether the FTS5 indexes exist there, so each search skips the check"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._fts = {}  # database url -> bool
+
+    def has_fts(self, db: Session) -> bool:
+        bind = db.get_bind()
+        key = str(bind.url)
+        with self._lock:
+            known = self._fts.get(key)
+        if known is None:
+            known = bind.dialect.name == "sqlite" and _indexes_present(db)
+            with self._lock:
+                self._fts[key] = known
+        return known
+
+    def forget(self, db: Session):
+        with self._lock:
+            self._fts.pop(str(db.get_bind().url), None)
+
+
+search_backends = SearchBackends()
+
+
+def _indexes_present(db: Session) -> bool:
+    names = db.execute(text("SELECT name FROM sqlite_master WHERE type = 'table'")).scalars()
+    return {index for index, _, _ in SEARCH_INDEXES.values()} <= set(names)
+
+
+def ensure_search_index(db: Session):
+    """Create the FTS5 indexes and their triggers on SQLite if missing, filling them from the tables"""
+    if db.get_bind().dialect.name != "sqlite" or _indexes_present(db):
+        return
+    try:
+        for content, (index, columns, _) in SEARCH_INDEXES.items():
+            for statement in _index_ddl(content, index, columns):
+                db.execute(text(statement))
+        rebuild_search_index(db)
+    except OperationalError as e:
+        # SQLite built without FTS5, or another worker created the indexes first
+        db.rollback()
+        logger.info("Catalog search index not created (%s); search uses LIKE unless it exists", e.orig)
+    search_backends.forget(db)
+
+def rebuild_search_index(db: Session):
+    """Re-read every product and supplier into the FTS5 indexes"""
+    for index, _, _ in SEARCH_INDEXES.values():
+        db.execute(text(f"INSERT INTO {index}({index}) VALUES ('rebuild')"))
+    db.commit()
+
+
+# ==================== SEARCH ====================
+def _fts_search(db: Session, table_name: str, tokens: List[str], limit: int, where):
+    """Best bm25 matches where every token prefixes a word in one of the indexed columns"""
+    model = SEARCH_MODELS[table_name]
+    index, _, weights = SEARCH_INDEXES[table_name]
+    fts = table(index, column("rowid"), column(index))
+    match = " ".join('"' + token + '"*' for token in tokens)
+    # Filtered and ranked before the limit, so the best allowed matches are never cut off
+    stmt = (
+        select(model)
+        .join(fts, fts.c.rowid == model.id)
+        .where(fts.c[index].op("MATCH")(match), *where)
+        .order_by(func.bm25(literal_column(index), *weights), model.name)
+        .limit(limit)
+    )
+    return db.execute(stmt).scalars().all()
+
+def _like_search(db: Session, table_name: str, tokens: List[str], limit: int, where):
+    """Substring matching with LIKE for backends without FTS5; names starting with the query rank first"""
+    model = SEARCH_MODELS[table_name]
+    _, columns, _ = SEARCH_INDEXES[table_name]
+    patterns = [token.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") for token in tokens]
+    conditions = [
+        or_(*(func.lower(getattr(model, name)).like(f"%{pattern}%", escape="\\") for name in columns))
+        for pattern in patterns
+    ]
+    starts_with = func.lower(model.name).like(f"{patterns[0]}%", escape="\\")
+    stmt = (
+        select(model)
+        .where(*conditions, *where)
+        .order_by(case((starts_with, 0), else_=1), model.name)
+        .limit(limit)
+    )
+    return db.execute(stmt).scalars().all()
+
+def _search(db: Session, table_name: str, q: str, limit: int, where=()):
+    if not 1 <= limit <= SEARCH_MAX_RESULTS:
+        raise ValueError(f"limit must be between 1 and {SEARCH_MAX_RESULTS}")
+    tokens = search_tokens(q)
+    if not tokens:
+        return []
+    if search_backends.has_fts(db):
+        return _fts_search(db, table_name, tokens, limit, where)
+    return _like_search(db, table_name, tokens, limit, where)
+
+def search_products(db: Session, q: str, limit: int = 10):
+    """Top `limit` products whose name, description, manufacturer or HS code words start with the query words"""
+    return _search(db, "products", q, limit)
+
+def search_suppliers(db: Session, q: str, limit: int = 10, supplier_type: Optional[str] = None):
+    """Top `limit` suppliers whose name or contact person words start with the query words"""
+    where = (Supplier.supplier_type == SupplierType(supplier_type),) if supplier_type else ()
+    return _search(db, "suppliers", q, limit, where)
@@ -0,0 +1,178 @@
+import os
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+
+from sqlalchemy import Connection, event, insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import NullPool
+
+from database import BEGIN_OPTION, build_engine
+from models.procurement import DocumentSequence
+
+DOC_NUMBER_BLOCK_SIZE = int(os.getenv("DOC_NUMBER_BLOCK_SIZE", "10"))
+# Session.info key of the blocks a session reserved in its open transaction: (allocator, key) -> [next, end)
+PENDING_BLOCKS = "document_number_blocks"
+
+
+class DocumentNumberAllocator:
+    """Hands out per-day document numbers from blocks reserved in document_sequences.
+
+    Each process reserves `block_size` numbers at a time in a short transaction
+    of its own and serves them from memory, so allocating a number is O(1) and
+    never holds the sequence row for the length of the caller's transaction.
+    Numbers left unused when a block is abandoned (restart, failed insert) are
+    skipped, never reused.
+
+    Reservations run on a dedicated unpooled connection: the caller's session
+    already holds a pooled one, and waiting on the pool for a second would let
+    a bounded pool deadlock once every connection is held by such a caller.
+    Sessions already holding SQLite's write lock reserve inside their own
+    transaction instead (see next_number).
+    """
+
+    def __init__(self, block_size: int = DOC_NUMBER_BLOCK_SIZE):
+        self.block_size = max(1, block_size)
+        self._lock = threading.Lock()
+        self._blocks = {}  # (database url, doc_type, day) -> [[next, end), ...]
+        self._engines = {}  # engine -> unpooled engine on the same database, for reservations
+
+    def next_number(self, db: Session, doc_type: str, number_column=None) -> str:
+        """Allocate the next `<doc_type>-<YYYYMMDD>-<NNNN>` number.
+
+        `number_column` is the column holding existing numbers of this type; it
+        is consulted once per day so a new day's sequence starts above numbers
+        issued before the sequence row existed.
+
+        A session holding the SQLite write lock (an IMMEDIATE write session or
+        the group-commit writer) would wait on itself if the reservation took
+        the lock on another connection, so it reserves inside its own
+        transaction instead. Such a block commits or rolls back with the
+        caller: the session serves from it until then, and what is left of it
+        joins the shared blocks only once the transaction has committed.
+        """
+        bind = db.get_bind()
+        day = datetime.utcnow().strftime('%Y%m%d')
+        key = (str(bind.url), doc_type, day)
+        if _holds_write_lock(db, bind):
+            return f"{doc_type}-{day}-{self._next_in_transaction(db, key, number_column):04d}"
+        reserve_on = self._reservation_engine(bind)
+        while True:
+            with self._lock:
+                value = self._take(key)
+            if value is not None:
+                return f"{doc_type}-{day}-{value:04d}"
+            # Reserve outside the lock: under the async stack other requests on
+            # this thread keep running while the reservation awaits the database
+            start, end = self._reserve(reserve_on, doc_type, day, number_column, self.block_size)
+            self._publish(key, [start, end])
+
+    def _next_in_transaction(self, db: Session, key, number_column) -> int:
+        with self._lock:
+            value = self._take(key)
+        if value is not None:
+            return value
+        pending = db.info.setdefault(PENDING_BLOCKS, {})
+        block = pending.get((self, key))
+        if block is None or block[0] >= block[1]:
+            # A SAVEPOINT could roll a block back while the transaction commits, so inside one take a single number
+            size = 1 if db.in_nested_transaction() else self.block_size
+            _, doc_type, day = key
+            block = pending[(self, key)] = list(self._reserve(db.connection(), doc_type, day, number_column, size))
+        block[0] += 1
+        return block[0] - 1
+
+    def _publish(self, key, block: list):
+        """Make a committed block's numbers available to every session"""
+        with self._lock:
+            self._blocks = {k: v for k, v in self._blocks.items() if k[2] == key[2]}
+            self._blocks.setdefault(key, []).append(block)
+
+    def _reservation_engine(self, bind):
+        with self._lock:
+            if bind not in self._engines:
+                url = bind.url.render_as_string(hide_password=False)
+                if bind.dialect.is_async:
+                    # The sync facade of an async engine, usable from the run_sync greenlet the caller runs in
+                    from sqlalchemy.ext.asyncio import create_async_engine
+                    reserve = build_engine(url, create=create_async_engine, poolclass=NullPool).sync_engine
+                else:
+                    reserve = build_engine(url, poolclass=NullPool)
+                self._engines[bind] = reserve
+            return self._engines[bind]
+
+    def _take(self, key):
+        """Pop the next free number for `key` from the reserved blocks, if any"""
+        blocks = self._blocks.get(key, [])
+        while blocks and blocks[0][0] >= blocks[0][1]:
+            blocks.pop(0)
+        if not blocks:
+            return None
+        value = blocks[0][0]
+        blocks[0][0] += 1
+        return value
+
+    def _reserve(self, bind, doc_type: str, day: str, number_column, size: int):
+        """Reserve the next `size` numbers on an engine, or a connection's open transaction; returns (start, end)"""
+        row = (DocumentSequence.doc_type == doc_type) & (DocumentSequence.day == day)
+        for _ in range(3):
+            try:
+                with _reservation(bind) as conn:
+                    result = conn.execute(
+                        update(DocumentSequence).where(row)
+                        .values(next_value=DocumentSequence.next_value + size)
+                    )
+                    if result.rowcount:
+                        end = conn.execute(select(DocumentSequence.next_value).where(row)).scalar_one()
+                        return end - size, end
+                    start = _highest_issued(conn, number_column, f"{doc_type}-{day}-") + 1
+                    conn.execute(insert(DocumentSequence).values(
+                        doc_type=doc_type, day=day, next_value=start + size
+                    ))
+                    return start, start + size
+            except IntegrityError:
+                # Another worker created today's row first; reserve from it instead
+                continue
+        raise RuntimeError(f"Could not reserve {doc_type} numbers")
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_pending_blocks(session):
+    for (allocator, key), block in session.info.pop(PENDING_BLOCKS, {}).items():
+        if block[0] < block[1]:
+            allocator._publish(key, block)
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _drop_pending_blocks(session, transaction):
+    # Runs after after_commit; anything still pending was rolled back with the transaction
+    if transaction.parent is None:
+        session.info.pop(PENDING_BLOCKS, None)
+
+
+@contextmanager
+def _reservation(bind):
+    """A transaction of its own on an engine, a SAVEPOINT on a connection already in one"""
+    if isinstance(bind, Connection):
+        with bind.begin_nested():
+            yield bind
+    else:
+        with bind.begin() as conn:
+            yield conn
+
+
+def _holds_write_lock(db: Session, bind) -> bool:
+    if db.info.get("group_commit"):
+        return True
+    return bind.get_execution_options().get(BEGIN_OPTION) in ("IMMEDIATE", "EXCLUSIVE")
+
+
+def _highest_issued(conn, number_column, prefix: str) -> int:
+    if number_column is None:
+        return 0
+    numbers = conn.execute(select(number_column).where(number_column.like(f"{prefix}%"))).scalars()
+    return max((int(n[len(prefix):]) for n in numbers if n[len(prefix):].isdigit()), default=0)
+
+
+document_numbers = DocumentNumberAllocator()
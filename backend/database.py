@@ -1,25 +1,407 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.exc import OperationalError
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from fastapi import Request, Response
+from fastapi.concurrency import run_in_threadpool
+import asyncio
+import contextvars
+import json
+import logging
 import os
+import sqlite3
+import threading
+import time
+import weakref
 from dotenv import load_dotenv
 
 load_dotenv()
 
+# Shares uvicorn's configured handler so startup reports show up in the server log
+logger = logging.getLogger("uvicorn.error")
+
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./pharma_factory.db")
 
-engine = create_engine(
-    DATABASE_URL, connect_args={"check_same_thread": False}
+# "sync" runs CRUD on the threadpool with a Session, "async" on the event loop with an AsyncSession
+DB_MODE = os.getenv("DB_MODE", "sync").lower()
+ASYNC_DB = DB_MODE == "async"
+
+# Async drivers for the sync URL schemes we support
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "postgres": "postgresql+asyncpg",
+}
+
+def to_async_url(url: str) -> str:
+    """Map a sync database URL onto its async driver"""
+    scheme, sep, rest = url.partition("://")
+    return ASYNC_DRIVERS.get(scheme.split("+")[0], scheme) + sep + rest
+
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL", to_async_url(DATABASE_URL))
+
+# Optional read replica for GET routes; unset means reads share the primary
+READ_DATABASE_URL = os.getenv("READ_DATABASE_URL")
+ASYNC_READ_DATABASE_URL = os.getenv(
+    "ASYNC_READ_DATABASE_URL", READ_DATABASE_URL and to_async_url(READ_DATABASE_URL)
+)
+
+# How long a client keeps reading from the primary after one of its writes
+READ_YOUR_WRITES_SECONDS = float(os.getenv("READ_YOUR_WRITES_SECONDS", "5"))
+READ_PRIMARY_COOKIE = "read_primary_until"
+READ_CONSISTENCY_HEADER = "X-Read-Consistency"
+
+IS_SQLITE = DATABASE_URL.startswith("sqlite")
+
+# SQLite performance profile applied to every new connection; SQLITE_PROFILE=default keeps SQLite's defaults
+SQLITE_PROFILE = os.getenv("SQLITE_PROFILE", "performance").lower()
+SQLITE_PRAGMAS = {
+    "journal_mode": os.getenv("SQLITE_JOURNAL_MODE", "WAL"),
+    "synchronous": os.getenv("SQLITE_SYNCHRONOUS", "NORMAL"),
+    "busy_timeout": os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"),
+    "cache_size": os.getenv("SQLITE_CACHE_SIZE", "-65536"),  # negative means KiB, i.e. 64 MiB
+    "mmap_size": os.getenv("SQLITE_MMAP_SIZE", "268435456"),
+    "temp_store": os.getenv("SQLITE_TEMP_STORE", "MEMORY"),
+} if SQLITE_PROFILE == "performance" else {}
+
+# How the write sessions (get_db, the group-commit writer, maintenance commands) begin their transactions.
+# IMMEDIATE takes the write lock at BEGIN, where SQLite's busy handler queues it, instead of upgrading a read
+# lock mid-transaction, which fails at once with "database is locked" whenever another writer got in between.
+# DEFERRED leaves transactions to the driver, as before.
+SQLITE_WRITE_BEGIN = os.getenv("SQLITE_WRITE_BEGIN", "IMMEDIATE").upper()
+SQLITE_OWN_TRANSACTIONS = SQLITE_WRITE_BEGIN != "DEFERRED"
+# Execution option carrying the BEGIN flavour from a write engine to its connections
+BEGIN_OPTION = "sqlite_begin"
+
+def apply_sqlite_pragmas(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    for name, value in SQLITE_PRAGMAS.items():
+        cursor.execute(f"PRAGMA {name}={value}")
+    cursor.close()
+
+def take_over_sqlite_transactions(dbapi_connection, connection_record):
+    # The driver stops issuing its own (deferred, DML-only) BEGIN; SQLiteTransactions emits one instead
+    dbapi_connection.isolation_level = None
+
+class SQLiteTransactions:
+    """Begins each transaction on an SQLite engine with the BEGIN its connection asks for.
+
+    Write transactions (BEGIN IMMEDIATE) of one process also queue for a
+    lock of their own first, held until commit or rollback: waiters sleep
+    until it is released instead of polling SQLite's busy handler, which is
+    unfair enough to let a writer time out behind a steady stream of others.
+    Async engines queue on an asyncio lock, awaited from the greenlet their
+    BEGIN runs in. Between processes the busy timeout still applies.
+    """
+
+    def __init__(self, timeout: float):
+        self.timeout = timeout
+        self.write_lock = threading.Lock()
+        self.async_write_locks = weakref.WeakKeyDictionary()  # event loop -> asyncio.Lock
+
+    def begin(self, conn):
+        mode = conn.get_execution_options().get(BEGIN_OPTION, "DEFERRED")
+        if mode != "DEFERRED":
+            lock = self._acquire_async(conn) if conn.dialect.is_async else self._acquire()
+            if lock is None:
+                raise OperationalError(f"BEGIN {mode}", None, sqlite3.OperationalError("database is locked"))
+            conn.info["write_lock"] = lock
+        try:
+            conn.exec_driver_sql(f"BEGIN {mode}")
+        except BaseException:
+            self.end(conn)
+            raise
+
+    def _acquire(self):
+        return self.write_lock if self.write_lock.acquire(timeout=self.timeout) else None
+
+    def _acquire_async(self, conn):
+        from sqlalchemy.util import await_only
+        lock = self.async_write_locks.setdefault(asyncio.get_running_loop(), asyncio.Lock())
+        try:
+            await_only(asyncio.wait_for(lock.acquire(), self.timeout))
+        except asyncio.TimeoutError:
+            return None
+        return lock
+
+    def end(self, conn):
+        lock = conn.info.pop("write_lock", None)
+        if lock is not None:
+            lock.release()
+
+    def checkin(self, dbapi_connection, connection_record):
+        # A connection returned without commit or rollback (e.g. a garbage-collected session) still lets go
+        self.end(connection_record)
+
+    def listen(self, bind):
+        event.listen(bind, "begin", self.begin)
+        event.listen(bind, "commit", self.end)
+        event.listen(bind, "rollback", self.end)
+        event.listen(bind, "checkin", self.checkin)
+
+def apply_sqlite_read_only(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA query_only=ON")
+    cursor.close()
+
+# Pool sizing, only passed through when set so each dialect keeps its default pool otherwise
+POOL_SETTINGS = (
+    ("DB_POOL_SIZE", "pool_size", int),
+    ("DB_MAX_OVERFLOW", "max_overflow", int),
+    ("DB_POOL_TIMEOUT", "pool_timeout", float),
+    ("DB_POOL_RECYCLE", "pool_recycle", int),
+    ("DB_POOL_PRE_PING", "pool_pre_ping", lambda value: value.lower() in ("1", "true", "yes")),
 )
+POOL_OPTIONS = {
+    option: cast(os.environ[env]) for env, option, cast in POOL_SETTINGS if os.getenv(env)
+}
+
+# Per-request SQL instrumentation (Server-Timing header, slow query log); no hooks are installed unless enabled
+SQL_INSTRUMENTATION = os.getenv("SQL_INSTRUMENTATION", "false").lower() in ("1", "true", "yes")
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "200"))
+SLOW_QUERY_LOG = os.getenv("SLOW_QUERY_LOG")  # JSON lines file; unset logs through uvicorn's error log
+
+slow_query_logger = logger.getChild("slow_query")
+if SQL_INSTRUMENTATION and SLOW_QUERY_LOG:
+    slow_query_logger.addHandler(logging.FileHandler(SLOW_QUERY_LOG))
+    slow_query_logger.propagate = False
+
+EXPLAIN_PREFIXES = {"sqlite": "EXPLAIN QUERY PLAN ", "postgresql": "EXPLAIN ", "mysql": "EXPLAIN "}
+EXPLAINABLE = ("SELECT", "WITH", "INSERT", "UPDATE", "DELETE")
+
+class RequestSQLStats:
+    """Statement count, total time and slowest statement of one request"""
+
+    def __init__(self, scope: dict):
+        self.scope = scope
+        self.count = 0
+        self.total = 0.0
+        self.slowest = 0.0
+        self.slowest_statement = None
+
+    def record(self, statement: str, elapsed: float):
+        self.count += 1
+        self.total += elapsed
+        if elapsed > self.slowest:
+            self.slowest = elapsed
+            self.slowest_statement = statement
+
+    def route(self) -> str:
+        route = self.scope.get("route")
+        return getattr(route, "path", None) or self.scope.get("path", "")
+
+    def server_timing(self, request_seconds: float) -> str:
+        return (
+            f'sql;dur={self.total * 1000:.2f};desc="{self.count} statements", '
+            f'sql-slowest;dur={self.slowest * 1000:.2f}, '
+            f'total;dur={request_seconds * 1000:.2f}'
+        )
+
+request_sql_stats = contextvars.ContextVar("request_sql_stats", default=None)
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+def _explain(conn, statement: str, parameters):
+    """Query plan for a slow statement, run on the same connection"""
+    prefix = EXPLAIN_PREFIXES.get(conn.dialect.name)
+    if not prefix or not statement.lstrip().upper().startswith(EXPLAINABLE):
+        return None
+    try:
+        cursor = conn.connection.cursor()
+        try:
+            cursor.execute(prefix + statement, parameters)
+            return [" | ".join(str(column) for column in row) for row in cursor.fetchall()]
+        finally:
+            cursor.close()
+    except Exception as e:
+        return [f"EXPLAIN failed: {e}"]
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if request_sql_stats.get() is not None:
+        conn.info.setdefault("statement_started", []).append(time.perf_counter())
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = request_sql_stats.get()
+    started = conn.info.get("statement_started")
+    if stats is None or not started:
+        return
+    elapsed = time.perf_counter() - started.pop()
+    stats.record(statement, elapsed)
+    if elapsed * 1000 < SLOW_QUERY_MS:
+        return
+    # executemany hands over a list of parameter sets, except when insertmanyvalues runs them one by one
+    many = isinstance(parameters, list) and bool(parameters) and isinstance(parameters[0], (list, tuple, dict))
+    first = parameters[0] if many else parameters
+    slow_query_logger.warning(json.dumps({
+        "event": "slow_query",
+        "method": stats.scope.get("method"),
+        "path": stats.scope.get("path"),
+        "route": stats.route(),
+        "duration_ms": round(elapsed * 1000, 2),
+        "statement": statement,
+        "parameters": first,
+        "executemany": len(parameters) if many else None,
+        "explain": _explain(conn, statement, first),
+    }, default=str))
+
+def _statement_failed(exception_context):
+    # after_cursor_execute never runs for a statement that raised, so drop its start time here
+    started = exception_context.connection is not None and exception_context.connection.info.get("statement_started")
+    if started:
+        started.pop()
+
+def _forget_statement_starts(dbapi_connection, connection_record):
+    # Nothing is in flight once a connection is back in the pool
+    connection_record.info.pop("statement_started", None)
+
+def instrument_engine(bind):
+    """Time every statement on `bind` against the request that issued it"""
+    event.listen(bind, "before_cursor_execute", _before_cursor_execute)
+    event.listen(bind, "after_cursor_execute", _after_cursor_execute)
+    event.listen(bind, "handle_error", _statement_failed)
+    event.listen(bind, "checkin", _forget_statement_starts)
+
+def build_engine(url: str, read_only: bool = False, create=create_engine, poolclass=None):
+    """Create an engine with the pool options (or `poolclass` instead) and, for SQLite, the connection profile"""
+    sqlite = url.startswith("sqlite")
+    connect_args = {"check_same_thread": False} if sqlite and create is create_engine else {}
+    pool_options = {"poolclass": poolclass} if poolclass else POOL_OPTIONS
+    bind = create(url, connect_args=connect_args, **pool_options)
+    if sqlite:
+        sync_bind = getattr(bind, "sync_engine", bind)
+        event.listen(sync_bind, "connect", apply_sqlite_pragmas)
+        if SQLITE_OWN_TRANSACTIONS:
+            event.listen(sync_bind, "connect", take_over_sqlite_transactions)
+            SQLiteTransactions(int(SQLITE_PRAGMAS.get("busy_timeout", 5000)) / 1000).listen(sync_bind)
+        if read_only:
+            event.listen(sync_bind, "connect", apply_sqlite_read_only)
+    if SQL_INSTRUMENTATION:
+        instrument_engine(getattr(bind, "sync_engine", bind))
+    return bind
+
+engine = build_engine(DATABASE_URL)
+read_engine = build_engine(READ_DATABASE_URL, read_only=True) if READ_DATABASE_URL else engine
+HAS_READ_REPLICA = read_engine is not engine
+
+def for_writes(bind):
+    """The engine (sync or async) whose transactions begin as SQLITE_WRITE_BEGIN; same pool as `bind`"""
+    if IS_SQLITE and SQLITE_OWN_TRANSACTIONS:
+        return bind.execution_options(**{BEGIN_OPTION: SQLITE_WRITE_BEGIN})
+    return bind
+
+write_engine = for_writes(engine)
+
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=write_engine)
+PrimaryReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
+
+# The async stack needs sqlalchemy[asyncio] plus aiosqlite/asyncpg, so it is only imported when selected
+async_engine = None
+async_read_engine = None
+AsyncSessionLocal = None
+AsyncPrimaryReadSessionLocal = None
+AsyncReadSessionLocal = None
+if ASYNC_DB:
+    from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+
+    async_engine = build_engine(ASYNC_DATABASE_URL, create=create_async_engine)
+    async_read_engine = (
+        build_engine(ASYNC_READ_DATABASE_URL, read_only=True, create=create_async_engine)
+        if HAS_READ_REPLICA else async_engine
+    )
+    AsyncSessionLocal = async_sessionmaker(for_writes(async_engine), autoflush=False)
+    AsyncPrimaryReadSessionLocal = async_sessionmaker(async_engine, autoflush=False)
+    AsyncReadSessionLocal = async_sessionmaker(async_read_engine, autoflush=False)
 
 Base = declarative_base()
 
-def get_db():
+def database_binds():
+    """(role, sync engine) for every engine this process opens connections on"""
+    binds = [("primary", engine)]
+    if HAS_READ_REPLICA:
+        binds.append(("replica", read_engine))
+    if ASYNC_DB:
+        binds.append(("async primary", async_engine.sync_engine))
+        if HAS_READ_REPLICA:
+            binds.append(("async replica", async_read_engine.sync_engine))
+    return binds
+
+def report_database_settings():
+    """Log the effective engine, pool and SQLite settings"""
+    for role, bind in database_binds():
+        pool = bind.pool
+        logger.info(
+            "Database %s %s: pool=%s size=%s max_overflow=%s timeout=%s",
+            role, bind.url.render_as_string(hide_password=True), type(pool).__name__,
+            getattr(pool, "size", lambda: None)(), getattr(pool, "_max_overflow", None),
+            getattr(pool, "_timeout", None),
+        )
+    if IS_SQLITE:
+        with engine.connect() as conn:
+            effective = {
+                name: conn.exec_driver_sql(f"PRAGMA {name}").scalar()
+                for name in ("journal_mode", "synchronous", "busy_timeout", "cache_size", "mmap_size", "temp_store")
+            }
+        logger.info("SQLite profile '%s': %s", SQLITE_PROFILE, effective)
+
+def get_sync_db():
     """Dependency to get database session"""
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
+
+async def get_async_db():
+    """Dependency to get an async database session"""
+    async with AsyncSessionLocal() as db:
+        yield db
+
+get_db = get_async_db if ASYNC_DB else get_sync_db
+
+def reads_from_primary(request: Request) -> bool:
+    """Whether this request must see the primary: asked for explicitly or right after its own write"""
+    if not HAS_READ_REPLICA:
+        return True
+    if request.headers.get(READ_CONSISTENCY_HEADER, "").lower() == "primary":
+        return True
+    try:
+        return float(request.cookies.get(READ_PRIMARY_COOKIE, 0)) > time.time()
+    except ValueError:
+        return False
+
+def read_session_factory(request: Request):
+    """Sync session factory for this request's reads (the replica unless reads_from_primary)"""
+    return PrimaryReadSessionLocal if reads_from_primary(request) else ReadSessionLocal
+
+def get_sync_read_db(request: Request):
+    """Dependency to get a session on the read replica (or the primary, see reads_from_primary)"""
+    db = read_session_factory(request)()
+    try:
+        yield db
+    finally:
+        db.close()
+
+async def get_async_read_db(request: Request):
+    """Dependency to get an async session on the read replica (or the primary)"""
+    factory = AsyncPrimaryReadSessionLocal if reads_from_primary(request) else AsyncReadSessionLocal
+    async with factory() as db:
+        yield db
+
+get_read_db = get_async_read_db if ASYNC_DB else get_sync_read_db
+
+def pin_reads_to_primary(response: Response):
+    """Route the client's reads to the primary for READ_YOUR_WRITES_SECONDS after a write"""
+    if HAS_READ_REPLICA:
+        response.set_cookie(
+            READ_PRIMARY_COOKIE, f"{time.time() + READ_YOUR_WRITES_SECONDS:.3f}",
+            max_age=max(1, int(READ_YOUR_WRITES_SECONDS)), samesite="lax"
+        )
+
+async def run_db(db, fn, *args, **kwargs):
+    """Run a sync CRUD function `fn(session, ...)` without blocking the event loop.
+
+    With an AsyncSession the function runs through `run_sync`, so its queries
+    go through the async driver; with a Session it runs on the threadpool.
+    """
+    if ASYNC_DB:
+        return await db.run_sync(fn, *args, **kwargs)
+    return await run_in_threadpool(fn, db, *args, **kwargs)
@@ -1,16 +1,26 @@
-from fastapi import FastAPI
+import time
+from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from database import engine, Base
+from database import (
+    report_database_settings, HAS_READ_REPLICA, pin_reads_to_primary,
+    SQL_INSTRUMENTATION, RequestSQLStats, request_sql_stats, database_binds
+)
+import metrics
 from routes.procurement import router as procurement_router
+from migrations import check_schema
+
+# Schema changes are applied by `python manage.py migrate`; starting a worker only checks the version
+check_schema()
 
-# Create database tables
-Base.metadata.create_all(bind=engine)
+report_database_settings()
 
 app = FastAPI(
     title="Pharma Factory Management System",
     description="Internal factory management system for pharmaceutical company",
     version="1.0.0"
 )
+# Counts requests in flight per route template (see metrics.MetricsMiddleware)
+app.router.route_class = metrics.MetricsRoute
 
 # Configure CORS
 app.add_middleware(
@@ -19,8 +29,36 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag", "Server-Timing"],
 )
 
+# Read-your-writes: after a successful write, the client's reads go to the primary for a few seconds
+if HAS_READ_REPLICA:
+    @app.middleware("http")
+    async def read_your_writes(request: Request, call_next):
+        response = await call_next(request)
+        if request.method not in ("GET", "HEAD", "OPTIONS") and response.status_code < 400:
+            pin_reads_to_primary(response)
+        return response
+
+# Per-request SQL statement count and time as a Server-Timing header (SQL_INSTRUMENTATION=true)
+if SQL_INSTRUMENTATION:
+    @app.middleware("http")
+    async def sql_instrumentation(request: Request, call_next):
+        stats = RequestSQLStats(request.scope)
+        token = request_sql_stats.set(stats)
+        started = time.perf_counter()
+        try:
+            response = await call_next(request)
+        finally:
+            request_sql_stats.reset(token)
+        response.headers["Server-Timing"] = stats.server_timing(time.perf_counter() - started)
+        return response
+
+# Latency and error metrics per route template, served at /metrics (in-flight requests: MetricsRoute)
+if metrics.METRICS_ENABLED:
+    app.add_middleware(metrics.MetricsMiddleware)
+
 # Include routers
 app.include_router(procurement_router)
 
@@ -36,6 +74,13 @@ def read_root():
 def health_check():
     return {"status": "healthy"}
 
+if metrics.METRICS_ENABLED:
+    @app.get("/metrics", include_in_schema=False)
+    def get_metrics():
+        """Prometheus metrics for this process"""
+        pools = [(role, bind.pool) for role, bind in database_binds()]
+        return Response(metrics.render(pools), media_type="text/plain; version=0.0.4")
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
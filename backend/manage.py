@@ -0,0 +1,98 @@
+"""Maintenance commands for the procurement database.
+
+Run from `backend/` against the database in DATABASE_URL:
+
+    python manage.py migrate           # apply pending schema migrations (run before starting workers)
+    python manage.py schema-version    # applied and pending migrations
+    python manage.py rebuild-rollups   # supplier/product/month analytics rollups
+    python manage.py rebuild-stats     # dashboard counters
+    python manage.py check-po-aggregates    # POs whose stored item/QC/receipt aggregates drifted
+    python manage.py rebuild-po-aggregates  # recompute drifted PO aggregates from the base tables
+    python manage.py rebuild-search    # FTS5 catalog search indexes (SQLite)
+    python manage.py clear-documents   # printable document render cache
+"""
+import argparse
+import time
+
+from database import SessionLocal
+import migrations
+
+
+def migrate(db):
+    applied = migrations.migrate(db.get_bind())
+    if not applied:
+        return f"already at version {migrations.LATEST_VERSION}"
+    return "applied " + ", ".join(f"{m.version} ({m.name})" for m in applied)
+
+
+def schema_version(db):
+    current = migrations.schema_version(db.get_bind())
+    pending = [f"{m.version} ({m.name})" for m in migrations.MIGRATIONS if m.version > current]
+    return f"version {current}, pending: {', '.join(pending) or 'none'}"
+
+
+def rebuild_rollups(db):
+    from crud.analytics import rebuild_rollups
+    return f"{rebuild_rollups(db)} rollup rows"
+
+
+def rebuild_stats(db):
+    from crud.procurement import rebuild_stats
+    rebuild_stats(db)
+    return "counters rebuilt"
+
+
+def check_po_aggregates(db):
+    from crud.procurement import check_purchase_order_aggregates
+    count, ids = check_purchase_order_aggregates(db)
+    if not count:
+        return "no drift"
+    return f"{count} purchase orders drifted, e.g. ids {', '.join(map(str, ids))}"
+
+
+def rebuild_po_aggregates(db):
+    from crud.procurement import rebuild_purchase_order_aggregates
+    return f"{rebuild_purchase_order_aggregates(db)} purchase orders fixed"
+
+
+def rebuild_search(db):
+    from crud.search import ensure_search_index, rebuild_search_index, search_backends
+    ensure_search_index(db)
+    if not search_backends.has_fts(db):
+        return "no FTS5 indexes on this database, search uses LIKE"
+    rebuild_search_index(db)
+    return "search indexes rebuilt"
+
+
+def clear_documents(db):
+    from crud.documents import DOCUMENT_CACHE_DIR, clear_cache
+    return f"{clear_cache()} cached documents removed from {DOCUMENT_CACHE_DIR}"
+
+
+COMMANDS = {
+    "migrate": migrate,
+    "schema-version": schema_version,
+    "rebuild-rollups": rebuild_rollups,
+    "rebuild-stats": rebuild_stats,
+    "check-po-aggregates": check_po_aggregates,
+    "rebuild-po-aggregates": rebuild_po_aggregates,
+    "rebuild-search": rebuild_search,
+    "clear-documents": clear_documents,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("command", choices=COMMANDS)
+    args = parser.parse_args()
+
+    if args.command not in ("migrate", "schema-version"):
+        migrations.check_schema()
+    started = time.perf_counter()
+    with SessionLocal() as db:
+        outcome = COMMANDS[args.command](db)
+    print(f"{args.command}: {outcome} in {time.perf_counter() - started:.1f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,222 @@
+import bisect
+import os
+import threading
+import time
+
+from fastapi.routing import APIRoute
+
+# Served at /metrics in the Prometheus text format; METRICS_ENABLED=false drops the endpoint and the middleware
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() in ("1", "true", "yes")
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# name -> (type, help)
+METRICS = {
+    "http_request_duration_seconds": ("histogram", "Request latency by route template"),
+    "http_requests_in_flight": ("gauge", "Requests being served by route template"),
+    "http_request_errors_total": ("counter", "Responses with a 4xx or 5xx status by route template"),
+    "procurement_purchase_orders_created_total": ("counter", "Purchase orders created"),
+    "procurement_qc_reports_created_total": ("counter", "QC reports filed"),
+    "procurement_qc_rejections_total": ("counter", "QC report items with a rejected quantity"),
+    "procurement_qc_rejected_quantity_total": ("counter", "Quantity rejected at QC"),
+    "procurement_qc_rejected_value_total": ("counter", "Value rejected at QC"),
+    "procurement_receipts_created_total": ("counter", "Receipts generated"),
+    "write_pipeline_batches_total": ("counter", "Transactions committed by the group-commit writer"),
+    "write_pipeline_writes_total": ("counter", "Write requests committed by the group-commit writer"),
+    "admission_in_flight": ("gauge", "Requests holding an admission slot by limiter"),
+    "admission_queue_depth": ("gauge", "Requests waiting for an admission slot by limiter"),
+    "admission_wait_seconds": ("histogram", "Time requests waited for an admission slot by limiter"),
+    "admission_rejected_total": ("counter", "Requests turned away with 503 by limiter and reason"),
+}
+
+
+class MetricsRegistry:
+    """Counters, gauges and histograms aggregated per thread.
+
+    Each thread records into a shard of its own, a plain dict keyed by
+    (metric, labels), so recording never takes a lock and never contends
+    with other threads; a scrape copies and sums the shards. Labels are
+    tuples of (name, value) pairs.
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+        self._shards = []
+        self._lock = threading.Lock()  # only guards the shard list
+
+    def _shard(self) -> dict:
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = self._local.shard = {}
+            with self._lock:
+                self._shards.append(shard)
+        return shard
+
+    def inc(self, name: str, labels: tuple = (), value: float = 1.0):
+        shard = self._shard()
+        key = (name, labels)
+        shard[key] = shard.get(key, 0.0) + value
+
+    def observe(self, name: str, labels: tuple, value: float):
+        shard = self._shard()
+        key = (name, labels)
+        series = shard.get(key)
+        if series is None:
+            # per-bucket counts (the last one is +Inf), then sum and count
+            series = shard[key] = [0] * (len(LATENCY_BUCKETS) + 1) + [0.0, 0]
+        series[bisect.bisect_left(LATENCY_BUCKETS, value)] += 1
+        series[-2] += value
+        series[-1] += 1
+
+    def collect(self) -> dict:
+        """Sum of all shards: (name, labels) -> value, or bucket list for histograms"""
+        with self._lock:
+            shards = list(self._shards)
+        totals = {}
+        for shard in shards:
+            # Copying a dict's items holds the GIL throughout, so the owning thread cannot resize it meanwhile
+            for key, value in list(shard.items()):
+                if isinstance(value, list):
+                    value = list(value)
+                    current = totals.get(key)
+                    totals[key] = value if current is None else [a + b for a, b in zip(current, value)]
+                else:
+                    totals[key] = totals.get(key, 0.0) + value
+        return totals
+
+
+registry = MetricsRegistry()
+
+
+# ==================== BUSINESS COUNTERS ====================
+def purchase_orders_created(supplier_type: str, count: int = 1):
+    registry.inc("procurement_purchase_orders_created_total", (("supplier_type", supplier_type),), count)
+
+def qc_report_filed(rejected_items: int, rejected_qty: float, rejected_value: float):
+    registry.inc("procurement_qc_reports_created_total")
+    if rejected_items:
+        registry.inc("procurement_qc_rejections_total", (), rejected_items)
+        registry.inc("procurement_qc_rejected_quantity_total", (), rejected_qty)
+        registry.inc("procurement_qc_rejected_value_total", (), rejected_value)
+
+def receipt_created(receipt_type: str):
+    registry.inc("procurement_receipts_created_total", (("receipt_type", receipt_type),))
+
+def write_batch_committed(writes: int):
+    registry.inc("write_pipeline_batches_total")
+    registry.inc("write_pipeline_writes_total", (), writes)
+
+
+# ==================== ADMISSION CONTROL ====================
+def admission_active(limiter: str, delta: int):
+    registry.inc("admission_in_flight", (("limiter", limiter),), delta)
+
+def admission_queued(limiter: str, delta: int):
+    registry.inc("admission_queue_depth", (("limiter", limiter),), delta)
+
+def admission_waited(limiter: str, seconds: float):
+    registry.observe("admission_wait_seconds", (("limiter", limiter),), seconds)
+
+def admission_rejected(limiter: str, reason: str):
+    registry.inc("admission_rejected_total", (("limiter", limiter), ("reason", reason)))
+
+
+# ==================== HTTP ====================
+def route_template(scope: dict) -> str:
+    """Path template of the route that served the request, keeping label cardinality bounded"""
+    return getattr(scope.get("route"), "path", None) or "unmatched"
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware recording latency and errors by route template.
+
+    The route template is only known once the router has dispatched the
+    request, so requests in flight are counted by MetricsRoute instead.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            labels = (("method", scope["method"]), ("route", route_template(scope)))
+            registry.observe("http_request_duration_seconds", labels, time.perf_counter() - started)
+            if status >= 400:
+                registry.inc("http_request_errors_total", labels + (("class", f"{status // 100}xx"),))
+
+
+class MetricsRoute(APIRoute):
+    """APIRoute counting its requests in flight, with the labels the middleware gives their latency"""
+
+    async def handle(self, scope, receive, send):
+        if not METRICS_ENABLED:
+            await super().handle(scope, receive, send)
+            return
+        labels = (("method", scope["method"]), ("route", self.path))
+        registry.inc("http_requests_in_flight", labels)
+        try:
+            await super().handle(scope, receive, send)
+        finally:
+            registry.inc("http_requests_in_flight", labels, -1)
+
+
+# ==================== EXPOSITION ====================
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _labels(labels: tuple) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels) + "}"
+
+def _number(value) -> str:
+    return repr(float(value)) if isinstance(value, float) and not value.is_integer() else str(int(value))
+
+def render(pools) -> str:
+    """Prometheus text exposition of every metric plus the given (role, pool) connection pools"""
+    totals = registry.collect()
+    lines = []
+    for name, (kind, help_text) in METRICS.items():
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+        for (metric, labels), value in sorted(totals.items()):
+            if metric != name:
+                continue
+            if kind != "histogram":
+                lines.append(f"{name}{_labels(labels)} {_number(value)}")
+                continue
+            cumulative = 0
+            for bound, count in zip(LATENCY_BUCKETS + ("+Inf",), value):
+                cumulative += count
+                lines.append(f"{name}_bucket{_labels(labels + (('le', bound),))} {cumulative}")
+            lines.append(f"{name}_sum{_labels(labels)} {value[-2]!r}")
+            lines.append(f"{name}_count{_labels(labels)} {value[-1]}")
+
+    gauges = {
+        "db_pool_size": ("Connections the pool keeps open", "size"),
+        "db_pool_checked_out": ("Connections in use", "checkedout"),
+        "db_pool_checked_in": ("Idle connections in the pool", "checkedin"),
+        "db_pool_overflow": ("Connections opened beyond the pool size", "overflow"),
+    }
+    for name, (help_text, method) in gauges.items():
+        lines += [f"# HELP {name} {help_text}", f"# TYPE {name} gauge"]
+        for role, pool in pools:
+            if hasattr(pool, method):
+                value = getattr(pool, method)()
+                if method == "overflow":
+                    value = max(0, value)  # QueuePool counts up from -pool_size until it overflows
+                lines.append(f"{name}{_labels((('pool', role),))} {value}")
+    return "\n".join(lines) + "\n"
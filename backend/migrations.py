@@ -0,0 +1,153 @@
+"""Versioned schema migrations.
+
+`python manage.py migrate` applies the pending entries of MIGRATIONS in order,
+recording each in `schema_versions`; app startup only reads the current
+version (one SELECT) and refuses to serve a database that is behind, so any
+number of workers can start together without racing on DDL.
+
+Every migration is idempotent (CREATE ... IF NOT EXISTS, backfills that skip
+work already done), so a run interrupted between a migration and its version
+row, or two runs at once, converges on the same schema. Append new migrations
+with the next version number; never edit or reorder applied ones.
+"""
+import logging
+import os
+from datetime import datetime
+from typing import Callable, List, NamedTuple
+
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, func, insert, inspect, select, text
+from sqlalchemy.exc import DBAPIError, IntegrityError
+from sqlalchemy.orm import Session
+from sqlalchemy.schema import CreateColumn, CreateIndex
+
+from database import Base, engine
+from models.procurement import PurchaseOrder, PurchaseOrderItem, QCReportItem
+
+logger = logging.getLogger("uvicorn.error")
+
+# Single-process development convenience: migrate at startup instead of refusing to start
+AUTO_MIGRATE = os.getenv("AUTO_MIGRATE", "false").lower() in ("1", "true", "yes")
+
+schema_versions = Table(
+    "schema_versions", MetaData(),
+    Column("version", Integer, primary_key=True),
+    Column("name", String, nullable=False),
+    Column("applied_at", DateTime, default=datetime.utcnow),
+)
+
+
+class Migration(NamedTuple):
+    version: int
+    name: str
+    apply: Callable[[Session], None]
+
+
+# ==================== MIGRATIONS ====================
+def _create_tables(db: Session):
+    # Tables missing from the database, in their current model shape; later migrations alter existing ones
+    Base.metadata.create_all(bind=db.connection())
+
+def _create_indexes(*indexes):
+    def apply(db: Session):
+        for index in indexes:
+            db.execute(CreateIndex(index, if_not_exists=True))
+    return apply
+
+def _index(column) -> object:
+    (index,) = [index for index in column.table.indexes if list(index.columns) == [column]]
+    return index
+
+def _add_columns(*columns):
+    # Only the columns the table lacks, so a re-run after an interrupted migration is a no-op
+    def apply(db: Session):
+        conn = db.connection()
+        for column in columns:
+            existing = {c["name"] for c in inspect(conn).get_columns(column.table.name)}
+            if column.name not in existing:
+                ddl = CreateColumn(column).compile(dialect=conn.dialect)
+                db.execute(text(f"ALTER TABLE {column.table.name} ADD COLUMN {ddl}"))
+    return apply
+
+PURCHASE_ORDER_AGGREGATES = (
+    "item_count", "total_qty", "accepted_value", "rejected_value", "has_accepted_receipt", "has_rejected_receipt",
+)
+
+def _seed_counters(db: Session):
+    from crud.procurement import ensure_stats
+    ensure_stats(db)
+
+def _create_search_index(db: Session):
+    from crud.search import ensure_search_index
+    ensure_search_index(db)
+
+def _backfill_rollups(db: Session):
+    from crud.analytics import ensure_rollups
+    ensure_rollups(db)
+
+def _backfill_purchase_order_aggregates(db: Session):
+    from crud.procurement import rebuild_purchase_order_aggregates
+    _add_columns(*(PurchaseOrder.__table__.c[name] for name in PURCHASE_ORDER_AGGREGATES))(db)
+    rebuild_purchase_order_aggregates(db)
+
+
+MIGRATIONS = [
+    Migration(1, "create tables", _create_tables),
+    Migration(2, "foreign key indexes", _create_indexes(
+        _index(PurchaseOrder.__table__.c.supplier_id),
+        _index(PurchaseOrderItem.__table__.c.purchase_order_id),
+        _index(QCReportItem.__table__.c.qc_report_id),
+    )),
+    Migration(3, "seed dashboard counters", _seed_counters),
+    Migration(4, "catalog search index", _create_search_index),
+    Migration(5, "supplier product month rollups", _backfill_rollups),
+    Migration(6, "purchase order aggregates", _backfill_purchase_order_aggregates),
+]
+
+LATEST_VERSION = MIGRATIONS[-1].version
+
+
+# ==================== RUNNER ====================
+def schema_version(bind=engine) -> int:
+    """Highest applied migration, 0 for a new database or one from before versioning"""
+    with bind.connect() as conn:
+        try:
+            return conn.execute(select(func.max(schema_versions.c.version))).scalar() or 0
+        except DBAPIError:
+            return 0
+
+def migrate(bind=engine) -> List[Migration]:
+    """Apply the pending migrations in order, committing each with its version row; returns those applied"""
+    schema_versions.create(bind, checkfirst=True)
+    current = schema_version(bind)
+    applied = []
+    for migration in MIGRATIONS:
+        if migration.version <= current:
+            continue
+        with Session(bind) as db:
+            migration.apply(db)
+            db.commit()
+            try:
+                db.execute(insert(schema_versions).values(version=migration.version, name=migration.name))
+                db.commit()
+            except IntegrityError:
+                # A concurrent run recorded it first; the migration itself is idempotent
+                db.rollback()
+        logger.info("Applied migration %s: %s", migration.version, migration.name)
+        applied.append(migration)
+    return applied
+
+def check_schema(bind=engine):
+    """Startup check: raise unless the database is at LATEST_VERSION (or migrate it, with AUTO_MIGRATE)"""
+    version = schema_version(bind)
+    if version == LATEST_VERSION:
+        return
+    if version > LATEST_VERSION:
+        logger.warning("Database schema version %s is newer than this code's %s", version, LATEST_VERSION)
+        return
+    if AUTO_MIGRATE:
+        migrate(bind)
+        return
+    raise RuntimeError(
+        f"Database schema is at version {version}, this code needs {LATEST_VERSION}: "
+        f"run `python manage.py migrate`"
+    )
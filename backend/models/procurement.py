@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Enum, Text
+from sqlalchemy import Boolean, Column, Integer, String, Float, DateTime, ForeignKey, Enum, Text, Index
 from sqlalchemy.orm import relationship
 from database import Base
 from datetime import datetime
@@ -58,7 +58,7 @@ class PurchaseOrder(Base):
     
     id = Column(Integer, primary_key=True, index=True)
     po_number = Column(String, unique=True, index=True, nullable=False)
-    supplier_id = Column(Integer, ForeignKey("suppliers.id"), nullable=False)
+    supplier_id = Column(Integer, ForeignKey("suppliers.id"), nullable=False, index=True)
     supplier_type = Column(Enum(SupplierType), nullable=False)
     status = Column(Enum(PurchaseOrderStatus), default=PurchaseOrderStatus.PENDING)
     
@@ -79,6 +79,15 @@ class PurchaseOrder(Base):
     # Totals
     total_amount = Column(Float, default=0.0)
     
+    # Aggregates of the items, QC report and receipts, kept in step by the CRUD writes so list views
+    # read this table alone (rebuild with `python manage.py rebuild-po-aggregates`)
+    item_count = Column(Integer, default=0)
+    total_qty = Column(Float, default=0.0)
+    accepted_value = Column(Float, default=0.0)
+    rejected_value = Column(Float, default=0.0)
+    has_accepted_receipt = Column(Boolean, default=False)
+    has_rejected_receipt = Column(Boolean, default=False)
+    
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
@@ -92,7 +101,7 @@ class PurchaseOrderItem(Base):
     __tablename__ = "purchase_order_items"
     
     id = Column(Integer, primary_key=True, index=True)
-    purchase_order_id = Column(Integer, ForeignKey("purchase_orders.id"), nullable=False)
+    purchase_order_id = Column(Integer, ForeignKey("purchase_orders.id"), nullable=False, index=True)
     product_id = Column(Integer, ForeignKey("products.id"), nullable=False)
     sn = Column(Integer)  # Serial number in the order
     quantity = Column(Float, nullable=False)
@@ -133,7 +142,7 @@ class QCReportItem(Base):
     __tablename__ = "qc_report_items"
     
     id = Column(Integer, primary_key=True, index=True)
-    qc_report_id = Column(Integer, ForeignKey("qc_reports.id"), nullable=False)
+    qc_report_id = Column(Integer, ForeignKey("qc_reports.id"), nullable=False, index=True)
     po_item_id = Column(Integer, ForeignKey("purchase_order_items.id"), nullable=False)
     
     status = Column(Enum(QCStatus), nullable=False)
@@ -174,3 +183,45 @@ class Receipt(Base):
     
     # Relationships
     purchase_order = relationship("PurchaseOrder", back_populates="receipts")
+
+class ProcurementCounter(Base):
+    __tablename__ = "procurement_counters"
+    
+    # Dashboard counters maintained alongside the rows they count
+    name = Column(String, primary_key=True)
+    value = Column(Float, nullable=False, default=0.0)
+    
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+class DocumentSequence(Base):
+    __tablename__ = "document_sequences"
+    
+    # One row per document type and day; workers reserve blocks of numbers from it
+    doc_type = Column(String, primary_key=True)
+    day = Column(String, primary_key=True)  # YYYYMMDD
+    next_value = Column(Integer, nullable=False)
+
+class SupplierProductMonth(Base):
+    __tablename__ = "supplier_product_months"
+    
+    # Analytics rollup per supplier, product and calendar month, adjusted in the same
+    # transaction as the PO or QC report it sums. Ordering figures fall in the PO's
+    # month, inspection figures in the QC report's.
+    supplier_id = Column(Integer, ForeignKey("suppliers.id"), primary_key=True)
+    product_id = Column(Integer, ForeignKey("products.id"), primary_key=True)
+    month = Column(String, primary_key=True)  # YYYY-MM
+    
+    order_lines = Column(Integer, nullable=False, default=0)
+    ordered_qty = Column(Float, nullable=False, default=0.0)
+    spend = Column(Float, nullable=False, default=0.0)  # line totals including the PO's tax
+    
+    inspected_lines = Column(Integer, nullable=False, default=0)
+    rejected_lines = Column(Integer, nullable=False, default=0)
+    accepted_qty = Column(Float, nullable=False, default=0.0)
+    rejected_qty = Column(Float, nullable=False, default=0.0)
+    accepted_value = Column(Float, nullable=False, default=0.0)
+    rejected_value = Column(Float, nullable=False, default=0.0)
+    
+    __table_args__ = (
+        Index("ix_supplier_product_months_month", "month"),
+    )
@@ -0,0 +1,100 @@
+import asyncio
+import math
+import os
+import time
+from collections import deque
+
+from fastapi import HTTPException
+
+import metrics
+
+# Write requests served at once; 0 disables admission control
+WRITE_CONCURRENCY = int(os.getenv("WRITE_CONCURRENCY", "0"))
+# Write requests allowed to wait for a slot, and for how long, before a 503
+WRITE_QUEUE_SIZE = int(os.getenv("WRITE_QUEUE_SIZE", "32"))
+WRITE_QUEUE_TIMEOUT = float(os.getenv("WRITE_QUEUE_TIMEOUT", "5"))
+# Retry-After on a 503; defaults to the queue timeout
+WRITE_RETRY_AFTER = int(os.getenv("WRITE_RETRY_AFTER", "0")) or max(1, math.ceil(WRITE_QUEUE_TIMEOUT))
+
+
+class AdmissionLimiter:
+    """Concurrency limit with a bounded FIFO wait queue for one class of routes.
+
+    `limit` requests run at once; up to `queue_size` more wait at most
+    `timeout` seconds for a slot, and anything beyond that is turned away at
+    once with 503 and Retry-After, before it reads a session from the pool or
+    takes a threadpool thread. A finished request hands its slot straight to
+    the oldest waiter. All state lives on the event loop, so no locks.
+    """
+
+    def __init__(self, name: str, limit: int, queue_size: int, timeout: float, retry_after: int):
+        self.name = name
+        self.limit = limit
+        self.queue_size = max(0, queue_size)
+        self.timeout = timeout
+        self.retry_after = retry_after
+        self.active = 0
+        self._waiters = deque()
+
+    async def __call__(self):
+        """Route dependency holding a slot until the response is done"""
+        if self.limit <= 0:
+            yield
+            return
+        await self.acquire()
+        try:
+            yield
+        finally:
+            self.release()
+
+    async def acquire(self):
+        if self.active < self.limit and not self._waiters:
+            self._admitted(0.0)
+            return
+        if len(self._waiters) >= self.queue_size:
+            self._reject("queue_full")
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        metrics.admission_queued(self.name, 1)
+        started = time.perf_counter()
+        try:
+            await asyncio.wait_for(waiter, self.timeout)
+        except BaseException as e:
+            if waiter.done() and not waiter.cancelled():
+                self.release()  # the slot arrived just as we gave up; pass it on
+            elif waiter in self._waiters:
+                self._waiters.remove(waiter)
+            if not isinstance(e, asyncio.TimeoutError):
+                raise
+            self._reject("timeout")
+        finally:
+            metrics.admission_queued(self.name, -1)
+        self._admitted(time.perf_counter() - started, handed_over=True)
+
+    def release(self):
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)  # the slot moves to the waiter, `active` stays
+                return
+        self.active -= 1
+        metrics.admission_active(self.name, -1)
+
+    def _admitted(self, waited: float, handed_over: bool = False):
+        if not handed_over:
+            self.active += 1
+            metrics.admission_active(self.name, 1)
+        metrics.admission_waited(self.name, waited)
+
+    def _reject(self, reason: str):
+        metrics.admission_rejected(self.name, reason)
+        raise HTTPException(
+            status_code=503,
+            detail="Too many write requests in progress, retry shortly",
+            headers={"Retry-After": str(self.retry_after)},
+        )
+
+
+write_admission = AdmissionLimiter(
+    "write", WRITE_CONCURRENCY, WRITE_QUEUE_SIZE, WRITE_QUEUE_TIMEOUT, WRITE_RETRY_AFTER
+)
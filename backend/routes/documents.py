@@ -0,0 +1,41 @@
+import asyncio
+import os
+
+from fastapi import HTTPException, Request, Response
+from fastapi.responses import FileResponse
+
+from crud import async_procurement as crud
+from crud.documents import DOCUMENT_FORMATS, DOCUMENT_MEDIA_TYPES, cache_key, cached_path, document_renderer
+from routes.caching import etag_matches
+
+
+async def document_response(request: Request, db, kind: str, doc_id: int, fmt: str, detail: str):
+    """Serve a printable document from the render cache.
+
+    Only the document's number and version are read from the database. A
+    matching If-None-Match gets a bare 304; otherwise the cached file is sent
+    by FileResponse, which honours Range/If-Range and uses the server's
+    `http.response.pathsend` (sendfile) where it offers one. A cache miss
+    waits for the render pool.
+    """
+    if fmt not in DOCUMENT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Document format must be one of: {', '.join(DOCUMENT_FORMATS)}")
+    found = await crud.get_document_version(db, kind, doc_id)
+    if not found:
+        raise HTTPException(status_code=404, detail=detail)
+    number, version = found
+    path = cached_path(kind, doc_id, cache_key(kind, doc_id, version, fmt), fmt)
+    etag = f'"{os.path.basename(path).split(".")[0]}"'
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    if not os.path.exists(path):
+        # The pool renders the version it loads, which may be newer than the one just read
+        path = await asyncio.wrap_future(document_renderer.submit(kind, doc_id, version, fmt))
+        if path is None:
+            raise HTTPException(status_code=404, detail=detail)
+        headers["ETag"] = f'"{os.path.basename(path).split(".")[0]}"'
+    return FileResponse(
+        path, media_type=DOCUMENT_MEDIA_TYPES[fmt], headers=headers,
+        filename=f"{number}.{fmt}", content_disposition_type="inline",
+    )
@@ -1,185 +1,543 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, File, HTTPException, Request, Response, UploadFile, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from typing import List, Optional
-from database import get_db
+import metrics
+from database import get_db, get_read_db, read_session_factory
 from schemas.procurement import (
-    SupplierCreate, SupplierUpdate, SupplierResponse,
+    SupplierCreate, SupplierUpdate, SupplierResponse, SupplierOverview, SupplierOverviewSummary,
     ProductCreate, ProductUpdate, ProductResponse,
-    LocalPurchaseOrderCreate, ImportPurchaseOrderCreate, PurchaseOrderResponse,
-    QCReportCreate, QCReportUpdate, QCReportResponse,
-    ReceiptCreate, ReceiptResponse
+    LocalPurchaseOrderCreate, ImportPurchaseOrderCreate, PurchaseOrderResponse, PurchaseOrderSummary,
+    QCReportCreate, QCReportUpdate, QCReportResponse, QCReportSummary,
+    ReceiptCreate, ReceiptResponse,
+    ProcurementStatsResponse, BulkImportResponse, BulkUpsertResponse,
+    SupplierPerformance, MonthlyPerformance, ProductPerformance,
+    SupplierTypeEnum, PurchaseOrderStatusEnum, ReceiptTypeEnum
 )
-from crud import procurement as crud
+from crud import async_procurement as crud
+from crud import bulk, documents, exports
+from crud.documents import document_renderer
+from crud.pagination import next_cursor
+from routes.admission import write_admission
+from routes.caching import conditional_json
+from routes.documents import document_response
+from routes.serialization import FAST_JSON, JsonSerializer, sparse_serializer
 
-router = APIRouter(prefix="/api/procurement", tags=["Procurement"])
+router = APIRouter(prefix="/api/procurement", tags=["Procurement"], route_class=metrics.MetricsRoute)
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+# Write routes queue for a slot of their own (WRITE_CONCURRENCY), so a burst of writes cannot starve the reads
+WRITE_ADMISSION = [Depends(write_admission)]
+
+# Serializers for the GET routes, which build their JSON bodies themselves (see JsonSerializer)
+SUPPLIER_JSON = JsonSerializer(SupplierResponse)
+SUPPLIER_LIST_JSON = JsonSerializer(SupplierResponse, many=True)
+SUPPLIER_OVERVIEW_JSON = JsonSerializer(SupplierOverview)
+SUPPLIER_OVERVIEW_SUMMARY_JSON = JsonSerializer(SupplierOverviewSummary)
+PRODUCT_JSON = JsonSerializer(ProductResponse)
+PRODUCT_LIST_JSON = JsonSerializer(ProductResponse, many=True)
+PURCHASE_ORDER_JSON = JsonSerializer(PurchaseOrderResponse)
+PURCHASE_ORDER_LIST_JSON = JsonSerializer(PurchaseOrderResponse, many=True)
+QC_REPORT_JSON = JsonSerializer(QCReportResponse)
+QC_REPORT_LIST_JSON = JsonSerializer(QCReportResponse, many=True)
+PURCHASE_ORDER_SUMMARY_LIST_JSON = JsonSerializer(PurchaseOrderSummary, many=True)
+QC_REPORT_SUMMARY_LIST_JSON = JsonSerializer(QCReportSummary, many=True)
+RECEIPT_JSON = JsonSerializer(ReceiptResponse)
+RECEIPT_LIST_JSON = JsonSerializer(ReceiptResponse, many=True)
+SUPPLIER_PERFORMANCE_JSON = JsonSerializer(SupplierPerformance, many=True)
+MONTHLY_PERFORMANCE_JSON = JsonSerializer(MonthlyPerformance, many=True)
+PRODUCT_PERFORMANCE_JSON = JsonSerializer(ProductPerformance, many=True)
+
+async def _fetch_page(fetch, limit: int):
+    """Await a list query, returning its rows and the keyset cursor headers for the following page"""
+    try:
+        rows = await fetch
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    cursor = next_cursor(rows, limit)
+    return rows, {NEXT_CURSOR_HEADER: cursor} if cursor else {}
+
+async def _paged(response: Response, fetch, limit: int, serializer: JsonSerializer):
+    """Await a list query and expose the keyset cursor for the following page"""
+    rows, headers = await _fetch_page(fetch, limit)
+    if FAST_JSON:
+        return serializer.response(rows, headers)
+    response.headers.update(headers)
+    return rows
+
+def _projection(view: Optional[str], fields: Optional[str]) -> Optional[tuple]:
+    """Field names asked for by ?fields= (always with id), () for ?view=summary, None for the full view"""
+    if fields:
+        names = [name.strip() for name in fields.split(",") if name.strip()]
+        return tuple(dict.fromkeys(["id", *names]))
+    if view in (None, "full"):
+        return None
+    if view == "summary":
+        return ()
+    raise HTTPException(status_code=400, detail="view must be full or summary")
+
+async def _projected(fetch, limit: int, fields: tuple, schema: type, summary: JsonSerializer):
+    """Await a column-level list query and encode it with the summary schema or the requested fields"""
+    rows, headers = await _fetch_page(fetch, limit)
+    serializer = sparse_serializer(schema, fields) if fields else summary
+    return serializer.response(rows, headers)
+
+def _render(row, serializer: JsonSerializer):
+    """Return a row for response_model, or its pre-encoded body on the FAST_JSON path"""
+    return serializer.response(row) if FAST_JSON else row
+
+def _export(request: Request, stmt, fmt: str, name: str):
+    """Stream an export statement as a CSV or NDJSON download"""
+    if fmt not in exports.EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail="Export format must be csv or ndjson")
+    return StreamingResponse(
+        exports.stream_export(read_session_factory(request), stmt, fmt),
+        media_type=exports.EXPORT_MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{name}.{fmt}"'}
+    )
+
+async def _searched(fetch):
+    """Await a search query for conditional_json, turning bad parameters into a 400"""
+    try:
+        return await fetch, {}
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+async def _found(fetch, detail: str):
+    """Await a single-row query, raising 404 when it finds nothing"""
+    row = await fetch
+    if not row:
+        raise HTTPException(status_code=404, detail=detail)
+    return row, {}
+
+# ==================== STATS ROUTES ====================
+@router.get("/stats", response_model=ProcurementStatsResponse)
+async def get_stats(db: Session = Depends(get_read_db)):
+    """Get dashboard counts and totals from the maintained counters"""
+    return await crud.get_stats(db)
 
 # ==================== SUPPLIER ROUTES ====================
-@router.post("/suppliers", response_model=SupplierResponse, status_code=status.HTTP_201_CREATED)
-def create_supplier(supplier: SupplierCreate, db: Session = Depends(get_db)):
+@router.post("/suppliers", response_model=SupplierResponse, status_code=status.HTTP_201_CREATED,
+             dependencies=WRITE_ADMISSION)
+async def create_supplier(supplier: SupplierCreate, db: Session = Depends(get_db)):
     """Create a new supplier (local or import)"""
     try:
-        return crud.create_supplier(db, supplier)
+        return await crud.create_supplier(db, supplier)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.post("/suppliers/bulk-upsert", response_model=BulkUpsertResponse, dependencies=WRITE_ADMISSION)
+async def bulk_upsert_suppliers(suppliers: List[SupplierCreate], batch_size: int = 1000, db: Session = Depends(get_db)):
+    """Create or update suppliers by name, e.g. for a nightly ERP sync"""
+    try:
+        return await crud.upsert_suppliers(db, suppliers, batch_size=batch_size)
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 @router.get("/suppliers", response_model=List[SupplierResponse])
-def get_suppliers(
+async def get_suppliers(
+    request: Request,
     skip: int = 0, 
     limit: int = 100, 
     supplier_type: Optional[str] = None,
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_read_db)
 ):
-    """Get all suppliers with optional filtering by type"""
-    return crud.get_suppliers(db, skip=skip, limit=limit, supplier_type=supplier_type)
+    """Get all suppliers with optional filtering by type (ETag / If-None-Match aware)"""
+    version = await crud.get_table_version(db, "suppliers")
+    return await conditional_json(request, "suppliers", version, SUPPLIER_LIST_JSON, lambda: _fetch_page(
+        crud.get_suppliers(db, skip=skip, limit=limit, supplier_type=supplier_type, cursor=cursor), limit
+    ))
+
+@router.get("/suppliers/search", response_model=List[SupplierResponse])
+async def search_suppliers(
+    request: Request,
+    q: str = "",
+    limit: int = 10,
+    supplier_type: Optional[SupplierTypeEnum] = None,
+    db: Session = Depends(get_read_db)
+):
+    """Best-ranked suppliers whose name or contact person words start with the words of `q`"""
+    version = await crud.get_table_version(db, "suppliers")
+    return await conditional_json(request, "suppliers", version, SUPPLIER_LIST_JSON, lambda: _searched(
+        crud.search_suppliers(db, q, limit=limit, supplier_type=supplier_type)
+    ))
 
 @router.get("/suppliers/{supplier_id}", response_model=SupplierResponse)
-def get_supplier(supplier_id: int, db: Session = Depends(get_db)):
-    """Get a specific supplier by ID"""
-    supplier = crud.get_supplier(db, supplier_id)
-    if not supplier:
+async def get_supplier(request: Request, supplier_id: int, db: Session = Depends(get_read_db)):
+    """Get a specific supplier by ID (ETag / If-None-Match aware)"""
+    version = await crud.get_table_version(db, "suppliers")
+    return await conditional_json(request, "suppliers", version, SUPPLIER_JSON, lambda: _found(
+        crud.get_supplier(db, supplier_id), "Supplier not found"
+    ))
+
+@router.get("/suppliers/{supplier_id}/overview", response_model=SupplierOverview)
+async def get_supplier_overview(
+    response: Response,
+    supplier_id: int,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    view: Optional[str] = None,
+    db: Session = Depends(get_read_db)
+):
+    """Supplier with a page of its purchase orders, their items and QC reports in a fixed number of queries;
+    ?view=summary returns the POs as summary rows with their stored aggregates instead"""
+    summary = _projection(view, None) is not None
+    try:
+        overview = await crud.get_supplier_overview(
+            db, supplier_id, skip=skip, limit=limit, cursor=cursor, summary=summary
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if not overview:
         raise HTTPException(status_code=404, detail="Supplier not found")
-    return supplier
+    cursor = next_cursor(overview.purchase_orders, limit)
+    headers = {NEXT_CURSOR_HEADER: cursor} if cursor else {}
+    if summary:
+        return SUPPLIER_OVERVIEW_SUMMARY_JSON.response(overview, headers)
+    if FAST_JSON:
+        return SUPPLIER_OVERVIEW_JSON.response(overview, headers)
+    response.headers.update(headers)
+    return overview
 
-@router.put("/suppliers/{supplier_id}", response_model=SupplierResponse)
-def update_supplier(supplier_id: int, supplier: SupplierUpdate, db: Session = Depends(get_db)):
+@router.put("/suppliers/{supplier_id}", response_model=SupplierResponse, dependencies=WRITE_ADMISSION)
+async def update_supplier(supplier_id: int, supplier: SupplierUpdate, db: Session = Depends(get_db)):
     """Update a supplier"""
-    updated_supplier = crud.update_supplier(db, supplier_id, supplier)
+    updated_supplier = await crud.update_supplier(db, supplier_id, supplier)
     if not updated_supplier:
         raise HTTPException(status_code=404, detail="Supplier not found")
     return updated_supplier
 
-@router.delete("/suppliers/{supplier_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_supplier(supplier_id: int, db: Session = Depends(get_db)):
+@router.delete("/suppliers/{supplier_id}", status_code=status.HTTP_204_NO_CONTENT, dependencies=WRITE_ADMISSION)
+async def delete_supplier(supplier_id: int, db: Session = Depends(get_db)):
     """Delete a supplier"""
-    if not crud.delete_supplier(db, supplier_id):
+    if not await crud.delete_supplier(db, supplier_id):
         raise HTTPException(status_code=404, detail="Supplier not found")
 
 # ==================== PRODUCT ROUTES ====================
-@router.post("/products", response_model=ProductResponse, status_code=status.HTTP_201_CREATED)
-def create_product(product: ProductCreate, db: Session = Depends(get_db)):
+@router.post("/products", response_model=ProductResponse, status_code=status.HTTP_201_CREATED,
+             dependencies=WRITE_ADMISSION)
+async def create_product(product: ProductCreate, db: Session = Depends(get_db)):
     """Create a new product"""
     try:
-        return crud.create_product(db, product)
+        return await crud.create_product(db, product)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.post("/products/bulk-upsert", response_model=BulkUpsertResponse, dependencies=WRITE_ADMISSION)
+async def bulk_upsert_products(products: List[ProductCreate], batch_size: int = 1000, db: Session = Depends(get_db)):
+    """Create or update products by name, e.g. for a nightly ERP sync"""
+    try:
+        return await crud.upsert_products(db, products, batch_size=batch_size)
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 @router.get("/products", response_model=List[ProductResponse])
-def get_products(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    """Get all products"""
-    return crud.get_products(db, skip=skip, limit=limit)
+async def get_products(
+    request: Request,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_read_db)
+):
+    """Get all products (ETag / If-None-Match aware)"""
+    version = await crud.get_table_version(db, "products")
+    return await conditional_json(request, "products", version, PRODUCT_LIST_JSON, lambda: _fetch_page(
+        crud.get_products(db, skip=skip, limit=limit, cursor=cursor), limit
+    ))
+
+@router.get("/products/search", response_model=List[ProductResponse])
+async def search_products(request: Request, q: str = "", limit: int = 10, db: Session = Depends(get_read_db)):
+    """Best-ranked products whose name, description, manufacturer or HS code words start with the words of `q`"""
+    version = await crud.get_table_version(db, "products")
+    return await conditional_json(request, "products", version, PRODUCT_LIST_JSON, lambda: _searched(
+        crud.search_products(db, q, limit=limit)
+    ))
 
 @router.get("/products/{product_id}", response_model=ProductResponse)
-def get_product(product_id: int, db: Session = Depends(get_db)):
-    """Get a specific product by ID"""
-    product = crud.get_product(db, product_id)
-    if not product:
-        raise HTTPException(status_code=404, detail="Product not found")
-    return product
+async def get_product(request: Request, product_id: int, db: Session = Depends(get_read_db)):
+    """Get a specific product by ID (ETag / If-None-Match aware)"""
+    version = await crud.get_table_version(db, "products")
+    return await conditional_json(request, "products", version, PRODUCT_JSON, lambda: _found(
+        crud.get_product(db, product_id), "Product not found"
+    ))
 
-@router.put("/products/{product_id}", response_model=ProductResponse)
-def update_product(product_id: int, product: ProductUpdate, db: Session = Depends(get_db)):
+@router.put("/products/{product_id}", response_model=ProductResponse, dependencies=WRITE_ADMISSION)
+async def update_product(product_id: int, product: ProductUpdate, db: Session = Depends(get_db)):
     """Update a product"""
-    updated_product = crud.update_product(db, product_id, product)
+    updated_product = await crud.update_product(db, product_id, product)
     if not updated_product:
         raise HTTPException(status_code=404, detail="Product not found")
     return updated_product
 
-@router.delete("/products/{product_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_product(product_id: int, db: Session = Depends(get_db)):
+@router.delete("/products/{product_id}", status_code=status.HTTP_204_NO_CONTENT, dependencies=WRITE_ADMISSION)
+async def delete_product(product_id: int, db: Session = Depends(get_db)):
     """Delete a product"""
-    if not crud.delete_product(db, product_id):
+    if not await crud.delete_product(db, product_id):
         raise HTTPException(status_code=404, detail="Product not found")
 
 # ==================== PURCHASE ORDER ROUTES ====================
-@router.post("/purchase-orders/local", response_model=PurchaseOrderResponse, status_code=status.HTTP_201_CREATED)
-def create_local_purchase_order(po: LocalPurchaseOrderCreate, db: Session = Depends(get_db)):
+@router.post("/purchase-orders/local", response_model=PurchaseOrderResponse, status_code=status.HTTP_201_CREATED,
+             dependencies=WRITE_ADMISSION)
+async def create_local_purchase_order(po: LocalPurchaseOrderCreate, db: Session = Depends(get_db)):
     """Create a new local purchase order"""
     try:
-        return crud.create_local_purchase_order(db, po)
+        created = await crud.create_local_purchase_order(db, po)
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
+    document_renderer.prerender(documents.PURCHASE_ORDER, created.id, created.updated_at)
+    return created
 
-@router.post("/purchase-orders/import", response_model=PurchaseOrderResponse, status_code=status.HTTP_201_CREATED)
-def create_import_purchase_order(po: ImportPurchaseOrderCreate, db: Session = Depends(get_db)):
+@router.post("/purchase-orders/import", response_model=PurchaseOrderResponse, status_code=status.HTTP_201_CREATED,
+             dependencies=WRITE_ADMISSION)
+async def create_import_purchase_order(po: ImportPurchaseOrderCreate, db: Session = Depends(get_db)):
     """Create a new import purchase order"""
     try:
-        return crud.create_import_purchase_order(db, po)
+        created = await crud.create_import_purchase_order(db, po)
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
+    document_renderer.prerender(documents.PURCHASE_ORDER, created.id, created.updated_at)
+    return created
+
+@router.post("/purchase-orders/bulk", response_model=BulkImportResponse, dependencies=WRITE_ADMISSION)
+async def bulk_import_purchase_orders(
+    file: UploadFile = File(...),
+    format: Optional[str] = None,
+    chunk_size: int = 100,
+    db: Session = Depends(get_db)
+):
+    """Import many purchase orders from a CSV or NDJSON upload, reporting per PO"""
+    fmt = format or bulk.detect_format(file.filename, file.content_type)
+    if fmt not in bulk.BULK_FORMATS:
+        raise HTTPException(status_code=400, detail="Upload must be CSV or NDJSON (pass ?format=csv|ndjson)")
+    try:
+        records = bulk.read_purchase_order_records(file.file, fmt)
+        imported = await crud.import_purchase_orders(db, records, chunk_size=chunk_size)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    for result in imported["results"]:
+        if result["status"] == "created":
+            document_renderer.prerender(documents.PURCHASE_ORDER, result["id"], None)
+    return imported
 
 @router.get("/purchase-orders", response_model=List[PurchaseOrderResponse])
-def get_purchase_orders(
+async def get_purchase_orders(
+    response: Response,
     skip: int = 0, 
     limit: int = 100,
     supplier_type: Optional[str] = None,
     status: Optional[str] = None,
-    db: Session = Depends(get_db)
+    supplier_id: Optional[int] = None,
+    cursor: Optional[str] = None,
+    view: Optional[str] = None,
+    fields: Optional[str] = None,
+    db: Session = Depends(get_read_db)
 ):
-    """Get all purchase orders with optional filtering"""
-    return crud.get_purchase_orders(db, skip=skip, limit=limit, supplier_type=supplier_type, status=status)
+    """Get all purchase orders with optional filtering; ?view=summary or ?fields= skip items and products"""
+    projection = _projection(view, fields)
+    if projection is not None:
+        return await _projected(crud.get_purchase_order_summaries(
+            db, skip=skip, limit=limit, supplier_type=supplier_type, status=status, cursor=cursor,
+            fields=projection, supplier_id=supplier_id
+        ), limit, projection, PurchaseOrderSummary, PURCHASE_ORDER_SUMMARY_LIST_JSON)
+    return await _paged(response, crud.get_purchase_orders(
+        db, skip=skip, limit=limit, supplier_type=supplier_type, status=status, cursor=cursor,
+        supplier_id=supplier_id
+    ), limit, PURCHASE_ORDER_LIST_JSON)
+
+@router.get("/purchase-orders/export")
+async def export_purchase_orders(
+    request: Request,
+    format: str = "csv",
+    supplier_type: Optional[SupplierTypeEnum] = None,
+    status: Optional[PurchaseOrderStatusEnum] = None
+):
+    """Stream every matching purchase order as CSV or NDJSON, one line per item"""
+    return _export(request, exports.purchase_order_export(supplier_type, status), format, "purchase-orders")
+
+@router.get("/purchase-orders/{po_id}/document")
+async def get_purchase_order_document(request: Request, po_id: int, format: str = "html",
+                                      db: Session = Depends(get_read_db)):
+    """Printable purchase order (HTML, or PDF with WeasyPrint installed) from the render cache"""
+    return await document_response(request, db, documents.PURCHASE_ORDER, po_id, format, "Purchase Order not found")
 
 @router.get("/purchase-orders/{po_id}", response_model=PurchaseOrderResponse)
-def get_purchase_order(po_id: int, db: Session = Depends(get_db)):
+async def get_purchase_order(po_id: int, db: Session = Depends(get_read_db)):
     """Get a specific purchase order by ID"""
-    po = crud.get_purchase_order(db, po_id)
+    po = await crud.get_purchase_order(db, po_id)
     if not po:
         raise HTTPException(status_code=404, detail="Purchase Order not found")
-    return po
+    return _render(po, PURCHASE_ORDER_JSON)
 
 # ==================== QC REPORT ROUTES ====================
-@router.post("/qc-reports", response_model=QCReportResponse, status_code=status.HTTP_201_CREATED)
-def create_qc_report(qc_report: QCReportCreate, db: Session = Depends(get_db)):
+@router.post("/qc-reports", response_model=QCReportResponse, status_code=status.HTTP_201_CREATED,
+             dependencies=WRITE_ADMISSION)
+async def create_qc_report(qc_report: QCReportCreate, db: Session = Depends(get_db)):
     """Create a QC report for a purchase order"""
     try:
-        return crud.create_qc_report(db, qc_report)
+        created = await crud.create_qc_report(db, qc_report)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    document_renderer.prerender(documents.QC_REPORT, created.id, created.updated_at)
+    # The PO's status changed with it
+    document_renderer.prerender(documents.PURCHASE_ORDER, created.purchase_order_id, None)
+    return created
+
+@router.post("/qc-reports/batch", response_model=List[QCReportResponse], status_code=status.HTTP_201_CREATED,
+             dependencies=WRITE_ADMISSION)
+async def create_qc_reports(qc_reports: List[QCReportCreate], db: Session = Depends(get_db)):
+    """Create many QC reports in one transaction, e.g. the QC lab's end-of-shift upload"""
+    try:
+        created = await crud.create_qc_reports(db, qc_reports)
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
+    for qc_report in created:
+        document_renderer.prerender(documents.QC_REPORT, qc_report.id, qc_report.updated_at)
+    for po_id in {qc_report.purchase_order_id for qc_report in created}:
+        document_renderer.prerender(documents.PURCHASE_ORDER, po_id, None)
+    return created
 
 @router.get("/qc-reports", response_model=List[QCReportResponse])
-def get_qc_reports(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    """Get all QC reports"""
-    return crud.get_qc_reports(db, skip=skip, limit=limit)
+async def get_qc_reports(
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    view: Optional[str] = None,
+    fields: Optional[str] = None,
+    db: Session = Depends(get_read_db)
+):
+    """Get all QC reports; ?view=summary or ?fields= skip the inspected items"""
+    projection = _projection(view, fields)
+    if projection is not None:
+        return await _projected(crud.get_qc_report_summaries(
+            db, skip=skip, limit=limit, cursor=cursor, fields=projection
+        ), limit, projection, QCReportSummary, QC_REPORT_SUMMARY_LIST_JSON)
+    return await _paged(
+        response, crud.get_qc_reports(db, skip=skip, limit=limit, cursor=cursor), limit, QC_REPORT_LIST_JSON
+    )
+
+@router.get("/qc-reports/export")
+async def export_qc_reports(request: Request, format: str = "csv"):
+    """Stream every QC report as CSV or NDJSON, one line per inspected item"""
+    return _export(request, exports.qc_report_export(), format, "qc-reports")
+
+@router.get("/qc-reports/{qc_id}/document")
+async def get_qc_report_document(request: Request, qc_id: int, format: str = "html",
+                                 db: Session = Depends(get_read_db)):
+    """Printable QC report from the render cache"""
+    return await document_response(request, db, documents.QC_REPORT, qc_id, format, "QC Report not found")
 
 @router.get("/qc-reports/{qc_id}", response_model=QCReportResponse)
-def get_qc_report(qc_id: int, db: Session = Depends(get_db)):
+async def get_qc_report(qc_id: int, db: Session = Depends(get_read_db)):
     """Get a specific QC report by ID"""
-    qc_report = crud.get_qc_report(db, qc_id)
+    qc_report = await crud.get_qc_report(db, qc_id)
     if not qc_report:
         raise HTTPException(status_code=404, detail="QC Report not found")
-    return qc_report
+    return _render(qc_report, QC_REPORT_JSON)
 
 @router.get("/qc-reports/by-po/{po_id}", response_model=QCReportResponse)
-def get_qc_report_by_po(po_id: int, db: Session = Depends(get_db)):
+async def get_qc_report_by_po(po_id: int, db: Session = Depends(get_read_db)):
     """Get QC report for a specific purchase order"""
-    qc_report = crud.get_qc_report_by_po(db, po_id)
+    qc_report = await crud.get_qc_report_by_po(db, po_id)
     if not qc_report:
         raise HTTPException(status_code=404, detail="QC Report not found for this Purchase Order")
-    return qc_report
+    return _render(qc_report, QC_REPORT_JSON)
 
 # ==================== RECEIPT ROUTES ====================
-@router.post("/receipts", response_model=ReceiptResponse, status_code=status.HTTP_201_CREATED)
-def create_receipt(receipt: ReceiptCreate, db: Session = Depends(get_db)):
+@router.post("/receipts", response_model=ReceiptResponse, status_code=status.HTTP_201_CREATED,
+             dependencies=WRITE_ADMISSION)
+async def create_receipt(receipt: ReceiptCreate, db: Session = Depends(get_db)):
     """Create a receipt (accepted or rejected items)"""
     try:
-        return crud.create_receipt(db, receipt)
+        created = await crud.create_receipt(db, receipt)
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
+    document_renderer.prerender(documents.RECEIPT, created.id, created.created_at)
+    return created
 
 @router.get("/receipts", response_model=List[ReceiptResponse])
-def get_receipts(
+async def get_receipts(
+    response: Response,
     skip: int = 0, 
     limit: int = 100,
     receipt_type: Optional[str] = None,
     po_id: Optional[int] = None,
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_read_db)
 ):
     """Get all receipts with optional filtering"""
-    return crud.get_receipts(db, skip=skip, limit=limit, receipt_type=receipt_type, po_id=po_id)
+    return await _paged(response, crud.get_receipts(
+        db, skip=skip, limit=limit, receipt_type=receipt_type, po_id=po_id, cursor=cursor
+    ), limit, RECEIPT_LIST_JSON)
+
+@router.get("/receipts/export")
+async def export_receipts(
+    request: Request,
+    format: str = "csv",
+    receipt_type: Optional[ReceiptTypeEnum] = None,
+    po_id: Optional[int] = None
+):
+    """Stream every matching receipt as CSV or NDJSON"""
+    return _export(request, exports.receipt_export(receipt_type, po_id), format, "receipts")
+
+@router.get("/receipts/{receipt_id}/document")
+async def get_receipt_document(request: Request, receipt_id: int, format: str = "html",
+                               db: Session = Depends(get_read_db)):
+    """Printable receipt from the render cache"""
+    return await document_response(request, db, documents.RECEIPT, receipt_id, format, "Receipt not found")
 
 @router.get("/receipts/{receipt_id}", response_model=ReceiptResponse)
-def get_receipt(receipt_id: int, db: Session = Depends(get_db)):
+async def get_receipt(receipt_id: int, db: Session = Depends(get_read_db)):
     """Get a specific receipt by ID"""
-    receipt = crud.get_receipt(db, receipt_id)
+    receipt = await crud.get_receipt(db, receipt_id)
     if not receipt:
         raise HTTPException(status_code=404, detail="Receipt not found")
-    return receipt
+    return _render(receipt, RECEIPT_JSON)
+
+# ==================== ANALYTICS ROUTES ====================
+# Read only the supplier_product_months rollups, never the PO or QC tables
+async def _analytics(fetch, serializer: JsonSerializer):
+    try:
+        rows = await fetch
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return serializer.response(rows)
+
+@router.get("/analytics/suppliers", response_model=List[SupplierPerformance])
+async def get_supplier_performance(
+    month_from: Optional[str] = None,
+    month_to: Optional[str] = None,
+    limit: int = 100,
+    db: Session = Depends(get_read_db)
+):
+    """Spend, accepted vs rejected value and rejection rate per supplier over a YYYY-MM range"""
+    return await _analytics(crud.get_supplier_performance(
+        db, month_from=month_from, month_to=month_to, limit=limit
+    ), SUPPLIER_PERFORMANCE_JSON)
+
+@router.get("/analytics/suppliers/{supplier_id}/monthly", response_model=List[MonthlyPerformance])
+async def get_supplier_monthly_performance(
+    supplier_id: int,
+    month_from: Optional[str] = None,
+    month_to: Optional[str] = None,
+    db: Session = Depends(get_read_db)
+):
+    """A supplier's figures month by month"""
+    return await _analytics(crud.get_supplier_monthly_performance(
+        db, supplier_id, month_from=month_from, month_to=month_to
+    ), MONTHLY_PERFORMANCE_JSON)
+
+@router.get("/analytics/suppliers/{supplier_id}/products", response_model=List[ProductPerformance])
+async def get_supplier_product_performance(
+    supplier_id: int,
+    month_from: Optional[str] = None,
+    month_to: Optional[str] = None,
+    db: Session = Depends(get_read_db)
+):
+    """A supplier's figures per product over a YYYY-MM range"""
+    return await _analytics(crud.get_supplier_product_performance(
+        db, supplier_id, month_from=month_from, month_to=month_to
+    ), PRODUCT_PERFORMANCE_JSON)
@@ -0,0 +1,102 @@
+import logging
+import os
+import types
+import typing
+from functools import lru_cache
+from typing import List, Optional
+
+from fastapi import Response
+from pydantic import BaseModel, ConfigDict, TypeAdapter, create_model
+
+# orjson is optional; without it FAST_JSON falls back to the Pydantic path
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+logger = logging.getLogger("uvicorn.error")
+
+# Opt-in: encode GET responses straight from ORM rows instead of validating them into response models
+FAST_JSON = os.getenv("FAST_JSON", "false").lower() in ("1", "true", "yes")
+if FAST_JSON and orjson is None:
+    logger.warning("FAST_JSON is set but orjson is not installed; using Pydantic serialization")
+    FAST_JSON = False
+
+
+def _unwrap_optional(annotation):
+    if typing.get_origin(annotation) in (typing.Union, types.UnionType):
+        args = [arg for arg in typing.get_args(annotation) if arg is not type(None)]
+        if len(args) == 1:
+            return args[0]
+    return annotation
+
+def _field_reader(annotation):
+    """Value converter for one schema field, or None when the ORM value can be emitted as-is"""
+    annotation = _unwrap_optional(annotation)
+    if typing.get_origin(annotation) in (list, List):
+        (item,) = typing.get_args(annotation)
+        convert = _field_reader(item)
+        if convert is None:
+            return None
+        return lambda values: [convert(value) for value in values]
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        dump = row_dumper(annotation)
+        return lambda value: None if value is None else dump(value)
+    if annotation is float:
+        # Float columns can hand back ints; Pydantic renders those as 1.0, so do the same
+        return lambda value: None if value is None else float(value)
+    return None
+
+def row_dumper(schema: type):
+    """Compile a function mapping an ORM row onto a plain dict with the fields of `schema`.
+
+    Nested models and lists of models recurse; enums and datetimes are left to
+    orjson, which renders them the way Pydantic does.
+    """
+    fields = [(name, _field_reader(field.annotation)) for name, field in schema.model_fields.items()]
+
+    def dump(row) -> dict:
+        return {
+            name: getattr(row, name) if convert is None else convert(getattr(row, name))
+            for name, convert in fields
+        }
+    return dump
+
+
+class JsonSerializer:
+    """Encode rows (or one row) as the JSON body of `schema` responses.
+
+    The default path validates the ORM rows into `schema` and dumps them,
+    which is what `response_model` does. With FAST_JSON the rows are read
+    straight into dicts and encoded by orjson, skipping model construction.
+    """
+
+    def __init__(self, schema: type, many: bool = False):
+        self.many = many
+        self.adapter = TypeAdapter(List[schema] if many else schema)
+        self.dump_row = row_dumper(schema)
+
+    def pydantic(self, content) -> bytes:
+        return self.adapter.dump_json(self.adapter.validate_python(content, from_attributes=True))
+
+    def fast(self, content) -> bytes:
+        if self.many:
+            return orjson.dumps([self.dump_row(row) for row in content])
+        return orjson.dumps(self.dump_row(content))
+
+    def dump(self, content) -> bytes:
+        return self.fast(content) if FAST_JSON else self.pydantic(content)
+
+    def response(self, content, headers: Optional[dict] = None) -> Response:
+        return Response(content=self.dump(content), media_type="application/json", headers=headers)
+
+
+@lru_cache(maxsize=128)
+def sparse_serializer(schema: type, fields: tuple) -> JsonSerializer:
+    """List serializer for a subset of `schema`'s fields (?fields=), built once per field set"""
+    sparse = create_model(
+        f"{schema.__name__}Fields",
+        __config__=ConfigDict(from_attributes=True),
+        **{name: (schema.model_fields[name].annotation, schema.model_fields[name]) for name in fields}
+    )
+    return JsonSerializer(sparse, many=True)
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Optional, List
+from typing import Optional, List, Dict
 from datetime import datetime
 from enum import Enum
 
@@ -116,7 +116,8 @@ class ImportPurchaseOrderCreate(BaseModel):
     validity_indent: Optional[str] = None
     items: List[PurchaseOrderItemCreate]
 
-class PurchaseOrderResponse(BaseModel):
+# PO with its items; PurchaseOrderResponse adds the supplier
+class PurchaseOrderDetail(BaseModel):
     id: int
     po_number: str
     supplier_id: int
@@ -136,15 +137,54 @@ class PurchaseOrderResponse(BaseModel):
     tax: Optional[float] = None
     
     total_amount: float
+    # Maintained on write (see crud.procurement PO AGGREGATES)
+    item_count: int = 0
+    total_qty: float = 0.0
+    accepted_value: float = 0.0
+    rejected_value: float = 0.0
+    has_accepted_receipt: bool = False
+    has_rejected_receipt: bool = False
     created_at: datetime
     updated_at: datetime
     
-    supplier: SupplierResponse
     items: List[PurchaseOrderItemResponse]
     
     class Config:
         from_attributes = True
 
+class PurchaseOrderResponse(PurchaseOrderDetail):
+    supplier: SupplierResponse
+
+# Header columns only, for list views (?view=summary / ?fields=)
+class PurchaseOrderSummary(BaseModel):
+    id: int
+    po_number: str
+    supplier_id: int
+    supplier_name: str
+    supplier_type: SupplierTypeEnum
+    status: PurchaseOrderStatusEnum
+    payment_terms: Optional[str] = None
+    origin: Optional[str] = None
+    payment_type: Optional[PaymentTypeEnum] = None
+    dispatched_from: Optional[str] = None
+    dispatched_in: Optional[str] = None
+    validity_indent: Optional[str] = None
+    station: Optional[str] = None
+    tax: Optional[float] = None
+    total_amount: float
+    # Maintained on write (see crud.procurement PO AGGREGATES)
+    item_count: int = 0
+    total_qty: float = 0.0
+    accepted_value: float = 0.0
+    rejected_value: float = 0.0
+    has_accepted_receipt: bool = False
+    has_rejected_receipt: bool = False
+    created_at: datetime
+    updated_at: datetime
+    
+    class Config:
+        from_attributes = True
+
 # QC Report Item Schemas
 class QCReportItemCreate(BaseModel):
     po_item_id: int
@@ -199,6 +239,44 @@ class QCReportResponse(BaseModel):
     class Config:
         from_attributes = True
 
+class QCReportSummary(BaseModel):
+    id: int
+    purchase_order_id: int
+    qc_report_number: str
+    inspector_name: Optional[str] = None
+    inspection_date: datetime
+    remarks: Optional[str] = None
+    total_accepted_qty: float
+    total_rejected_qty: float
+    total_accepted_value: float
+    total_rejected_value: float
+    created_at: datetime
+    updated_at: datetime
+    
+    class Config:
+        from_attributes = True
+
+# Supplier detail page: the supplier once, then its POs with their QC reports
+class SupplierPurchaseOrder(PurchaseOrderDetail):
+    qc_report: Optional[QCReportResponse] = None
+
+class SupplierOverview(BaseModel):
+    supplier: SupplierResponse
+    purchase_order_count: int
+    purchase_orders: List[SupplierPurchaseOrder]
+    
+    class Config:
+        from_attributes = True
+
+# ?view=summary: the POs as summary rows with their stored aggregates
+class SupplierOverviewSummary(BaseModel):
+    supplier: SupplierResponse
+    purchase_order_count: int
+    purchase_orders: List[PurchaseOrderSummary]
+    
+    class Config:
+        from_attributes = True
+
 # Receipt Schemas
 class ReceiptCreate(BaseModel):
     purchase_order_id: int
@@ -220,3 +298,63 @@ class ReceiptResponse(BaseModel):
     
     class Config:
         from_attributes = True
+
+
+# Stats Schemas
+class ProcurementStatsResponse(BaseModel):
+    suppliers: int
+    products: int
+    purchase_orders: int
+    qc_reports: int
+    receipts: int
+    total_spend: float
+    spend_by_supplier_type: Dict[str, float]
+    purchase_orders_by_status: Dict[str, int]
+    accepted_value: float
+    rejected_value: float
+
+# Analytics Schemas
+class PerformanceFigures(BaseModel):
+    order_lines: int
+    ordered_qty: float
+    spend: float
+    inspected_lines: int
+    rejected_lines: int
+    accepted_qty: float
+    rejected_qty: float
+    accepted_value: float
+    rejected_value: float
+    rejection_rate: float  # rejected share of the inspected quantity
+    
+    class Config:
+        from_attributes = True
+
+class SupplierPerformance(PerformanceFigures):
+    supplier_id: int
+    supplier_name: str
+
+class MonthlyPerformance(PerformanceFigures):
+    month: str  # YYYY-MM
+
+class ProductPerformance(PerformanceFigures):
+    product_id: int
+    product_name: str
+
+# Bulk Import Schemas
+class BulkImportRowResult(BaseModel):
+    line: int
+    ref: Optional[str] = None
+    status: str  # "created" or "error"
+    id: Optional[int] = None
+    po_number: Optional[str] = None
+    error: Optional[str] = None
+
+class BulkImportResponse(BaseModel):
+    created: int
+    failed: int
+    results: List[BulkImportRowResult]
+
+class BulkUpsertResponse(BaseModel):
+    created: int
+    updated: int
+    unchanged: int
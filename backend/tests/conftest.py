@@ -0,0 +1,66 @@
+import itertools
+import os
+import tempfile
+
+import pytest
+
+# Settings are read when the app modules are imported, so point them at a scratch database first
+SCRATCH_DIR = tempfile.mkdtemp(prefix="pharma-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(SCRATCH_DIR, 'test.db')}"
+os.environ["AUTO_MIGRATE"] = "true"
+os.environ["DOCUMENT_CACHE_DIR"] = os.path.join(SCRATCH_DIR, "document_cache")
+os.environ["DOCUMENT_PRERENDER"] = "false"
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+API = "/api/procurement"
+
+_names = itertools.count(1)
+
+
+@pytest.fixture(scope="session")
+def client():
+    from main import app
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def supplier(client):
+    response = client.post(f"{API}/suppliers", json={"name": f"Supplier {next(_names)}", "supplier_type": "local"})
+    assert response.status_code == 201, response.text
+    return response.json()
+
+
+@pytest.fixture
+def product(client):
+    response = client.post(f"{API}/products", json={"name": f"Product {next(_names)}"})
+    assert response.status_code == 201, response.text
+    return response.json()
+
+
+def create_purchase_order(client, supplier_id: int, product_id: int, items: int = 2) -> dict:
+    response = client.post(f"{API}/purchase-orders/local", json={
+        "supplier_id": supplier_id,
+        "items": [{"product_id": product_id, "sn": sn, "quantity": 10, "rate": 2.5} for sn in range(1, items + 1)],
+    })
+    assert response.status_code == 201, response.text
+    return response.json()
+
+
+def create_qc_report(client, po: dict) -> dict:
+    response = client.post(f"{API}/qc-reports", json={
+        "purchase_order_id": po["id"],
+        "items": [
+            {"po_item_id": item["id"], "status": "accepted", "accepted_qty": item["quantity"] - 1, "rejected_qty": 1}
+            for item in po["items"]
+        ],
+    })
+    assert response.status_code == 201, response.text
+    return response.json()
+
+
+def create_receipt(client, po: dict, receipt_type: str = "accepted") -> dict:
+    response = client.post(f"{API}/receipts", json={"purchase_order_id": po["id"], "receipt_type": receipt_type})
+    assert response.status_code == 201, response.text
+    return response.json()
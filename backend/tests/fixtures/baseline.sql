@@ -0,0 +1,137 @@
+BEGIN TRANSACTION;
+CREATE TABLE products (
+	id INTEGER NOT NULL, 
+	name VARCHAR NOT NULL, 
+	description TEXT, 
+	manufacturer VARCHAR, 
+	hs_code VARCHAR, 
+	created_at DATETIME, 
+	updated_at DATETIME, 
+	PRIMARY KEY (id)
+);
+INSERT INTO "products" VALUES(1,'Paracetamol API',NULL,'Acme',NULL,'2026-10-17 07:09:11.888798','2026-10-17 07:09:11.888804');
+INSERT INTO "products" VALUES(2,'Lactose',NULL,NULL,NULL,'2026-10-17 07:09:11.898299','2026-10-17 07:09:11.898304');
+CREATE TABLE purchase_order_items (
+	id INTEGER NOT NULL, 
+	purchase_order_id INTEGER NOT NULL, 
+	product_id INTEGER NOT NULL, 
+	sn INTEGER, 
+	quantity FLOAT NOT NULL, 
+	rate FLOAT NOT NULL, 
+	total FLOAT NOT NULL, 
+	created_at DATETIME, 
+	PRIMARY KEY (id), 
+	FOREIGN KEY(purchase_order_id) REFERENCES purchase_orders (id), 
+	FOREIGN KEY(product_id) REFERENCES products (id)
+);
+INSERT INTO "purchase_order_items" VALUES(1,1,1,1,10.0,4.0,40.0,'2026-10-17 07:09:11.917539');
+INSERT INTO "purchase_order_items" VALUES(2,1,2,2,5.0,2.0,10.0,'2026-10-17 07:09:11.917542');
+INSERT INTO "purchase_order_items" VALUES(3,2,1,1,10.0,4.0,40.0,'2026-10-17 07:09:11.939871');
+INSERT INTO "purchase_order_items" VALUES(4,2,2,2,5.0,2.0,10.0,'2026-10-17 07:09:11.939875');
+INSERT INTO "purchase_order_items" VALUES(5,3,1,1,10.0,4.0,40.0,'2026-10-17 07:09:11.952851');
+INSERT INTO "purchase_order_items" VALUES(6,3,2,2,5.0,2.0,10.0,'2026-10-17 07:09:11.952853');
+CREATE TABLE purchase_orders (
+	id INTEGER NOT NULL, 
+	po_number VARCHAR NOT NULL, 
+	supplier_id INTEGER NOT NULL, 
+	supplier_type VARCHAR(6) NOT NULL, 
+	status VARCHAR(18), 
+	payment_terms VARCHAR, 
+	origin VARCHAR, 
+	payment_type VARCHAR(9), 
+	dispatched_from VARCHAR, 
+	dispatched_in VARCHAR, 
+	validity_indent VARCHAR, 
+	station VARCHAR, 
+	tax FLOAT, 
+	total_amount FLOAT, 
+	created_at DATETIME, 
+	updated_at DATETIME, 
+	PRIMARY KEY (id), 
+	FOREIGN KEY(supplier_id) REFERENCES suppliers (id)
+);
+INSERT INTO "purchase_orders" VALUES(1,'PO-20261017-0001',1,'LOCAL','PARTIALLY_REJECTED',NULL,NULL,NULL,NULL,NULL,NULL,NULL,10.0,55.0,'2026-10-17 07:09:11.915589','2026-10-17 07:09:11.975371');
+INSERT INTO "purchase_orders" VALUES(2,'PO-20261017-0002',2,'IMPORT','PARTIALLY_REJECTED',NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,50.0,'2026-10-17 07:09:11.939013','2026-10-17 07:09:11.994951');
+INSERT INTO "purchase_orders" VALUES(3,'PO-20261017-0003',1,'LOCAL','PENDING',NULL,NULL,NULL,NULL,NULL,NULL,NULL,NULL,50.0,'2026-10-17 07:09:11.952175','2026-10-17 07:09:11.952178');
+CREATE TABLE qc_report_items (
+	id INTEGER NOT NULL, 
+	qc_report_id INTEGER NOT NULL, 
+	po_item_id INTEGER NOT NULL, 
+	status VARCHAR(8) NOT NULL, 
+	accepted_qty FLOAT, 
+	rejected_qty FLOAT, 
+	accepted_value FLOAT, 
+	rejected_value FLOAT, 
+	rejection_reason TEXT, 
+	remarks TEXT, 
+	created_at DATETIME, 
+	PRIMARY KEY (id), 
+	FOREIGN KEY(qc_report_id) REFERENCES qc_reports (id), 
+	FOREIGN KEY(po_item_id) REFERENCES purchase_order_items (id)
+);
+INSERT INTO "qc_report_items" VALUES(1,1,1,'ACCEPTED',8.0,2.0,32.0,8.0,'damaged',NULL,'2026-10-17 07:09:11.978502');
+INSERT INTO "qc_report_items" VALUES(2,1,2,'ACCEPTED',5.0,0.0,10.0,0.0,NULL,NULL,'2026-10-17 07:09:11.978505');
+INSERT INTO "qc_report_items" VALUES(3,2,3,'REJECTED',0.0,10.0,0.0,40.0,NULL,NULL,'2026-10-17 07:09:11.996399');
+CREATE TABLE qc_reports (
+	id INTEGER NOT NULL, 
+	purchase_order_id INTEGER NOT NULL, 
+	qc_report_number VARCHAR NOT NULL, 
+	inspector_name VARCHAR, 
+	inspection_date DATETIME, 
+	remarks TEXT, 
+	total_accepted_qty FLOAT, 
+	total_rejected_qty FLOAT, 
+	total_accepted_value FLOAT, 
+	total_rejected_value FLOAT, 
+	created_at DATETIME, 
+	updated_at DATETIME, 
+	PRIMARY KEY (id), 
+	UNIQUE (purchase_order_id), 
+	FOREIGN KEY(purchase_order_id) REFERENCES purchase_orders (id)
+);
+INSERT INTO "qc_reports" VALUES(1,1,'QC-20261017-0001','QA','2026-10-17 07:09:11.976567',NULL,13.0,2.0,42.0,8.0,'2026-10-17 07:09:11.976570','2026-10-17 07:09:11.976571');
+INSERT INTO "qc_reports" VALUES(2,2,'QC-20261017-0002',NULL,'2026-10-17 07:09:11.995438',NULL,0.0,10.0,0.0,40.0,'2026-10-17 07:09:11.995441','2026-10-17 07:09:11.995442');
+CREATE TABLE receipts (
+	id INTEGER NOT NULL, 
+	receipt_number VARCHAR NOT NULL, 
+	purchase_order_id INTEGER NOT NULL, 
+	receipt_type VARCHAR(8) NOT NULL, 
+	total_quantity FLOAT, 
+	total_value FLOAT, 
+	generated_by VARCHAR, 
+	generated_date DATETIME, 
+	remarks TEXT, 
+	created_at DATETIME, 
+	PRIMARY KEY (id), 
+	FOREIGN KEY(purchase_order_id) REFERENCES purchase_orders (id)
+);
+INSERT INTO "receipts" VALUES(1,'RCP-ACC-20261017-0001',1,'ACCEPTED',13.0,42.0,NULL,'2026-10-17 07:09:12.018287',NULL,'2026-10-17 07:09:12.018290');
+INSERT INTO "receipts" VALUES(2,'RCP-REJ-20261017-0001',1,'REJECTED',2.0,8.0,NULL,'2026-10-17 07:09:12.030082',NULL,'2026-10-17 07:09:12.030085');
+INSERT INTO "receipts" VALUES(3,'RCP-REJ-20261017-0002',2,'REJECTED',10.0,40.0,NULL,'2026-10-17 07:09:12.039380',NULL,'2026-10-17 07:09:12.039383');
+CREATE TABLE suppliers (
+	id INTEGER NOT NULL, 
+	name VARCHAR NOT NULL, 
+	supplier_type VARCHAR(6) NOT NULL, 
+	contact_person VARCHAR, 
+	email VARCHAR, 
+	phone VARCHAR, 
+	address TEXT, 
+	created_at DATETIME, 
+	updated_at DATETIME, 
+	PRIMARY KEY (id)
+);
+INSERT INTO "suppliers" VALUES(1,'Baseline Local','LOCAL','Asha',NULL,NULL,NULL,'2026-10-17 07:09:11.868595','2026-10-17 07:09:11.868600');
+INSERT INTO "suppliers" VALUES(2,'Baseline Import','IMPORT',NULL,NULL,NULL,NULL,'2026-10-17 07:09:11.879861','2026-10-17 07:09:11.879865');
+CREATE INDEX ix_suppliers_id ON suppliers (id);
+CREATE UNIQUE INDEX ix_suppliers_name ON suppliers (name);
+CREATE INDEX ix_products_id ON products (id);
+CREATE UNIQUE INDEX ix_products_name ON products (name);
+CREATE INDEX ix_purchase_orders_id ON purchase_orders (id);
+CREATE UNIQUE INDEX ix_purchase_orders_po_number ON purchase_orders (po_number);
+CREATE INDEX ix_purchase_order_items_id ON purchase_order_items (id);
+CREATE INDEX ix_qc_reports_id ON qc_reports (id);
+CREATE UNIQUE INDEX ix_qc_reports_qc_report_number ON qc_reports (qc_report_number);
+CREATE INDEX ix_receipts_id ON receipts (id);
+CREATE UNIQUE INDEX ix_receipts_receipt_number ON receipts (receipt_number);
+CREATE INDEX ix_qc_report_items_id ON qc_report_items (id);
+COMMIT;
@@ -0,0 +1,60 @@
+from tests.conftest import API
+
+CSV_HEADER = "ref,supplier_type,supplier_id,product_id,quantity,rate\n"
+
+
+def test_malformed_csv_line_ends_the_import_with_a_report(client, supplier, product):
+    row = f"local,{supplier['id']},{product['id']},1,2\n"
+    oversized = f"local,{supplier['id']},{product['id']},1,\"{'x' * 200_000}\"\n"
+    upload = CSV_HEADER + "a," + row + "b," + row + "b," + oversized + "c," + row
+    # One PO per chunk, so the POs before the bad line are already committed when it is read
+    response = client.post(
+        f"{API}/purchase-orders/bulk", params={"format": "csv", "chunk_size": 1}, files={"file": ("pos.csv", upload)}
+    )
+    assert response.status_code == 200, response.text
+    report = response.json()
+    assert (report["created"], report["failed"]) == (1, 1)
+    created, unreadable = report["results"]
+    assert (created["line"], created["ref"], created["status"]) == (2, "a", "created")
+    # The PO the bad line interrupted is reported at its first line
+    assert (unreadable["line"], unreadable["ref"], unreadable["status"]) == (3, "b", "error")
+    assert "line 4" in unreadable["error"]
+
+
+def test_undecodable_ndjson_line_is_an_error_for_that_line_only(client, supplier, product):
+    po = (
+        f'{{"supplier_type": "local", "supplier_id": {supplier["id"]}, '
+        f'"items": [{{"product_id": {product["id"]}, "sn": 1, "quantity": 1, "rate": 1}}]}}\n'
+    ).encode()
+    response = client.post(
+        f"{API}/purchase-orders/bulk", params={"format": "ndjson"},
+        files={"file": ("pos.ndjson", po + b"\xff\xfe\n" + po)},
+    )
+    assert response.status_code == 200, response.text
+    assert [(result["line"], result["status"]) for result in response.json()["results"]] == [
+        (1, "created"), (2, "error"), (3, "created")
+    ]
+
+
+def test_csv_rows_sharing_a_ref_form_one_purchase_order(client, supplier, product):
+    upload = CSV_HEADER + "".join(
+        f"{ref},local,{supplier['id']},{product['id']},1,2\n" for ref in ("a", "a", "b")
+    )
+    response = client.post(f"{API}/purchase-orders/bulk?format=csv", files={"file": ("pos.csv", upload)})
+    assert response.status_code == 200, response.text
+    assert [(result["line"], result["status"]) for result in response.json()["results"]] == [
+        (2, "created"), (4, "created")
+    ]
+
+
+def test_bulk_upsert_treats_a_non_positive_batch_size_as_one(client):
+    products = [{"name": f"Batch size product {n}"} for n in range(3)]
+    for batch_size in (0, -5):
+        response = client.post(f"{API}/products/bulk-upsert", params={"batch_size": batch_size}, json=products)
+        assert response.status_code == 200, response.text
+        assert response.json() == (
+            {"created": 3, "updated": 0, "unchanged": 0} if batch_size == 0
+            else {"created": 0, "updated": 0, "unchanged": 3}
+        )
+    names = {product["name"] for product in client.get(f"{API}/products", params={"limit": 1000}).json()}
+    assert {product["name"] for product in products} <= names
@@ -0,0 +1,71 @@
+import os
+import time
+
+from crud import documents
+from tests.conftest import API, create_purchase_order
+
+
+def _cached_files(kind: str, doc_id: int):
+    directory = os.path.join(documents.DOCUMENT_CACHE_DIR, kind, str(doc_id))
+    return sorted(name for name in os.listdir(directory) if not name.endswith(".part"))
+
+
+def test_superseded_versions_are_evicted_after_the_grace_period(client, supplier, product, monkeypatch):
+    monkeypatch.setattr(documents, "DOCUMENT_EVICT_GRACE_SECONDS", 0.2)
+    po = create_purchase_order(client, supplier["id"], product["id"])
+    first = client.get(f"{API}/purchase-orders/{po['id']}/document")
+    assert first.status_code == 200
+    first_file = first.headers["etag"].strip('"') + ".html"
+    assert _cached_files(documents.PURCHASE_ORDER, po["id"]) == [first_file]
+
+    # Filing its QC report changes the PO's status, and so its version
+    response = client.post(f"{API}/qc-reports", json={
+        "purchase_order_id": po["id"],
+        "items": [{"po_item_id": item["id"], "status": "accepted", "accepted_qty": item["quantity"]}
+                  for item in po["items"]],
+    })
+    assert response.status_code == 201, response.text
+    second = client.get(f"{API}/purchase-orders/{po['id']}/document")
+    assert second.status_code == 200
+    assert second.headers["etag"] != first.headers["etag"]
+    second_file = second.headers["etag"].strip('"') + ".html"
+    # A download that looked up the first version just before can still open it
+    assert _cached_files(documents.PURCHASE_ORDER, po["id"]) == sorted([first_file, second_file])
+
+    # Any later render deletes what has become due
+    time.sleep(0.3)
+    other = create_purchase_order(client, supplier["id"], product["id"])
+    assert client.get(f"{API}/purchase-orders/{other['id']}/document").status_code == 200
+    assert _cached_files(documents.PURCHASE_ORDER, po["id"]) == [second_file]
+
+
+def test_batch_and_bulk_creates_are_prerendered(client, supplier, product, monkeypatch):
+    queued = []
+    monkeypatch.setattr(documents.document_renderer, "prerender", lambda kind, doc_id, version: queued.append((kind, doc_id)))
+
+    pos = [create_purchase_order(client, supplier["id"], product["id"]) for _ in range(2)]
+    queued.clear()
+    response = client.post(f"{API}/qc-reports/batch", json=[
+        {"purchase_order_id": po["id"],
+         "items": [{"po_item_id": item["id"], "status": "accepted", "accepted_qty": item["quantity"]}
+                   for item in po["items"]]}
+        for po in pos
+    ])
+    assert response.status_code == 201, response.text
+    assert sorted(queued) == sorted(
+        [(documents.QC_REPORT, qc["id"]) for qc in response.json()]
+        + [(documents.PURCHASE_ORDER, po["id"]) for po in pos]
+    )
+
+    queued.clear()
+    upload = "\n".join(
+        f'{{"ref": "r{n}", "supplier_type": "local", "supplier_id": {supplier["id"]}, '
+        f'"items": [{{"product_id": {product["id"]}, "sn": 1, "quantity": 1, "rate": 1}}]}}'
+        for n in range(3)
+    )
+    response = client.post(f"{API}/purchase-orders/bulk?format=ndjson", files={"file": ("pos.ndjson", upload)})
+    assert response.status_code == 200, response.text
+    assert response.json()["created"] == 3
+    assert sorted(queued) == sorted(
+        (documents.PURCHASE_ORDER, result["id"]) for result in response.json()["results"]
+    )
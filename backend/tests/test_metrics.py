@@ -0,0 +1,66 @@
+import re
+
+import pytest
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+import metrics
+from crud import procurement
+from crud.group_commit import GroupCommitSession, WritePipeline
+from database import write_engine
+from models.procurement import SupplierType
+from schemas.procurement import LocalPurchaseOrderCreate
+from tests.conftest import API
+
+
+def _samples(body: str, name: str) -> dict:
+    return {labels: float(value) for labels, value in re.findall(rf"^{name}\{{(.*)\}} (\S+)$", body, re.MULTILINE)}
+
+
+def test_requests_in_flight_are_labelled_by_route_template(client):
+    assert client.get(f"{API}/purchase-orders/999999").status_code == 404
+    in_flight = _samples(client.get("/metrics").text, "http_requests_in_flight")
+    assert in_flight['method="GET",route="/api/procurement/purchase-orders/{po_id}"'] == 0
+    # The scrape itself is being served
+    assert in_flight['method="GET",route="/metrics"'] == 1
+    assert not any('route="/api/procurement/purchase-orders/999999"' in labels for labels in in_flight)
+
+
+def test_pool_overflow_is_never_negative(client):
+    overflow = _samples(client.get("/metrics").text, "db_pool_overflow")
+    assert overflow
+    assert all(value >= 0 for value in overflow.values())
+
+
+class _FailingBatchSession(GroupCommitSession):
+    def commit_batch(self):
+        raise OperationalError("COMMIT", {}, Exception("disk I/O error"))
+
+
+def _pipeline(session_class) -> WritePipeline:
+    factory = sessionmaker(
+        bind=write_engine, class_=session_class, expire_on_commit=False, info={"group_commit": True}
+    )
+    return WritePipeline(factory, window_ms=0)
+
+
+def _local_pos_created() -> float:
+    key = ("procurement_purchase_orders_created_total", (("supplier_type", SupplierType.LOCAL.value),))
+    return metrics.registry.collect().get(key, 0.0)
+
+
+def test_pipelined_writes_are_counted_only_once_their_batch_commits(client, supplier, product):
+    po = LocalPurchaseOrderCreate(
+        supplier_id=supplier["id"], items=[{"product_id": product["id"], "sn": 1, "quantity": 1, "rate": 1}]
+    )
+    before = _local_pos_created()
+
+    failing = _pipeline(_FailingBatchSession)
+    with pytest.raises(OperationalError):
+        failing.submit(procurement.create_local_purchase_order, po).result(timeout=10)
+    assert _local_pos_created() == before
+
+    pipeline = _pipeline(GroupCommitSession)
+    created = pipeline.submit(procurement.create_local_purchase_order, po).result(timeout=10)
+    assert created.id
+    assert _local_pos_created() == before + 1
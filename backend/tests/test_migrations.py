@@ -0,0 +1,75 @@
+import os
+import sqlite3
+
+import pytest
+from sqlalchemy import inspect
+from sqlalchemy.orm import Session
+
+import migrations
+from crud.analytics import get_supplier_performance
+from crud.procurement import check_purchase_order_aggregates, get_stats
+from crud.search import search_products
+from database import build_engine
+from models.procurement import PurchaseOrder
+
+# Rows written by the pre-versioning app: its create_all schema, no schema_versions, counters, rollups or indexes
+BASELINE_SQL = os.path.join(os.path.dirname(__file__), "fixtures", "baseline.sql")
+
+
+@pytest.fixture
+def baseline(tmp_path):
+    path = tmp_path / "baseline.db"
+    with sqlite3.connect(path) as conn, open(BASELINE_SQL) as sql:
+        conn.executescript(sql.read())
+    bind = build_engine(f"sqlite:///{path}")
+    yield bind
+    bind.dispose()
+
+
+def test_baseline_database_is_refused_until_migrated(baseline, monkeypatch):
+    monkeypatch.setattr(migrations, "AUTO_MIGRATE", False)
+    assert migrations.schema_version(baseline) == 0
+    with pytest.raises(RuntimeError, match="manage.py migrate"):
+        migrations.check_schema(baseline)
+
+
+def test_migrating_the_baseline_database(baseline):
+    applied = migrations.migrate(baseline)
+    assert [m.version for m in applied] == [m.version for m in migrations.MIGRATIONS]
+    assert migrations.schema_version(baseline) == migrations.LATEST_VERSION
+    migrations.check_schema(baseline)
+
+    inspector = inspect(baseline)
+    indexed = {tuple(index["column_names"]) for index in inspector.get_indexes("purchase_order_items")}
+    assert ("purchase_order_id",) in indexed
+    columns = {column["name"] for column in inspector.get_columns("purchase_orders")}
+    assert set(migrations.PURCHASE_ORDER_AGGREGATES) <= columns
+
+    with Session(baseline) as db:
+        stats = get_stats(db)
+        assert (stats["suppliers"], stats["products"], stats["purchase_orders"]) == (2, 2, 3)
+        assert (stats["qc_reports"], stats["receipts"]) == (2, 3)
+        assert stats["total_spend"] == pytest.approx(55 + 50 + 50)
+
+        assert check_purchase_order_aggregates(db) == (0, [])
+        inspected = db.get(PurchaseOrder, 1)
+        assert (inspected.item_count, inspected.total_qty) == (2, 15)
+        assert (inspected.accepted_value, inspected.rejected_value) == (42, 8)
+        assert inspected.has_accepted_receipt and inspected.has_rejected_receipt
+
+        assert {row.supplier_name for row in get_supplier_performance(db)} == {"Baseline Local", "Baseline Import"}
+        assert [product.name for product in search_products(db, "parac")] == ["Paracetamol API"]
+
+
+def test_migrate_is_idempotent(baseline):
+    migrations.migrate(baseline)
+    with Session(baseline) as db:
+        before = get_stats(db)
+    assert migrations.migrate(baseline) == []
+    # Re-running every migration, as an interrupted run would, changes nothing either
+    with Session(baseline) as db:
+        for migration in migrations.MIGRATIONS:
+            migration.apply(db)
+            db.commit()
+        assert get_stats(db) == before
+        assert check_purchase_order_aggregates(db) == (0, [])
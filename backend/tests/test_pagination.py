@@ -0,0 +1,49 @@
+import pytest
+
+from tests.conftest import API, create_purchase_order
+
+NEXT_CURSOR = "X-Next-Cursor"
+
+
+def _walk(client, path: str, limit: int, **params) -> list:
+    """Ids of every row reached by following X-Next-Cursor from the first page"""
+    ids, cursor = [], None
+    while True:
+        response = client.get(f"{API}{path}", params={"limit": limit, **params, **({"cursor": cursor} if cursor else {})})
+        assert response.status_code == 200
+        ids += [row["id"] for row in response.json()]
+        cursor = response.headers.get(NEXT_CURSOR)
+        if not cursor:
+            return ids
+
+
+@pytest.fixture
+def purchase_orders(client, supplier, product):
+    return [create_purchase_order(client, supplier["id"], product["id"], items=1) for _ in range(12)]
+
+
+@pytest.mark.parametrize("params", [{}, {"view": "summary"}])
+def test_cursor_walk_matches_offset_listing(client, purchase_orders, params):
+    everything = client.get(f"{API}/purchase-orders", params={"limit": 10000, **params}).json()
+    walked = _walk(client, "/purchase-orders", limit=5, **params)
+    assert walked == [row["id"] for row in everything]
+    assert len(walked) == len(set(walked))
+
+
+def test_cursor_from_an_offset_page_continues_after_it(client, purchase_orders):
+    first = client.get(f"{API}/purchase-orders", params={"skip": 0, "limit": 4})
+    second = client.get(f"{API}/purchase-orders", params={"limit": 4, "cursor": first.headers[NEXT_CURSOR]})
+    offset = client.get(f"{API}/purchase-orders", params={"skip": 4, "limit": 4})
+    assert [row["id"] for row in second.json()] == [row["id"] for row in offset.json()]
+
+
+def test_last_page_has_no_cursor(client, purchase_orders):
+    response = client.get(f"{API}/purchase-orders", params={"limit": 100000})
+    assert NEXT_CURSOR not in response.headers
+
+
+@pytest.mark.parametrize("path", ["/suppliers", "/products", "/purchase-orders", "/qc-reports", "/receipts"])
+@pytest.mark.parametrize("cursor", ["not-a-cursor", "%%%", "eyJpZCI6ICJ4In0"])
+def test_malformed_cursor_is_a_400(client, path, cursor):
+    response = client.get(f"{API}{path}", params={"cursor": cursor})
+    assert response.status_code == 400
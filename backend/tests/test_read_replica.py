@@ -0,0 +1,49 @@
+import json
+import os
+import subprocess
+import sys
+
+import migrations
+from database import build_engine
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# The replica settings are read when the app is imported, so it runs in a process of its own. The replica is a
+# second SQLite file nothing replicates to: as far behind as a replica can be.
+CLIENTS = """
+import json
+from fastapi.testclient import TestClient
+from main import app
+
+API = "/api/procurement"
+with TestClient(app) as writer, TestClient(app) as stranger:
+    created = writer.post(f"{API}/suppliers", json={"name": "Replica Test Supplier", "supplier_type": "local"})
+    path = f"{API}/suppliers/{created.json()['id']}"
+    print(json.dumps({
+        "created": created.status_code,
+        "writer": writer.get(path).status_code,
+        "stranger": stranger.get(path).status_code,
+        "stranger_asking_for_primary": stranger.get(path, headers={"X-Read-Consistency": "primary"}).status_code,
+    }))
+"""
+
+
+def test_a_client_reads_its_own_writes_from_the_primary(tmp_path):
+    urls = {name: f"sqlite:///{tmp_path / name}.db" for name in ("primary", "replica")}
+    for url in urls.values():
+        bind = build_engine(url)
+        migrations.migrate(bind)
+        bind.dispose()
+
+    env = dict(
+        os.environ, DATABASE_URL=urls["primary"], READ_DATABASE_URL=urls["replica"],
+        DOCUMENT_CACHE_DIR=str(tmp_path / "documents"), DOCUMENT_PRERENDER="false",
+    )
+    env.pop("ASYNC_DATABASE_URL", None)
+    env.pop("ASYNC_READ_DATABASE_URL", None)
+    run = subprocess.run(
+        [sys.executable, "-c", CLIENTS], cwd=BACKEND_DIR, env=env, capture_output=True, text=True, timeout=120
+    )
+    assert run.returncode == 0, run.stderr
+    statuses = json.loads(run.stdout.strip().splitlines()[-1])
+    assert statuses == {"created": 201, "writer": 200, "stranger": 404, "stranger_asking_for_primary": 200}
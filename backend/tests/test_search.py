@@ -0,0 +1,42 @@
+from sqlalchemy import text
+
+from crud.procurement import PRODUCTS_COUNTER, PRODUCTS_VERSION, SUPPLIERS_COUNTER, SUPPLIERS_VERSION, bump_counters
+from database import SessionLocal
+from tests.conftest import API
+
+# Raw inserts (the FTS triggers index them all the same) are far faster than the routes for thousands of rows;
+# the tests bump the counters themselves, as bulk upserts do
+INSERT_SUPPLIER = text(
+    "INSERT INTO suppliers (name, supplier_type, created_at, updated_at) "
+    "VALUES (:name, :supplier_type, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)"
+)
+INSERT_PRODUCT = text(
+    "INSERT INTO products (name, description, created_at, updated_at) "
+    "VALUES (:name, :description, CURRENT_TIMESTAMP, CURRENT_TIMESTAMP)"
+)
+
+
+def test_supplier_type_filter_applies_before_the_limit(client):
+    # Far more local matches than the routes return, ranked level with the one import supplier
+    with SessionLocal() as db:
+        db.execute(INSERT_SUPPLIER, [{"name": f"Quasar {n}", "supplier_type": "LOCAL"} for n in range(2000)])
+        db.execute(INSERT_SUPPLIER, {"name": "Quasar Imports", "supplier_type": "IMPORT"})
+        bump_counters(db, {SUPPLIERS_COUNTER: 2001, SUPPLIERS_VERSION: 1})
+        db.commit()
+
+    response = client.get(f"{API}/suppliers/search", params={"q": "quasar", "supplier_type": "import"})
+    assert response.status_code == 200, response.text
+    assert [supplier["name"] for supplier in response.json()] == ["Quasar Imports"]
+
+
+def test_results_are_the_best_ranked_matches(client):
+    with SessionLocal() as db:
+        db.execute(INSERT_PRODUCT, [{"name": f"Generic {n}", "description": "nebula tablets"} for n in range(1500)])
+        db.execute(INSERT_PRODUCT, {"name": "Nebula 500", "description": None})
+        bump_counters(db, {PRODUCTS_COUNTER: 1501, PRODUCTS_VERSION: 1})
+        db.commit()
+
+    # The name is weighted above the description, so the last-inserted match ranks first
+    response = client.get(f"{API}/products/search", params={"q": "nebula", "limit": 1})
+    assert response.status_code == 200, response.text
+    assert [product["name"] for product in response.json()] == ["Nebula 500"]
@@ -0,0 +1,116 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import QueuePool
+
+from crud import procurement
+from crud.sequences import DocumentNumberAllocator, document_numbers
+from database import DATABASE_URL, SQLITE_WRITE_BEGIN, apply_sqlite_pragmas
+from schemas.procurement import LocalPurchaseOrderCreate
+
+
+def _bounded_sessions(pool_size: int):
+    engine = create_engine(
+        DATABASE_URL, poolclass=QueuePool, pool_size=pool_size, max_overflow=0, pool_timeout=10,
+        connect_args={"check_same_thread": False},
+    )
+    event.listen(engine, "connect", apply_sqlite_pragmas)
+    return engine, sessionmaker(bind=engine, autoflush=False)
+
+
+def test_concurrent_creates_fit_a_bounded_pool(supplier, product, monkeypatch):
+    # Every create reserves a block (size 1) while its session holds one of the pool's connections
+    monkeypatch.setattr(document_numbers, "block_size", 1)
+    engine, Session = _bounded_sessions(pool_size=4)
+    po = LocalPurchaseOrderCreate(
+        supplier_id=supplier["id"], items=[{"product_id": product["id"], "sn": 1, "quantity": 1, "rate": 1}]
+    )
+
+    def create(_):
+        with Session() as db:
+            return procurement.create_local_purchase_order(db, po).po_number
+
+    try:
+        with ThreadPoolExecutor(max_workers=16) as pool:
+            numbers = list(pool.map(create, range(64)))
+    finally:
+        engine.dispose()
+    assert len(set(numbers)) == 64
+
+
+def test_allocators_never_hand_out_the_same_number(supplier, product):
+    # Two allocators stand in for two worker processes sharing document_sequences
+    allocators = [DocumentNumberAllocator(block_size=3), DocumentNumberAllocator(block_size=3)]
+    engine, Session = _bounded_sessions(pool_size=8)
+    issued, lock = [], threading.Lock()
+
+    def allocate(index):
+        with Session() as db:
+            number = allocators[index % 2].next_number(db, "TST")
+        with lock:
+            issued.append(number)
+
+    try:
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            list(pool.map(allocate, range(200)))
+    finally:
+        engine.dispose()
+    assert len(issued) == len(set(issued)) == 200
+
+
+def test_new_day_sequence_starts_above_existing_numbers(client, supplier, product):
+    from database import SessionLocal
+    from models.procurement import PurchaseOrder
+    with SessionLocal() as db:
+        highest = max(po_number for (po_number,) in db.query(PurchaseOrder.po_number))
+    with SessionLocal() as db:
+        fresh = DocumentNumberAllocator().next_number(db, "PO", PurchaseOrder.po_number)
+    # A fresh allocator (e.g. a restarted worker) continues after the numbers already issued
+    assert fresh.rsplit("-", 1)[0] == highest.rsplit("-", 1)[0]
+    assert int(fresh.rsplit("-", 1)[1]) > int(highest.rsplit("-", 1)[1])
+
+
+@pytest.mark.skipif(SQLITE_WRITE_BEGIN == "DEFERRED", reason="DEFERRED sessions reserve on a connection of their own")
+def test_write_sessions_reserve_blocks_in_their_own_transaction(client):
+    from database import SessionLocal, write_engine
+    reservations = []
+
+    def count_reservations(conn, cursor, statement, parameters, context, executemany):
+        # Every reservation starts with this UPDATE (the first of a day then inserts the row)
+        if statement.lstrip().upper().startswith("UPDATE DOCUMENT_SEQUENCES"):
+            reservations.append(statement)
+
+    allocator = DocumentNumberAllocator(block_size=5)
+    event.listen(write_engine, "before_cursor_execute", count_reservations)
+    try:
+        numbers = []
+        for _ in range(2):
+            with SessionLocal() as db:
+                numbers += [allocator.next_number(db, "BLK"), allocator.next_number(db, "BLK")]
+                db.commit()
+        with SessionLocal() as db:
+            numbers.append(allocator.next_number(db, "BLK"))
+            db.commit()
+    finally:
+        event.remove(write_engine, "before_cursor_execute", count_reservations)
+    assert len(reservations) == 1
+    assert [int(number.rsplit("-", 1)[1]) for number in numbers] == [1, 2, 3, 4, 5]
+
+
+def test_a_rolled_back_block_is_never_served(client):
+    from database import SessionLocal
+    first, second = DocumentNumberAllocator(block_size=5), DocumentNumberAllocator(block_size=5)
+    with SessionLocal() as db:
+        first.next_number(db, "RBK")
+        db.rollback()
+    # The rollback released the reservation, so another worker reserves the same numbers
+    with SessionLocal() as db:
+        issued = [second.next_number(db, "RBK") for _ in range(5)]
+        db.commit()
+    with SessionLocal() as db:
+        again = first.next_number(db, "RBK")
+        db.commit()
+    assert again not in issued
@@ -0,0 +1,37 @@
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+import database
+
+
+@pytest.fixture
+def instrumented(tmp_path):
+    bind = database.build_engine(f"sqlite:///{tmp_path / 'instrumented.db'}")
+    database.instrument_engine(bind)
+    stats = database.RequestSQLStats({"method": "GET", "path": "/"})
+    token = database.request_sql_stats.set(stats)
+    yield bind, stats
+    database.request_sql_stats.reset(token)
+    bind.dispose()
+
+
+def test_failed_statements_leave_no_start_time_behind(instrumented):
+    bind, stats = instrumented
+    with bind.connect() as conn:
+        for _ in range(3):
+            with pytest.raises(OperationalError):
+                conn.execute(text("SELECT * FROM no_such_table"))
+        assert conn.info.get("statement_started") == []
+        counted = stats.count
+        conn.execute(text("SELECT 1"))
+        assert conn.info.get("statement_started") == []
+    assert stats.count == counted + 1
+
+
+def test_start_times_are_dropped_on_checkin(instrumented):
+    bind, _ = instrumented
+    with bind.connect() as conn:
+        conn.info["statement_started"] = [0.0]  # e.g. a statement cut short without an error event
+        record_info = conn.info
+    assert "statement_started" not in record_info
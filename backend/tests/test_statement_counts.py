@@ -0,0 +1,54 @@
+import pytest
+from sqlalchemy import event
+
+from database import engine, read_engine
+from tests.conftest import API, create_purchase_order, create_qc_report, create_receipt
+
+LIST_ROUTES = ("/purchase-orders", "/qc-reports", "/receipts")
+
+
+class StatementCounter:
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, *args):
+        self.count += 1
+
+
+@pytest.fixture
+def statements():
+    counter = StatementCounter()
+    binds = {engine, read_engine}
+    for bind in binds:
+        event.listen(bind, "before_cursor_execute", counter)
+    yield counter
+    for bind in binds:
+        event.remove(bind, "before_cursor_execute", counter)
+
+
+def _add_purchase_orders(client, supplier, product, count: int):
+    for _ in range(count):
+        po = create_purchase_order(client, supplier["id"], product["id"], items=3)
+        create_qc_report(client, po)
+        create_receipt(client, po)
+
+
+def _statements_per_list(client, statements, path: str, rows: int) -> int:
+    client.get(f"{API}{path}", params={"limit": 1000})  # warm caches that are not per request
+    statements.count = 0
+    response = client.get(f"{API}{path}", params={"limit": 1000})
+    assert response.status_code == 200
+    assert len(response.json()) >= rows
+    return statements.count
+
+
+@pytest.mark.parametrize("path", LIST_ROUTES)
+def test_list_statements_do_not_grow_with_rows(client, supplier, product, statements, path):
+    n = 3
+    _add_purchase_orders(client, supplier, product, n)
+    small = _statements_per_list(client, statements, path, n)
+    _add_purchase_orders(client, supplier, product, 9 * n)
+    large = _statements_per_list(client, statements, path, 10 * n)
+    assert large == small
+    # Header rows plus one SELECT per eager-loaded collection
+    assert small <= 4
@@ -0,0 +1,90 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+import database
+from crud import procurement
+from schemas.procurement import LocalPurchaseOrderCreate, QCReportCreate
+
+WRITERS = 32
+
+
+# SQLITE_WRITE_BEGIN=DEFERRED leaves transactions to the driver: writers that read first cannot upgrade to the
+# write lock under contention and fail with "database is locked" (how many depends on timing, so not strict)
+DEFERRED_LOCKS_OUT = pytest.mark.xfail(reason="DEFERRED write transactions fail under contention", strict=False)
+MODES = ["IMMEDIATE", pytest.param("DEFERRED", marks=DEFERRED_LOCKS_OUT)]
+
+
+@pytest.fixture
+def write_sessions(request, monkeypatch):
+    mode = getattr(request, "param", "IMMEDIATE")
+    monkeypatch.setattr(database, "SQLITE_WRITE_BEGIN", mode)
+    monkeypatch.setattr(database, "SQLITE_OWN_TRANSACTIONS", mode != "DEFERRED")
+    # A pool wide enough that every writer reaches SQLite at once, with no pool queueing to hide contention
+    monkeypatch.setattr(database, "POOL_OPTIONS", {"pool_size": WRITERS, "max_overflow": 0})
+    engine = database.build_engine(database.DATABASE_URL)
+    yield sessionmaker(bind=database.for_writes(engine), autoflush=False)
+    engine.dispose()
+
+
+def _run(writers: int, jobs, fn) -> list:
+    def attempt(job):
+        try:
+            return fn(job)
+        except Exception as e:
+            return e
+    with ThreadPoolExecutor(max_workers=writers) as pool:
+        return list(pool.map(attempt, jobs))
+
+
+@pytest.mark.parametrize("write_sessions", MODES, indirect=True)
+def test_concurrent_writers_are_not_locked_out(write_sessions, supplier, product):
+    po = LocalPurchaseOrderCreate(
+        supplier_id=supplier["id"], items=[{"product_id": product["id"], "sn": 1, "quantity": 2, "rate": 3}]
+    )
+
+    def create(_):
+        with write_sessions() as db:
+            created = procurement.create_local_purchase_order(db, po)
+            qc = procurement.create_qc_report(db, QCReportCreate(purchase_order_id=created.id, items=[
+                {"po_item_id": created.items[0].id, "status": "accepted", "accepted_qty": 2, "rejected_qty": 0}
+            ]))
+            return created.po_number, qc.qc_report_number
+
+    results = _run(WRITERS, range(300), create)
+    errors = [result for result in results if isinstance(result, Exception)]
+    assert errors == []
+    numbers = [number for pair in results for number in pair]
+    assert len(numbers) == len(set(numbers))
+
+    with write_sessions() as db:
+        stats = procurement.get_stats(db)
+        procurement.rebuild_stats(db)
+        # The counters bumped by every concurrent write add up to the base tables
+        assert procurement.get_stats(db) == stats
+
+
+@pytest.mark.parametrize("write_sessions", ["IMMEDIATE", "DEFERRED"], indirect=True)
+def test_rebuilding_stats_keeps_concurrent_bumps(write_sessions, supplier, product):
+    # Rebuilds run on sessions not bound for writes, interleaved with creates bumping the same counters
+    read_sessions = sessionmaker(bind=database.engine, autoflush=False)
+    po = LocalPurchaseOrderCreate(
+        supplier_id=supplier["id"], items=[{"product_id": product["id"], "sn": 1, "quantity": 1, "rate": 5}]
+    )
+
+    def work(job):
+        if job % 10 == 0:
+            with read_sessions() as db:
+                procurement.rebuild_stats(db)
+        else:
+            with write_sessions() as db:
+                procurement.create_local_purchase_order(db, po)
+
+    results = _run(8, range(200), work)
+    assert [result for result in results if isinstance(result, Exception)] == []
+
+    with write_sessions() as db:
+        stats = procurement.get_stats(db)
+        procurement.rebuild_stats(db)
+        assert procurement.get_stats(db) == stats
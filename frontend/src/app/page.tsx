@@ -39,38 +39,33 @@ export default function Home() {
   useEffect(() => {
     const fetchStats = async () => {
       try {
-        const [suppliers, products, pos, qc] = await Promise.all([
-          apiClient.getSuppliers(),
-          apiClient.getProducts(),
-          apiClient.getPurchaseOrders(),
-          apiClient.getQCReports(),
-        ]);
+        const counts = await apiClient.getStats();
 
         setStats([
           {
             title: 'Total Suppliers',
-            value: suppliers.length.toString(),
+            value: counts.suppliers.toString(),
             icon: '🏢',
             color: 'from-blue-500 to-blue-600',
             href: '/suppliers',
           },
           {
             title: 'Products',
-            value: products.length.toString(),
+            value: counts.products.toString(),
             icon: '📦',
             color: 'from-purple-500 to-purple-600',
             href: '/products',
           },
           {
             title: 'Purchase Orders',
-            value: pos.length.toString(),
+            value: counts.purchase_orders.toString(),
             icon: '📝',
             color: 'from-cyan-500 to-cyan-600',
             href: '/purchase-orders',
           },
           {
             title: 'QC Reports',
-            value: qc.length.toString(),
+            value: counts.qc_reports.toString(),
             icon: '✅',
             color: 'from-green-500 to-green-600',
             href: '/qc-reports',
@@ -511,6 +511,11 @@ export default function PurchaseOrderDetailPage() {
 
             {/* Actions */}
             <div className="flex justify-end gap-4">
+                <a href={apiClient.documentUrl('purchase-orders', po.id)} target="_blank" rel="noopener noreferrer">
+                    <button className="btn bg-gray-100 hover:bg-gray-200 text-gray-700">
+                        🖨️ Print
+                    </button>
+                </a>
                 {po.status === 'pending' && (
                     <Link href={`/qc-reports/create/${po.id}`}>
                         <button className="btn btn-success">
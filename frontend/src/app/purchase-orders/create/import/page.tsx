@@ -2,7 +2,8 @@
 
 import { useState, useEffect } from 'react';
 import { useRouter } from 'next/navigation';
-import { apiClient, Supplier, Product } from '@/lib/api';
+import { apiClient, Supplier } from '@/lib/api';
+import ProductSearch from '@/components/ProductSearch';
 
 interface POItem {
     product_id: number;
@@ -15,7 +16,7 @@ export default function CreateImportPOPage() {
     const router = useRouter();
     const [loading, setLoading] = useState(false);
     const [suppliers, setSuppliers] = useState<Supplier[]>([]);
-    const [products, setProducts] = useState<Product[]>([]);
+    const [productNames, setProductNames] = useState<Record<number, string>>({});
 
     const [formData, setFormData] = useState({
         supplier_id: '',
@@ -34,12 +35,8 @@ export default function CreateImportPOPage() {
     useEffect(() => {
         const fetchData = async () => {
             try {
-                const [suppliersData, productsData] = await Promise.all([
-                    apiClient.getSuppliers('import'),
-                    apiClient.getProducts()
-                ]);
+                const suppliersData = await apiClient.getSuppliers('import');
                 setSuppliers(suppliersData);
-                setProducts(productsData);
             } catch (error) {
                 console.error('Error fetching data:', error);
             }
@@ -225,17 +222,13 @@ export default function CreateImportPOPage() {
                                     <tr key={index}>
                                         <td className="py-2">{item.sn}</td>
                                         <td className="py-2">
-                                            <select
-                                                required
-                                                className="input py-1"
-                                                value={item.product_id}
-                                                onChange={(e) => handleItemChange(index, 'product_id', parseInt(e.target.value))}
-                                            >
-                                                <option value={0}>Select Product</option>
-                                                {products.map(p => (
-                                                    <option key={p.id} value={p.id}>{p.name}</option>
-                                                ))}
-                                            </select>
+                                            <ProductSearch
+                                                selectedName={productNames[item.product_id] || ''}
+                                                onSelect={(product) => {
+                                                    setProductNames({ ...productNames, [product.id]: product.name });
+                                                    handleItemChange(index, 'product_id', product.id);
+                                                }}
+                                            />
                                         </td>
                                         <td className="py-2">
                                             <input
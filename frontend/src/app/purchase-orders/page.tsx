@@ -2,10 +2,10 @@
 
 import { useState, useEffect } from 'react';
 import Link from 'next/link';
-import { apiClient, PurchaseOrder } from '@/lib/api';
+import { apiClient, PurchaseOrderSummary } from '@/lib/api';
 
 export default function PurchaseOrdersPage() {
-    const [pos, setPos] = useState<PurchaseOrder[]>([]);
+    const [pos, setPos] = useState<PurchaseOrderSummary[]>([]);
     const [loading, setLoading] = useState(true);
     const [filter, setFilter] = useState<'all' | 'local' | 'import'>('all');
 
@@ -16,7 +16,7 @@ export default function PurchaseOrdersPage() {
     const fetchPOs = async () => {
         try {
             setLoading(true);
-            const data = await apiClient.getPurchaseOrders(filter === 'all' ? undefined : filter);
+            const data = await apiClient.getPurchaseOrderSummaries(filter === 'all' ? undefined : filter);
             setPos(data);
         } catch (error) {
             console.error('Error fetching POs:', error);
@@ -119,11 +119,16 @@ export default function PurchaseOrdersPage() {
                                         </span>
                                     </div>
                                     <p className="text-gray-600 mb-1">
-                                        <span className="font-medium">Supplier:</span> {po.supplier.name}
+                                        <span className="font-medium">Supplier:</span> {po.supplier_name}
                                     </p>
-                                    <p className="text-gray-600">
+                                    <p className="text-gray-600 mb-1">
                                         <span className="font-medium">Date:</span> {new Date(po.created_at).toLocaleDateString()}
                                     </p>
+                                    <p className="text-gray-600">
+                                        <span className="font-medium">Items:</span> {po.item_count}
+                                        <span className="mx-2">·</span>
+                                        <span className="font-medium">Qty:</span> {po.total_qty.toLocaleString()}
+                                    </p>
                                 </div>
 
                                 <div className="flex flex-col items-end justify-between">
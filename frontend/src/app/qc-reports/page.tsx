@@ -75,6 +75,11 @@ export default function QCReportsPage() {
                                 </div>
 
                                 <div className="flex flex-col items-end justify-center gap-2">
+                                    <a href={apiClient.documentUrl('qc-reports', report.id)} target="_blank" rel="noopener noreferrer">
+                                        <button className="btn bg-gray-100 hover:bg-gray-200 text-gray-700 text-sm">
+                                            🖨️ Print
+                                        </button>
+                                    </a>
                                     <Link href={`/receipts/create/${report.purchase_order_id}`}>
                                         <button className="btn btn-primary text-sm">
                                             🧾 Generate Receipt
@@ -170,6 +170,16 @@ export default function ReceiptsPage() {
                                     >
                                         📄 Download PDF
                                     </button>
+                                    <a
+                                        href={apiClient.documentUrl('receipts', receipt.id)}
+                                        target="_blank"
+                                        rel="noopener noreferrer"
+                                        className="mt-2"
+                                    >
+                                        <button className="btn bg-gray-100 hover:bg-gray-200 text-gray-700 text-sm">
+                                            🖨️ Print
+                                        </button>
+                                    </a>
                                 </div>
                             </div>
                         </div>
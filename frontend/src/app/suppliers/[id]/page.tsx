@@ -3,7 +3,9 @@
 import { useState, useEffect } from 'react';
 import { useRouter, useParams } from 'next/navigation';
 import Link from 'next/link';
-import { apiClient, Supplier, PurchaseOrder, QCReport } from '@/lib/api';
+import { apiClient, Supplier, PurchaseOrderSummary, MonthlyPerformance } from '@/lib/api';
+
+const PAGE_SIZE = 50;
 
 export default function SupplierDetailPage() {
     const router = useRouter();
@@ -12,8 +14,10 @@ export default function SupplierDetailPage() {
 
     const [loading, setLoading] = useState(true);
     const [supplier, setSupplier] = useState<Supplier | null>(null);
-    const [purchaseOrders, setPurchaseOrders] = useState<PurchaseOrder[]>([]);
-    const [qcReports, setQcReports] = useState<{ [key: number]: QCReport }>({});
+    const [purchaseOrders, setPurchaseOrders] = useState<PurchaseOrderSummary[]>([]);
+    const [purchaseOrderCount, setPurchaseOrderCount] = useState(0);
+    const [loadingMore, setLoadingMore] = useState(false);
+    const [monthly, setMonthly] = useState<MonthlyPerformance[]>([]);
 
     useEffect(() => {
         fetchSupplierData();
@@ -23,28 +27,16 @@ export default function SupplierDetailPage() {
         try {
             setLoading(true);
             
-            // Fetch supplier details
-            const supplierData = await apiClient.getSupplier(supplierId);
-            setSupplier(supplierData);
-
-            // Fetch purchase orders for this supplier
-            const poData = await apiClient.getPurchaseOrders(supplierData.supplier_type);
-            const supplierPOs = poData.filter(po => po.supplier_id === supplierId);
-            setPurchaseOrders(supplierPOs);
+            // Monthly spend and rejection figures come pre-aggregated from the analytics rollups
+            apiClient.getSupplierMonthlyPerformance(supplierId)
+                .then(setMonthly)
+                .catch(error => console.error('Error fetching supplier performance:', error));
 
-            // Fetch QC reports for inspected POs
-            const qcData: { [key: number]: QCReport } = {};
-            for (const po of supplierPOs) {
-                if (po.status !== 'pending') {
-                    try {
-                        const qcReport = await apiClient.getQCReportByPO(po.id);
-                        qcData[po.id] = qcReport;
-                    } catch (error) {
-                        // QC report might not exist
-                    }
-                }
-            }
-            setQcReports(qcData);
+            // Supplier and its purchase orders with their stored aggregates in one request
+            const overview = await apiClient.getSupplierOverviewSummary(supplierId, 0, PAGE_SIZE);
+            setSupplier(overview.supplier);
+            setPurchaseOrders(overview.purchase_orders);
+            setPurchaseOrderCount(overview.purchase_order_count);
         } catch (error) {
             console.error('Error fetching supplier data:', error);
             alert('Failed to fetch supplier details');
@@ -53,6 +45,19 @@ export default function SupplierDetailPage() {
         }
     };
 
+    const loadMorePurchaseOrders = async () => {
+        try {
+            setLoadingMore(true);
+            const overview = await apiClient.getSupplierOverviewSummary(supplierId, purchaseOrders.length, PAGE_SIZE);
+            setPurchaseOrders(current => [...current, ...overview.purchase_orders]);
+            setPurchaseOrderCount(overview.purchase_order_count);
+        } catch (error) {
+            console.error('Error fetching purchase orders:', error);
+        } finally {
+            setLoadingMore(false);
+        }
+    };
+
     const getStatusBadge = (status: string) => {
         switch (status) {
             case 'pending': return 'badge-warning';
@@ -126,10 +131,43 @@ export default function SupplierDetailPage() {
                 </div>
             </div>
 
+            {/* Monthly Performance */}
+            {monthly.length > 0 && (
+                <div className="card mb-6">
+                    <h2 className="text-xl font-semibold mb-4">Monthly Performance</h2>
+                    <div className="overflow-x-auto">
+                        <table className="w-full text-sm">
+                            <thead>
+                                <tr className="text-left border-b border-gray-200">
+                                    <th className="pb-2">Month</th>
+                                    <th className="pb-2">Order Lines</th>
+                                    <th className="pb-2">Spend</th>
+                                    <th className="pb-2">Accepted Value</th>
+                                    <th className="pb-2">Rejected Value</th>
+                                    <th className="pb-2">Rejection Rate</th>
+                                </tr>
+                            </thead>
+                            <tbody>
+                                {monthly.map((row) => (
+                                    <tr key={row.month} className="border-b border-gray-100">
+                                        <td className="py-2 font-medium">{row.month}</td>
+                                        <td className="py-2">{row.order_lines}</td>
+                                        <td className="py-2">{row.spend.toLocaleString()}</td>
+                                        <td className="py-2 text-green-600">{row.accepted_value.toLocaleString()}</td>
+                                        <td className="py-2 text-red-600">{row.rejected_value.toLocaleString()}</td>
+                                        <td className="py-2">{(row.rejection_rate * 100).toFixed(1)}%</td>
+                                    </tr>
+                                ))}
+                            </tbody>
+                        </table>
+                    </div>
+                </div>
+            )}
+
             {/* Purchase Orders */}
             <div className="card">
                 <div className="flex justify-between items-center mb-6">
-                    <h2 className="text-xl font-semibold">Purchase Orders ({purchaseOrders.length})</h2>
+                    <h2 className="text-xl font-semibold">Purchase Orders ({purchaseOrderCount})</h2>
                     <Link href="/purchase-orders/create">
                         <button className="btn btn-primary text-sm">
                             ➕ Create New PO
@@ -145,182 +183,97 @@ export default function SupplierDetailPage() {
                     </div>
                 ) : (
                     <div className="space-y-6">
-                        {purchaseOrders.map((po) => {
-                            const qcReport = qcReports[po.id];
-                            return (
-                                <div key={po.id} className="border border-gray-200 rounded-lg p-4">
-                                    {/* PO Header */}
-                                    <div className="flex flex-col md:flex-row justify-between gap-4 mb-4">
-                                        <div>
-                                            <div className="flex items-center gap-3 mb-2">
-                                                <h3 className="text-lg font-bold">{po.po_number}</h3>
-                                                <span className={`badge ${getStatusBadge(po.status)}`}>
-                                                    {po.status.replace('_', ' ')}
-                                                </span>
-                                                <span className={`badge ${po.supplier_type === 'local' ? 'badge-info' : 'badge-warning'}`}>
-                                                    {po.supplier_type}
-                                                </span>
-                                            </div>
-                                            <p className="text-gray-600">
-                                                <span className="font-medium">Date:</span> {new Date(po.created_at).toLocaleDateString()}
-                                            </p>
-                                        </div>
-                                        <div className="text-right">
-                                            <p className="text-sm text-gray-500">Total Amount</p>
-                                            <p className="text-xl font-bold text-blue-600">
-                                                {po.total_amount.toLocaleString()}
-                                            </p>
+                        {purchaseOrders.map((po) => (
+                            <div key={po.id} className="border border-gray-200 rounded-lg p-4">
+                                {/* PO Header */}
+                                <div className="flex flex-col md:flex-row justify-between gap-4 mb-4">
+                                    <div>
+                                        <div className="flex items-center gap-3 mb-2">
+                                            <h3 className="text-lg font-bold">{po.po_number}</h3>
+                                            <span className={`badge ${getStatusBadge(po.status)}`}>
+                                                {po.status.replace('_', ' ')}
+                                            </span>
+                                            <span className={`badge ${po.supplier_type === 'local' ? 'badge-info' : 'badge-warning'}`}>
+                                                {po.supplier_type}
+                                            </span>
+                                            {po.has_accepted_receipt && (
+                                                <span className="badge badge-success">accepted receipt</span>
+                                            )}
+                                            {po.has_rejected_receipt && (
+                                                <span className="badge badge-danger">rejected receipt</span>
+                                            )}
                                         </div>
+                                        <p className="text-gray-600">
+                                            <span className="font-medium">Date:</span> {new Date(po.created_at).toLocaleDateString()}
+                                        </p>
                                     </div>
-
-                                    {/* Order Items */}
-                                    <div className="mb-4">
-                                        <h4 className="font-semibold mb-2">Order Items</h4>
-                                        <div className="overflow-x-auto">
-                                            <table className="w-full text-sm">
-                                                <thead>
-                                                    <tr className="text-left border-b border-gray-200">
-                                                        <th className="pb-2">Product</th>
-                                                        <th className="pb-2 w-20">Qty</th>
-                                                        <th className="pb-2 w-20">Rate</th>
-                                                        <th className="pb-2 w-20">Total</th>
-                                                    </tr>
-                                                </thead>
-                                                <tbody>
-                                                    {po.items.map((item, index) => (
-                                                        <tr key={index} className="border-b border-gray-100">
-                                                            <td className="py-2">
-                                                                <div>
-                                                                    <p className="font-medium">{item.product?.name || 'Product'}</p>
-                                                                    {item.product?.manufacturer && (
-                                                                        <p className="text-xs text-gray-500">{item.product.manufacturer}</p>
-                                                                    )}
-                                                                </div>
-                                                            </td>
-                                                            <td className="py-2">{item.quantity}</td>
-                                                            <td className="py-2">{item.rate.toFixed(2)}</td>
-                                                            <td className="py-2 font-medium">
-                                                                {(item.quantity * item.rate).toFixed(2)}
-                                                            </td>
-                                                        </tr>
-                                                    ))}
-                                                </tbody>
-                                            </table>
-                                        </div>
+                                    <div className="text-right">
+                                        <p className="text-sm text-gray-500">Total Amount</p>
+                                        <p className="text-xl font-bold text-blue-600">
+                                            {po.total_amount.toLocaleString()}
+                                        </p>
                                     </div>
+                                </div>
 
-                                    {/* QC Results (if available) */}
-                                    {qcReport && (
-                                        <div className="border-t border-gray-200 pt-4">
-                                            <h4 className="font-semibold mb-3">QC Inspection Results</h4>
-                                            <div className="grid grid-cols-1 md:grid-cols-2 gap-4">
-                                                {/* Accepted Items */}
-                                                <div className="bg-green-50 rounded-lg p-3">
-                                                    <h5 className="text-green-700 font-semibold mb-2">✅ Accepted Items</h5>
-                                                    <div className="space-y-1 text-sm">
-                                                        <div className="flex justify-between">
-                                                            <span>Total Quantity:</span>
-                                                            <span className="font-bold text-green-600">{qcReport.total_accepted_qty}</span>
-                                                        </div>
-                                                        <div className="flex justify-between">
-                                                            <span>Total Price:</span>
-                                                            <span className="font-bold text-green-600">{qcReport.total_accepted_value.toLocaleString()}</span>
-                                                        </div>
-                                                        
-                                                        {qcReport.items.filter(item => item.accepted_qty > 0).length > 0 && (
-                                                            <div className="mt-2 space-y-1">
-                                                                <p className="text-xs font-medium text-gray-600">Items:</p>
-                                                                {qcReport.items
-                                                                    .filter(item => item.accepted_qty > 0)
-                                                                    .map((item, index) => {
-                                                                        const poItem = po.items.find(poItem => poItem.id === item.po_item_id);
-                                                                        return (
-                                                                            <div key={index} className="text-xs bg-white rounded p-1">
-                                                                                <div className="flex justify-between">
-                                                                                    <span>{poItem?.product?.name || 'Product'}</span>
-                                                                                    <span className="text-green-600">Qty: {item.accepted_qty} @ {poItem?.rate.toFixed(2)}</span>
-                                                                                </div>
-                                                                                <div className="text-xs text-gray-500">
-                                                                                    Price: {item.accepted_value.toFixed(2)}
-                                                                                </div>
-                                                                            </div>
-                                                                        );
-                                                                    })}
-                                                            </div>
-                                                        )}
-                                                    </div>
-                                                </div>
-
-                                                {/* Rejected Items */}
-                                                <div className="bg-red-50 rounded-lg p-3">
-                                                    <h5 className="text-red-700 font-semibold mb-2">❌ Rejected Items</h5>
-                                                    <div className="space-y-1 text-sm">
-                                                        <div className="flex justify-between">
-                                                            <span>Total Quantity:</span>
-                                                            <span className="font-bold text-red-600">{qcReport.total_rejected_qty}</span>
-                                                        </div>
-                                                        <div className="flex justify-between">
-                                                            <span>Total Price:</span>
-                                                            <span className="font-bold text-red-600">{qcReport.total_rejected_value.toLocaleString()}</span>
-                                                        </div>
-                                                        
-                                                        {qcReport.items.filter(item => item.rejected_qty > 0).length > 0 && (
-                                                            <div className="mt-2 space-y-1">
-                                                                <p className="text-xs font-medium text-gray-600">Items:</p>
-                                                                {qcReport.items
-                                                                    .filter(item => item.rejected_qty > 0)
-                                                                    .map((item, index) => {
-                                                                        const poItem = po.items.find(poItem => poItem.id === item.po_item_id);
-                                                                        return (
-                                                                            <div key={index} className="text-xs bg-white rounded p-1">
-                                                                                <div className="flex justify-between">
-                                                                                    <span>{poItem?.product?.name || 'Product'}</span>
-                                                                                    <span className="text-red-600">Qty: {item.rejected_qty} @ {poItem?.rate.toFixed(2)}</span>
-                                                                                </div>
-                                                                                <div className="text-xs text-gray-500">
-                                                                                    Price: {item.rejected_value.toFixed(2)}
-                                                                                </div>
-                                                                                {item.rejection_reason && (
-                                                                                    <div className="text-xs text-red-600 italic mt-1">
-                                                                                        Reason: {item.rejection_reason}
-                                                                                    </div>
-                                                                                )}
-                                                                            </div>
-                                                                        );
-                                                                    })}
-                                                            </div>
-                                                        )}
-                                                    </div>
-                                                </div>
+                                {/* Order and QC totals */}
+                                <div className="grid grid-cols-2 md:grid-cols-4 gap-4 text-sm">
+                                    <div>
+                                        <p className="text-gray-500">Items</p>
+                                        <p className="font-medium">{po.item_count}</p>
+                                    </div>
+                                    <div>
+                                        <p className="text-gray-500">Total Quantity</p>
+                                        <p className="font-medium">{po.total_qty.toLocaleString()}</p>
+                                    </div>
+                                    {po.status !== 'pending' && (
+                                        <>
+                                            <div className="bg-green-50 rounded-lg p-2">
+                                                <p className="text-green-700">✅ Accepted Value</p>
+                                                <p className="font-bold text-green-600">{po.accepted_value.toLocaleString()}</p>
                                             </div>
-                                        </div>
+                                            <div className="bg-red-50 rounded-lg p-2">
+                                                <p className="text-red-700">❌ Rejected Value</p>
+                                                <p className="font-bold text-red-600">{po.rejected_value.toLocaleString()}</p>
+                                            </div>
+                                        </>
                                     )}
+                                </div>
 
-                                    {/* Actions */}
-                                    <div className="flex gap-2 mt-4">
-                                        <Link href={`/purchase-orders/${po.id}`}>
-                                            <button className="btn btn-primary text-sm">
-                                                View Details
+                                {/* Actions */}
+                                <div className="flex gap-2 mt-4">
+                                    <Link href={`/purchase-orders/${po.id}`}>
+                                        <button className="btn btn-primary text-sm">
+                                            View Details
+                                        </button>
+                                    </Link>
+                                    {po.status === 'pending' && (
+                                        <Link href={`/qc-reports/create/${po.id}`}>
+                                            <button className="btn btn-success text-sm">
+                                                🔍 QC Inspect
                                             </button>
                                         </Link>
-                                        {po.status === 'pending' && (
-                                            <Link href={`/qc-reports/create/${po.id}`}>
-                                                <button className="btn btn-success text-sm">
-                                                    🔍 QC Inspect
-                                                </button>
-                                            </Link>
-                                        )}
-                                        {po.status !== 'pending' && (
-                                            <Link href={`/receipts/create/${po.id}`}>
-                                                <button className="btn bg-orange-100 hover:bg-orange-200 text-orange-700 text-sm">
-                                                    🧾 Generate Receipt
-                                                </button>
-                                            </Link>
-                                        )}
-                                    </div>
+                                    )}
+                                    {po.status !== 'pending' && (
+                                        <Link href={`/receipts/create/${po.id}`}>
+                                            <button className="btn bg-orange-100 hover:bg-orange-200 text-orange-700 text-sm">
+                                                🧾 Generate Receipt
+                                            </button>
+                                        </Link>
+                                    )}
                                 </div>
-                            );
-                        })}
+                            </div>
+                        ))}
+                        {purchaseOrders.length < purchaseOrderCount && (
+                            <div className="text-center">
+                                <button
+                                    onClick={loadMorePurchaseOrders}
+                                    disabled={loadingMore}
+                                    className="btn bg-gray-100 hover:bg-gray-200 text-gray-700"
+                                >
+                                    {loadingMore ? 'Loading...' : `Load more (${purchaseOrderCount - purchaseOrders.length} remaining)`}
+                                </button>
+                            </div>
+                        )}
                     </div>
                 )}
             </div>
@@ -0,0 +1,80 @@
+'use client';
+
+import { useEffect, useState } from 'react';
+import { apiClient, Product } from '@/lib/api';
+
+interface ProductSearchProps {
+    selectedName: string;
+    onSelect: (product: Product) => void;
+}
+
+export default function ProductSearch({ selectedName, onSelect }: ProductSearchProps) {
+    const [query, setQuery] = useState(selectedName);
+    const [results, setResults] = useState<Product[]>([]);
+    const [open, setOpen] = useState(false);
+
+    // Show the chosen product again whenever the picker closes
+    useEffect(() => {
+        if (!open) setQuery(selectedName);
+    }, [open, selectedName]);
+
+    useEffect(() => {
+        if (!open || !query.trim()) {
+            setResults([]);
+            return;
+        }
+        // Wait for a pause in typing, and drop answers to queries the user has already typed past
+        let current = true;
+        const timer = setTimeout(async () => {
+            try {
+                const data = await apiClient.searchProducts(query);
+                if (current) setResults(data);
+            } catch (error) {
+                console.error('Error searching products:', error);
+            }
+        }, 150);
+        return () => {
+            current = false;
+            clearTimeout(timer);
+        };
+    }, [query, open]);
+
+    const select = (product: Product) => {
+        setOpen(false);
+        onSelect(product);
+    };
+
+    return (
+        <div className="relative">
+            <input
+                type="text"
+                className="input py-1"
+                placeholder="Search products..."
+                value={query}
+                onChange={(e) => {
+                    setQuery(e.target.value);
+                    setOpen(true);
+                }}
+                onBlur={() => setOpen(false)}
+            />
+            {open && results.length > 0 && (
+                <ul className="absolute z-10 mt-1 w-full bg-white border border-gray-200 rounded-lg shadow-lg max-h-64 overflow-y-auto">
+                    {results.map(p => (
+                        <li
+                            key={p.id}
+                            className="px-3 py-2 cursor-pointer hover:bg-blue-50"
+                            onMouseDown={() => select(p)}
+                        >
+                            <div className="font-medium">{p.name}</div>
+                            {(p.manufacturer || p.hs_code) && (
+                                <div className="text-xs text-gray-500">
+                                    {[p.manufacturer, p.hs_code].filter(Boolean).join(' · ')}
+                                </div>
+                            )}
+                        </li>
+                    ))}
+                </ul>
+            )}
+        </div>
+    );
+}
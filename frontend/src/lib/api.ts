@@ -52,12 +52,26 @@ export interface PurchaseOrder {
     tax?: number;
 
     total_amount: number;
+
+    // Maintained on write, so list views need neither items nor the QC report
+    item_count: number;
+    total_qty: number;
+    accepted_value: number;
+    rejected_value: number;
+    has_accepted_receipt: boolean;
+    has_rejected_receipt: boolean;
+
     created_at: string;
     updated_at: string;
     supplier: Supplier;
     items: PurchaseOrderItem[];
 }
 
+// Header columns only, as returned by ?view=summary
+export interface PurchaseOrderSummary extends Omit<PurchaseOrder, 'supplier' | 'items'> {
+    supplier_name: string;
+}
+
 export interface QCReportItem {
     id?: number;
     po_item_id: number;
@@ -86,6 +100,24 @@ export interface QCReport {
     items: QCReportItem[];
 }
 
+// PO under its supplier on the overview: no nested supplier, QC report inlined
+export interface SupplierPurchaseOrder extends Omit<PurchaseOrder, 'supplier'> {
+    qc_report?: QCReport | null;
+}
+
+export interface SupplierOverview {
+    supplier: Supplier;
+    purchase_order_count: number;
+    purchase_orders: SupplierPurchaseOrder[];
+}
+
+// ?view=summary: the POs as summary rows, read from purchase_orders alone
+export interface SupplierOverviewSummary {
+    supplier: Supplier;
+    purchase_order_count: number;
+    purchase_orders: PurchaseOrderSummary[];
+}
+
 export interface Receipt {
     id: number;
     receipt_number: string;
@@ -99,6 +131,46 @@ export interface Receipt {
     created_at: string;
 }
 
+export interface ProcurementStats {
+    suppliers: number;
+    products: number;
+    purchase_orders: number;
+    qc_reports: number;
+    receipts: number;
+    total_spend: number;
+    spend_by_supplier_type: Record<string, number>;
+    purchase_orders_by_status: Record<string, number>;
+    accepted_value: number;
+    rejected_value: number;
+}
+
+export interface PerformanceFigures {
+    order_lines: number;
+    ordered_qty: number;
+    spend: number;
+    inspected_lines: number;
+    rejected_lines: number;
+    accepted_qty: number;
+    rejected_qty: number;
+    accepted_value: number;
+    rejected_value: number;
+    rejection_rate: number;
+}
+
+export interface SupplierPerformance extends PerformanceFigures {
+    supplier_id: number;
+    supplier_name: string;
+}
+
+export interface MonthlyPerformance extends PerformanceFigures {
+    month: string;
+}
+
+export interface ProductPerformance extends PerformanceFigures {
+    product_id: number;
+    product_name: string;
+}
+
 // API Client
 class ApiClient {
     private baseUrl: string;
@@ -113,6 +185,8 @@ class ApiClient {
     ): Promise<T> {
         const url = `${this.baseUrl}${endpoint}`;
         const response = await fetch(url, {
+            // The API is another origin; without this the read-your-writes cookie is never stored or sent
+            credentials: 'include',
             ...options,
             headers: {
                 'Content-Type': 'application/json',
@@ -128,16 +202,37 @@ class ApiClient {
         return response.json();
     }
 
+    // Stats
+    async getStats(): Promise<ProcurementStats> {
+        return this.request<ProcurementStats>('/api/procurement/stats');
+    }
+
     // Suppliers
     async getSuppliers(supplierType?: string): Promise<Supplier[]> {
         const params = supplierType ? `?supplier_type=${supplierType}` : '';
         return this.request<Supplier[]>(`/api/procurement/suppliers${params}`);
     }
 
+    async searchSuppliers(q: string, supplierType?: string, limit = 10): Promise<Supplier[]> {
+        const params = new URLSearchParams({ q, limit: String(limit) });
+        if (supplierType) params.append('supplier_type', supplierType);
+        return this.request<Supplier[]>(`/api/procurement/suppliers/search?${params.toString()}`);
+    }
+
     async getSupplier(id: number): Promise<Supplier> {
         return this.request<Supplier>(`/api/procurement/suppliers/${id}`);
     }
 
+    async getSupplierOverview(id: number, skip = 0, limit = 100): Promise<SupplierOverview> {
+        return this.request<SupplierOverview>(`/api/procurement/suppliers/${id}/overview?skip=${skip}&limit=${limit}`);
+    }
+
+    async getSupplierOverviewSummary(id: number, skip = 0, limit = 100): Promise<SupplierOverviewSummary> {
+        return this.request<SupplierOverviewSummary>(
+            `/api/procurement/suppliers/${id}/overview?view=summary&skip=${skip}&limit=${limit}`
+        );
+    }
+
     async createSupplier(data: Omit<Supplier, 'id' | 'created_at' | 'updated_at'>): Promise<Supplier> {
         return this.request<Supplier>('/api/procurement/suppliers', {
             method: 'POST',
@@ -163,6 +258,11 @@ class ApiClient {
         return this.request<Product[]>('/api/procurement/products');
     }
 
+    async searchProducts(q: string, limit = 10): Promise<Product[]> {
+        const params = new URLSearchParams({ q, limit: String(limit) });
+        return this.request<Product[]>(`/api/procurement/products/search?${params.toString()}`);
+    }
+
     async getProduct(id: number): Promise<Product> {
         return this.request<Product>(`/api/procurement/products/${id}`);
     }
@@ -188,14 +288,22 @@ class ApiClient {
     }
 
     // Purchase Orders
-    async getPurchaseOrders(supplierType?: string, status?: string): Promise<PurchaseOrder[]> {
+    async getPurchaseOrders(supplierType?: string, status?: string, supplierId?: number): Promise<PurchaseOrder[]> {
         const params = new URLSearchParams();
         if (supplierType) params.append('supplier_type', supplierType);
         if (status) params.append('status', status);
+        if (supplierId) params.append('supplier_id', supplierId.toString());
         const queryString = params.toString() ? `?${params.toString()}` : '';
         return this.request<PurchaseOrder[]>(`/api/procurement/purchase-orders${queryString}`);
     }
 
+    async getPurchaseOrderSummaries(supplierType?: string, status?: string): Promise<PurchaseOrderSummary[]> {
+        const params = new URLSearchParams({ view: 'summary' });
+        if (supplierType) params.append('supplier_type', supplierType);
+        if (status) params.append('status', status);
+        return this.request<PurchaseOrderSummary[]>(`/api/procurement/purchase-orders?${params.toString()}`);
+    }
+
     async getPurchaseOrder(id: number): Promise<PurchaseOrder> {
         return this.request<PurchaseOrder>(`/api/procurement/purchase-orders/${id}`);
     }
@@ -253,6 +361,35 @@ class ApiClient {
             body: JSON.stringify(data),
         });
     }
+
+    // Analytics (months as YYYY-MM, inclusive)
+    private monthRange(monthFrom?: string, monthTo?: string): string {
+        const params = new URLSearchParams();
+        if (monthFrom) params.append('month_from', monthFrom);
+        if (monthTo) params.append('month_to', monthTo);
+        return params.toString() ? `?${params.toString()}` : '';
+    }
+
+    async getSupplierPerformance(monthFrom?: string, monthTo?: string): Promise<SupplierPerformance[]> {
+        return this.request<SupplierPerformance[]>(`/api/procurement/analytics/suppliers${this.monthRange(monthFrom, monthTo)}`);
+    }
+
+    async getSupplierMonthlyPerformance(supplierId: number, monthFrom?: string, monthTo?: string): Promise<MonthlyPerformance[]> {
+        return this.request<MonthlyPerformance[]>(
+            `/api/procurement/analytics/suppliers/${supplierId}/monthly${this.monthRange(monthFrom, monthTo)}`
+        );
+    }
+
+    async getSupplierProductPerformance(supplierId: number, monthFrom?: string, monthTo?: string): Promise<ProductPerformance[]> {
+        return this.request<ProductPerformance[]>(
+            `/api/procurement/analytics/suppliers/${supplierId}/products${this.monthRange(monthFrom, monthTo)}`
+        );
+    }
+
+    // Printable documents, rendered and cached by the server; open in a new tab to print
+    documentUrl(kind: 'purchase-orders' | 'qc-reports' | 'receipts', id: number): string {
+        return `${this.baseUrl}/api/procurement/${kind}/${id}/document`;
+    }
 }
 
 export const apiClient = new ApiClient(API_BASE_URL);